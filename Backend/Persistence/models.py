@@ -13,6 +13,7 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     Boolean,
+    Index,
     func,
 )
 from sqlalchemy import JSON
@@ -62,6 +63,14 @@ class EventLogModel(Base):
     payload = Column(JSON, nullable=False)     # Store complex decision data
     created_at = Column(DateTime, server_default=func.now())
 
+# At most one ALERT_ESCALATED per alert, however many workers race to record it
+ESCALATED_ONCE = Index(
+    "uq_event_log_escalated_alert",
+    func.json_extract(EventLogModel.payload, "$.alert_id"),
+    unique=True,
+    sqlite_where=EventLogModel.event_type == "ALERT_ESCALATED",
+)
+
 class MaintenanceModel(Base):
     __tablename__ = "maintenance_orders"
     order_id = Column(String, primary_key=True, index=True)
@@ -71,4 +80,54 @@ class MaintenanceModel(Base):
     priority = Column(Integer, default=1)
     scheduled_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
-    end_time = Column(DateTime, nullable=True)
\ No newline at end of file
+    end_time = Column(DateTime, nullable=True)
+
+class MaintenanceCrewModel(Base):
+    """One row per assignee of a crewed order; the lead is also the order's assigned_engineer_id."""
+    __tablename__ = "maintenance_crew"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(String, ForeignKey("maintenance_orders.order_id"), nullable=False, index=True)
+    engineer_id = Column(String, ForeignKey("engineers.engineer_id"), nullable=False, index=True)
+    is_lead = Column(Boolean, nullable=False, default=False)
+
+class ShiftRosterModel(Base):
+    """One rostered shift; engineers' last_shift_start/end are derived from these."""
+    __tablename__ = "shift_roster"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    engineer_id = Column(String, ForeignKey("engineers.engineer_id"), nullable=False, index=True)
+    shift = Column(String, nullable=False)  # Day, Swing, Night
+    start = Column(DateTime, nullable=False, index=True)
+    end = Column(DateTime, nullable=False)
+
+class AssetDependencyModel(Base):
+    """Edge of the dependency graph: the downstream asset idles while the upstream one is down."""
+    __tablename__ = "asset_dependencies"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    upstream_id = Column(String, ForeignKey("assets.asset_id"), nullable=False, index=True)
+    downstream_id = Column(String, ForeignKey("assets.asset_id"), nullable=False, index=True)
+    weight = Column(Float, nullable=False, default=1.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PreventiveRuleModel(Base):
+    """Recurrence rule per asset type: inspect every ``interval_days`` after the last inspection."""
+    __tablename__ = "preventive_rules"
+    asset_type = Column(String, primary_key=True)
+    interval_days = Column(Integer, nullable=False)
+
+class HealthReadingModel(Base):
+    """One health reading; every web worker folds this log into its own ring buffers."""
+    __tablename__ = "health_readings"
+    __table_args__ = {"sqlite_autoincrement": True}    # ids are a watermark; never reuse a pruned one
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    asset_id = Column(String, nullable=False, index=True)
+    health = Column(Float, nullable=False)
+    recorded_at = Column(DateTime, nullable=False, index=True)
+
+class OrderBacklogModel(Base):
+    """An order no engineer could take yet, waiting in priority order for the next schedule run."""
+    __tablename__ = "order_backlog"
+    order_id = Column(String, primary_key=True)
+    asset_id = Column(String, ForeignKey("assets.asset_id"), nullable=False, unique=True)   # one waiting order per asset
+    task_type = Column(String, nullable=False, default="Emergency Repair")
+    priority = Column(Float, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
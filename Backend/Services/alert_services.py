@@ -8,7 +8,7 @@ from domain.escalation import requires_escalation
 from Persistence.event_store import record_event
 
 
-def create_alert(db, severity, message):
+def create_alert(db, severity, message, scheduler=None):
     alert_id = str(uuid.uuid4())
 
     alert = Alert(
@@ -17,7 +17,7 @@ def create_alert(db, severity, message):
         message=message
     )
 
-    record_event(
+    event = record_event(
         db,
         event_type="ALERT_CREATED",
         payload={
@@ -27,9 +27,23 @@ def create_alert(db, severity, message):
         }
     )
 
+    if scheduler is not None:
+        scheduler.schedule(alert_id, severity, event.created_at or datetime.utcnow())
+
     return alert
 
 
+def resolve_alert(db, alert_id, scheduler=None):
+    record_event(
+        db,
+        event_type="ALERT_RESOLVED",
+        payload={"alert_id": alert_id}
+    )
+
+    if scheduler is not None:
+        scheduler.cancel(alert_id)
+
+
 def escalate_alert(db, alert, created_at):
     elapsed = datetime.utcnow() - created_at
 
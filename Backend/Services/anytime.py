@@ -0,0 +1,326 @@
+"""Anytime orchestration under a wall-clock budget.
+
+``run_anytime`` always has a plan in hand: the greedy loop runs first and
+becomes the incumbent.  Until the deadline, ``min_cost`` races in a worker
+process while local search improves the incumbent in this one; the best
+plan by ``plan_cost`` wins, and a strategy still running at the deadline is
+terminated.  The report records the winner and each improvement over the
+greedy baseline so the budget can be tuned per deployment.
+"""
+import bisect
+import contextlib
+import copy
+import heapq
+import multiprocessing
+import os
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from .assignment_solver import FALLBACK_PENALTY, plan_cost, solve_min_cost, unassigned_cost
+from .batch_scoring import duration_table, order_priorities, skill_matrix
+from .matching import EngineerIndex, FATIGUE_LIMIT
+from .orchestrator import run_orchestration
+from .timeline import ScheduleCalendar
+
+# Engineers tried per relocation, least loaded first
+CANDIDATES_PER_MOVE = 8
+
+_ASSET_FIELDS = ("asset_id", "health_score", "risk_level", "required_certifications")
+_ENGINEER_FIELDS = (
+    "engineer_id", "name", "certifications", "skill_matrix",
+    "availability", "shift_start", "shift_end", "fatigue",
+)
+
+
+def _snapshot(obj, fields) -> SimpleNamespace:
+    return SimpleNamespace(**{field: getattr(obj, field, None) for field in fields})
+
+
+def _required_certs(asset) -> List[str]:
+    required = getattr(asset, "required_certifications", []) or []
+    if isinstance(required, str):
+        required = [required]
+    return list(required)
+
+
+def _race_min_cost(conn, assets, orders, engineers, calendar) -> None:
+    """Worker process: solve min_cost and send the plan back."""
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        allocations, _ = solve_min_cost(assets, orders, engineers, calendar)
+    conn.send(allocations)
+    conn.close()
+
+
+class _LocalSearch:
+    """Relocate/swap moves over an order -> engineer assignment.
+
+    Each engineer works their orders in priority order, so the cost of an
+    engineer's sequence is the replay ``plan_cost`` does; a move only
+    re-prices the one or two sequences it touches.
+    """
+
+    def __init__(self, assets, prioritized, engineers, assignment):
+        asset_map = {a.asset_id: a for a in assets}
+        index = EngineerIndex(engineers)
+        task_types: Dict[str, int] = {}
+        self.task = [task_types.setdefault(getattr(o, "task_type", "Repair"), len(task_types)) for o in prioritized]
+        self.hours = duration_table(skill_matrix(engineers), list(task_types)) / 60.0
+        self.req = [index.mask_of(_required_certs(asset_map.get(o.asset_id))) for o in prioritized]
+        self.masks = [index.engineer_mask(e) for e in engineers]
+        self.start = [getattr(e, "fatigue", 0) or 0.0 for e in engineers]
+        self.penalty = [unassigned_cost(p) for p in order_priorities(prioritized, asset_map).tolist()]
+
+        self.owner = list(assignment)
+        self.seq: List[List[int]] = [[] for _ in engineers]
+        for rank, pos in enumerate(self.owner):
+            if pos >= 0:
+                self.seq[pos].append(rank)
+        self.cost = [self._sequence_cost(pos, self.seq[pos])[0] for pos in range(len(engineers))]
+        self.load = [self.start[pos] + sum(self.hours[pos, self.task[r]] for r in self.seq[pos])
+                     for pos in range(len(engineers))]
+        self._qualified: Dict[int, List[int]] = {}
+
+    def _sequence_cost(self, pos: int, ranks: List[int]) -> Tuple[float, bool]:
+        fatigue = self.start[pos]
+        total = 0.0
+        for rank in ranks:
+            if fatigue >= FATIGUE_LIMIT:
+                return total, False
+            hours = self.hours[pos, self.task[rank]]
+            total += fatigue + hours
+            if self.masks[pos] & self.req[rank] != self.req[rank]:
+                total += FALLBACK_PENALTY
+            fatigue += hours
+        return total, True
+
+    def total(self) -> float:
+        unassigned = sum(self.penalty[r] for r, pos in enumerate(self.owner) if pos < 0)
+        return sum(self.cost) + unassigned
+
+    def _candidates(self, rank: int) -> List[int]:
+        req = self.req[rank]
+        qualified = self._qualified.get(req)
+        if qualified is None:
+            qualified = self._qualified[req] = [p for p, m in enumerate(self.masks) if m & req == req]
+        return heapq.nsmallest(CANDIDATES_PER_MOVE, qualified, key=self.load.__getitem__)
+
+    def _relocate(self, rank: int) -> bool:
+        """Move one order to the cheapest candidate engineer, if that lowers the cost."""
+        current = self.owner[rank]
+        if current >= 0:
+            without = [r for r in self.seq[current] if r != rank]
+            saved = self.cost[current] - self._sequence_cost(current, without)[0]
+        else:
+            without, saved = None, self.penalty[rank]
+
+        best = None
+        for pos in self._candidates(rank):
+            if pos == current:
+                continue
+            ranks = self.seq[pos][:]
+            bisect.insort(ranks, rank)
+            cost, feasible = self._sequence_cost(pos, ranks)
+            delta = cost - self.cost[pos] - saved
+            if feasible and delta < -1e-9 and (best is None or delta < best[0]):
+                best = (delta, pos, ranks, cost)
+        if best is None:
+            return False
+
+        _, pos, ranks, cost = best
+        if current >= 0:
+            self.seq[current] = without
+            self.cost[current] = self._sequence_cost(current, without)[0]
+            self.load[current] -= self.hours[current, self.task[rank]]
+        self.seq[pos], self.cost[pos], self.owner[rank] = ranks, cost, pos
+        self.load[pos] += self.hours[pos, self.task[rank]]
+        return True
+
+    def _swap(self, rank: int) -> bool:
+        """Trade a fallback order for one of a certified engineer's orders its holder can do."""
+        current = self.owner[rank]
+        best = None
+        for pos in self._candidates(rank):
+            if pos == current:
+                continue
+            for other in self.seq[pos]:
+                if self.masks[current] & self.req[other] != self.req[other]:
+                    continue
+                mine = sorted([r for r in self.seq[current] if r != rank] + [other])
+                theirs = sorted([r for r in self.seq[pos] if r != other] + [rank])
+                cost_mine, ok_mine = self._sequence_cost(current, mine)
+                cost_theirs, ok_theirs = self._sequence_cost(pos, theirs)
+                delta = cost_mine + cost_theirs - self.cost[current] - self.cost[pos]
+                if ok_mine and ok_theirs and delta < -1e-9 and (best is None or delta < best[0]):
+                    best = (delta, pos, other, mine, theirs, cost_mine, cost_theirs)
+        if best is None:
+            return False
+
+        _, pos, other, mine, theirs, cost_mine, cost_theirs = best
+        moved = self.hours[current, self.task[other]] - self.hours[current, self.task[rank]]
+        self.load[current] += moved
+        self.load[pos] += self.hours[pos, self.task[rank]] - self.hours[pos, self.task[other]]
+        self.seq[current], self.cost[current], self.owner[other] = mine, cost_mine, current
+        self.seq[pos], self.cost[pos], self.owner[rank] = theirs, cost_theirs, pos
+        return True
+
+    def _fallback(self, rank: int) -> bool:
+        pos = self.owner[rank]
+        return pos >= 0 and self.masks[pos] & self.req[rank] != self.req[rank]
+
+    def improve(self, deadline: float) -> bool:
+        """One sweep: unassigned orders, then fallback staffing, then plain rebalancing."""
+        improved = False
+        unassigned = [r for r, pos in enumerate(self.owner) if pos < 0]
+        fallback = [r for r in range(len(self.owner)) if self._fallback(r)]
+        rest = [r for r in range(len(self.owner)) if self.owner[r] >= 0 and not self._fallback(r)]
+        for rank in unassigned + fallback + rest:
+            if time.perf_counter() >= deadline:
+                break
+            moved = self._relocate(rank)
+            if not moved and self._fallback(rank):
+                moved = self._swap(rank)
+            improved |= moved
+        return improved
+
+
+def _book_plan(prioritized, owner, engineers, calendar) -> List[Dict]:
+    """Allocations for an assignment, booked in priority order like the greedy loop."""
+    durations = {}
+    allocations = []
+    for rank, pos in enumerate(owner):
+        if pos < 0:
+            continue
+        order, eng = prioritized[rank], engineers[pos]
+        key = (pos, getattr(order, "task_type", "Repair"))
+        if key not in durations:
+            durations[key] = int(duration_table(skill_matrix([eng]), [key[1]])[0, 0])
+        duration = durations[key]
+        start_time, end_time = calendar.book(eng, duration)
+        allocations.append({
+            "order_id": order.order_id,
+            "engineer_id": eng.engineer_id,
+            "engineer_name": eng.name,
+            "asset_id": order.asset_id,
+            "duration_minutes": duration,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+        })
+    return allocations
+
+
+def run_anytime(
+    assets: List,
+    orders: List,
+    engineers: List,
+    calendar: Optional[ScheduleCalendar] = None,
+    deadline_ms: int = 200,
+) -> Tuple[List[Dict], float, Dict]:
+    """Best plan found within ``deadline_ms``: (allocations, cost, report).
+
+    Engineer fatigue is set to the winning plan's, and its bookings are
+    copied into ``calendar``.
+    """
+    began = time.perf_counter()
+    deadline = began + deadline_ms / 1000.0
+    elapsed_ms = lambda: round((time.perf_counter() - began) * 1000.0, 1)
+    calendar = calendar or ScheduleCalendar()
+    assets = [_snapshot(a, _ASSET_FIELDS) for a in assets]
+    snaps = [_snapshot(e, _ENGINEER_FIELDS) for e in engineers]
+    for snap in snaps:
+        snap.fatigue = snap.fatigue or 0.0
+    initial_fatigue = {s.engineer_id: s.fatigue for s in snaps}
+    price = lambda allocations: plan_cost(assets, orders, snaps, allocations, initial_fatigue)
+
+    # 1. min_cost starts racing straight away in its own process
+    # Never fork: the caller may be a web worker with background threads running
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    racer = context.Process(
+        target=_race_min_cost,
+        args=(sender, assets, orders, copy.deepcopy(snaps), copy.deepcopy(calendar)),
+        daemon=True,
+    )
+    racer.start()
+    sender.close()
+
+    # 2. Greedy is the incumbent the moment it finishes
+    greedy_calendar = copy.deepcopy(calendar)
+    best_allocations = run_orchestration(assets, orders, copy.deepcopy(snaps), greedy_calendar)
+    best_cost = greedy_cost = price(best_allocations)
+    best_calendar, winner = greedy_calendar, "greedy"
+    strategies = {"greedy": {"cost": round(greedy_cost, 2), "ms": elapsed_ms()}}
+    improvements = []
+
+    def offer(name: str, allocations: List[Dict], plan_calendar: ScheduleCalendar) -> None:
+        nonlocal best_allocations, best_cost, best_calendar, winner
+        cost = price(allocations)
+        strategies[name] = {"cost": round(cost, 2), "ms": elapsed_ms()}
+        if cost < best_cost - 1e-9:
+            improvements.append({
+                "strategy": name,
+                "cost": round(cost, 2),
+                "gain": round(best_cost - cost, 2),
+                "at_ms": elapsed_ms(),
+            })
+            best_allocations, best_cost, best_calendar, winner = allocations, cost, plan_calendar, name
+
+    # 3. Local search on the greedy plan while min_cost runs; crews stay pinned as greedy formed them
+    asset_map = {a.asset_id: a for a in assets}
+    crews = [a for a in best_allocations if a.get("crew")]
+    crewed = {a["order_id"] for a in crews}
+    scored = list(zip(order_priorities(orders, asset_map).tolist(), orders))
+    prioritized = [o for _, o in sorted(scored, key=lambda x: x[0], reverse=True) if o.order_id not in crewed]
+    position = {s.engineer_id: pos for pos, s in enumerate(snaps)}
+    busy = [SimpleNamespace(**vars(s)) for s in snaps]
+    for alloc in crews:
+        for engineer_id in alloc["crew"]:
+            busy[position[engineer_id]].fatigue += alloc["duration_minutes"] / 60.0
+    engineer_of = {a["order_id"]: position[a["engineer_id"]] for a in best_allocations}
+    search = _LocalSearch(assets, prioritized, busy, [engineer_of.get(o.order_id, -1) for o in prioritized])
+    searched = False
+    while time.perf_counter() < deadline and search.improve(deadline):
+        searched = True
+    if searched:
+        search_calendar = copy.deepcopy(calendar)
+        pinned = []
+        for alloc in crews:
+            slot = search_calendar.book_crew([snaps[position[e]] for e in alloc["crew"]], alloc["duration_minutes"])
+            if slot is not None:
+                pinned.append(dict(alloc, start_time=slot[0].isoformat(), end_time=slot[1].isoformat()))
+        plan = pinned + _book_plan(prioritized, search.owner, snaps, search_calendar)
+        offer("local_search", plan, search_calendar)
+
+    # 4. Take min_cost if it made the deadline, otherwise stop it
+    if receiver.poll(max(0.0, deadline - time.perf_counter())):
+        allocations = receiver.recv()
+        # Re-book on a copy so the winner's calendar matches its allocations
+        min_cost_calendar = copy.deepcopy(calendar)
+        for alloc in allocations:
+            min_cost_calendar.book(snaps[position[alloc["engineer_id"]]], alloc["duration_minutes"])
+        offer("min_cost", allocations, min_cost_calendar)
+    else:
+        strategies["min_cost"] = {"status": "timeout"}
+    racer.terminate()
+    racer.join()
+    receiver.close()
+
+    # 5. Apply the winner: fatigue replayed in plan order, bookings copied over
+    fatigue = dict(initial_fatigue)
+    for alloc in best_allocations:
+        for engineer_id in alloc.get("crew") or [alloc["engineer_id"]]:
+            fatigue[engineer_id] += alloc["duration_minutes"] / 60.0
+            calendar.preload(engineer_id, best_calendar.bookings(engineer_id))
+    for eng in engineers:
+        eng.fatigue = fatigue[eng.engineer_id]
+
+    report = {
+        "winner": winner,
+        "deadline_ms": deadline_ms,
+        "elapsed_ms": elapsed_ms(),
+        "baseline_cost": round(greedy_cost, 2),
+        "improvements": improvements,
+        "strategies": strategies,
+    }
+    return best_allocations, best_cost, report
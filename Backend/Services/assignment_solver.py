@@ -0,0 +1,304 @@
+"""Globally optimal batch assignment for the orchestrator.
+
+``solve_min_cost`` is the alternative to the greedy priority loop in
+``run_orchestration``.  Every (order, engineer) pair is priced as
+
+    cost(o, e) = fatigue(e) + duration(o, e) / 60 + fallback penalty
+
+and leaving an order unstaffed costs UNASSIGNED_PENALTY plus its priority
+times PRIORITY_WEIGHT, so when personnel are scarce the high-priority
+orders are the ones that get served.  Engineers take one order per wave;
+each wave is solved exactly as a min-cost flow, then fatigue is bumped and
+the leftovers go into the next wave.
+
+Orders in the same (requirement set, task type) class are interchangeable
+apart from priority, so the flow aggregates orders by class and shortest
+paths run over the K x K class graph (see ``_WaveFlow``).  Each augmenting
+path is a few vectorized relaxations over a small matrix, and the work
+grows with the number of requirement classes rather than with the number
+of orders.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .alert_services import raise_critical_alert
+from .batch_scoring import duration_table, order_priorities, skill_matrix
+from .matching import EngineerIndex, FATIGUE_LIMIT
+from .orchestrator import calculate_priority
+from .timeline import ScheduleCalendar
+
+FALLBACK_PENALTY = 100.0      # staffing an order with someone missing a cert
+UNASSIGNED_PENALTY = 1000.0   # leaving an order with nobody at all
+PRIORITY_WEIGHT = 1.0
+
+STRATEGIES = ("greedy", "min_cost")
+
+
+def assignment_cost(fatigue: float, duration_minutes: int, qualified: bool) -> float:
+    cost = fatigue + duration_minutes / 60.0
+    if not qualified:
+        cost += FALLBACK_PENALTY
+    return cost
+
+
+def unassigned_cost(priority: float) -> float:
+    return UNASSIGNED_PENALTY + PRIORITY_WEIGHT * priority
+
+
+def _required_certs(asset) -> List[str]:
+    required = getattr(asset, "required_certifications", []) or []
+    if isinstance(required, str):
+        required = [required]
+    return list(required)
+
+
+def plan_cost(
+    assets: List,
+    orders: List,
+    engineers: List,
+    allocations: List[Dict],
+    initial_fatigue: Dict[str, float],
+) -> float:
+    """Price a finished plan (from any strategy) with the solver's objective.
+
+    Allocations are replayed in order from ``initial_fatigue`` so each one is
+    charged the fatigue its engineer had when the order was handed out.  A
+    crew is charged once per member and is qualified on its combined certs.
+    """
+    asset_map = {a.asset_id: a for a in assets}
+    engineer_map = {e.engineer_id: e for e in engineers}
+    fatigue = dict(initial_fatigue)
+    assigned = set()
+    total = 0.0
+
+    for alloc in allocations:
+        members = alloc.get("crew") or [alloc["engineer_id"]]
+        certs = set()
+        for engineer_id in members:
+            held = getattr(engineer_map[engineer_id], "certifications", []) or []
+            certs.update([held] if isinstance(held, str) else held)
+        required = _required_certs(asset_map.get(alloc["asset_id"]))
+        qualified = all(cert in certs for cert in required)
+        for engineer_id in members:
+            before = fatigue.get(engineer_id, 0)
+            total += assignment_cost(before, alloc["duration_minutes"], qualified)
+            fatigue[engineer_id] = before + alloc["duration_minutes"] / 60.0
+        assigned.add(alloc["order_id"])
+
+    for order in orders:
+        if order.order_id not in assigned:
+            total += unassigned_cost(calculate_priority(asset_map.get(order.asset_id)))
+    return total
+
+
+def _mask_bits(masks: List[int], width: int) -> np.ndarray:
+    bits = np.zeros((len(masks), max(width, 1)), dtype=bool)
+    for row, mask in enumerate(masks):
+        while mask:
+            low = mask & -mask
+            bits[row, low.bit_length() - 1] = True
+            mask ^= low
+    return bits
+
+
+class _WaveFlow:
+    """Min-cost flow for one wave: source -> order classes -> engineers -> sink.
+
+    Orders of a class are interchangeable, so the source arc of class k is a
+    convex chain of unit costs (its orders' negated penalties, best first).
+    Each rested engineer carries at most one order.  Every residual path
+    ``class k0 -> engineer held by k1 -> k1 -> ... -> free engineer`` is
+    collapsed onto the K x K class graph with
+
+        transfer[k0, k1] = min over engineers e held by k1 of C[k0, e] - C[k1, e]
+
+    so a shortest path is a Bellman-Ford over K nodes, and each
+    augmentation only refreshes the transfer columns of the classes it
+    touched.
+    """
+
+    def __init__(self, cost: np.ndarray, rewards: List[np.ndarray]):
+        self.cost = cost                      # K x E assignment costs
+        self.rewards = rewards                # per class, negated penalties
+        K, E = cost.shape
+        self.rows = np.arange(K)
+        self.held_by = np.full(E, -1)         # class holding each engineer
+        self.sent = [0] * K
+        self.next_reward = np.array([r[0] if len(r) else np.inf for r in rewards])
+        self.transfer = np.full((K, K), np.inf)
+        self.transfer_via = np.full((K, K), -1)
+        # Per class, engineers by increasing cost; the cursor skips held ones
+        self.by_cost = np.argsort(cost, axis=1, kind="stable")
+        self.cursor = np.zeros(K, dtype=np.int64)
+        self.free_engineer = self.by_cost[:, 0].copy()
+        self.free_cost = cost[self.rows, self.free_engineer]
+
+    def _refresh(self, k: int) -> None:
+        members = np.flatnonzero(self.held_by == k)
+        if members.size:
+            delta = self.cost[:, members] - self.cost[k, members]
+            best = delta.argmin(axis=1)
+            self.transfer[:, k] = delta[self.rows, best]
+            self.transfer_via[:, k] = members[best]
+        else:
+            self.transfer[:, k] = np.inf
+        self.transfer[k, k] = np.inf
+
+    def _take(self, engineer: int, k: int) -> None:
+        """Hand a free engineer to class k and move every cursor parked on them."""
+        self.held_by[engineer] = k
+        E = self.cost.shape[1]
+        for c in np.flatnonzero(self.free_engineer == engineer):
+            order = self.by_cost[c]
+            pos = int(self.cursor[c]) + 1
+            while pos < E and self.held_by[order[pos]] >= 0:
+                pos += 1
+            self.cursor[c] = pos
+            if pos < E:
+                self.free_engineer[c] = order[pos]
+                self.free_cost[c] = self.cost[c, order[pos]]
+            else:
+                self.free_engineer[c] = -1
+                self.free_cost[c] = np.inf
+
+    def solve(self) -> np.ndarray:
+        K = len(self.rewards)
+        via = np.empty((K, K))
+        while True:
+            dist = self.next_reward.copy()
+            pred = np.full(K, -1)  # -1 = reached straight from the source
+
+            # Labels only move on strict improvement so predecessors stay a tree
+            while True:
+                np.add(dist[:, None], self.transfer, out=via)
+                best = via.argmin(axis=0)
+                candidate = via[best, self.rows]
+                improved = candidate < dist - 1e-9
+                if not improved.any():
+                    break
+                dist = np.where(improved, candidate, dist)
+                pred = np.where(improved, best, pred)
+
+            total = dist + self.free_cost
+            k = int(total.argmin())
+            if not np.isfinite(total[k]) or total[k] >= 0:
+                return self.held_by
+
+            touched = [k]
+            free_engineer = int(self.free_engineer[k])
+            while pred[k] >= 0:
+                prev = int(pred[k])
+                self.held_by[self.transfer_via[prev, k]] = prev
+                k = prev
+                touched.append(k)
+            self._take(free_engineer, touched[0])
+
+            self.sent[k] += 1
+            rewards = self.rewards[k]
+            self.next_reward[k] = rewards[self.sent[k]] if self.sent[k] < len(rewards) else np.inf
+            for k in touched:
+                self._refresh(k)
+
+
+def _solve_wave(pending, rested, fatigue, masks, durations) -> List[Tuple[tuple, int]]:
+    # Order classes: (requirement mask, task type), members already in priority order
+    order_classes: Dict[tuple, list] = {}
+    for entry in pending:
+        order_classes.setdefault((entry[3], entry[4]), []).append(entry)
+    class_keys = list(order_classes)
+
+    # K x E cost matrix over the rested engineers
+    width = max(m.bit_length() for m in [masks[p] for p in rested] + [k[0] for k in class_keys])
+    has_cert = _mask_bits([masks[p] for p in rested], width)
+    needs_cert = _mask_bits([key[0] for key in class_keys], width)
+    missing = needs_cert.astype(np.int32) @ (~has_cert).astype(np.int32).T
+    base = np.array([fatigue[p] for p in rested], dtype=float)
+    hours = durations[rested] / 60.0
+    cost = np.empty((len(class_keys), len(rested)))
+    for k, (_, task_type) in enumerate(class_keys):
+        cost[k] = base + hours[:, task_type] + np.where(missing[k] > 0, FALLBACK_PENALTY, 0.0)
+
+    rewards = [
+        np.array([-unassigned_cost(entry[0]) for entry in order_classes[key]])
+        for key in class_keys
+    ]
+    held_by = _WaveFlow(cost, rewards).solve()
+
+    # Each class serves its top orders; which holder gets which is cost-neutral
+    order_iters = [iter(order_classes[key]) for key in class_keys]
+    pairs = [
+        (next(order_iters[k]), rested[j])
+        for j, k in enumerate(held_by) if k >= 0
+    ]
+    pairs.sort(key=lambda pair: (-pair[0][0], pair[0][1]))
+    return pairs
+
+
+def solve_min_cost(
+    assets: List,
+    orders: List,
+    engineers: List,
+    calendar: Optional[ScheduleCalendar] = None,
+) -> Tuple[List[Dict], float]:
+    """Assign a whole batch with the min-cost objective.
+
+    Returns the allocations (same shape as ``run_orchestration``) and the
+    plan's total cost.  Engineer fatigue is bumped in place, as the greedy
+    path does.
+    """
+    asset_map = {a.asset_id: a for a in assets}
+    calendar = calendar or ScheduleCalendar()
+    index = EngineerIndex(engineers)
+    masks = [index.engineer_mask(e) for e in engineers]
+    fatigue = [getattr(e, "fatigue", 0) for e in engineers]
+
+    task_types: Dict[str, int] = {}
+    pending = []
+    for seq, (priority, order) in enumerate(zip(order_priorities(orders, asset_map).tolist(), orders)):
+        task_type = task_types.setdefault(getattr(order, "task_type", "Repair"), len(task_types))
+        req_mask = index.mask_of(_required_certs(asset_map.get(order.asset_id)))
+        pending.append((priority, seq, order, req_mask, task_type))
+    pending.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    # Engineers x task types, in minutes
+    durations = duration_table(skill_matrix(engineers), list(task_types))
+
+    allocations: List[Dict] = []
+    total = 0.0
+    while pending:
+        rested = [pos for pos, f in enumerate(fatigue) if f < FATIGUE_LIMIT]
+        if not rested:
+            break
+        pairs = _solve_wave(pending, rested, fatigue, masks, durations)
+        if not pairs:
+            break
+
+        served = set()
+        for entry, pos in pairs:
+            _, seq, order, req_mask, task_type = entry
+            eng = engineers[pos]
+            duration = int(durations[pos, task_type])
+            total += assignment_cost(fatigue[pos], duration, masks[pos] & req_mask == req_mask)
+            fatigue[pos] += duration / 60.0
+            eng.fatigue = fatigue[pos]
+
+            start_time, end_time = calendar.book(eng, duration)
+            allocations.append({
+                "order_id": order.order_id,
+                "engineer_id": eng.engineer_id,
+                "engineer_name": eng.name,
+                "asset_id": order.asset_id,
+                "duration_minutes": duration,
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+            })
+            served.add(seq)
+        pending = [entry for entry in pending if entry[1] not in served]
+
+    for entry in pending:
+        total += unassigned_cost(entry[0])
+        try: raise_critical_alert(entry[2])
+        except: pass
+
+    return allocations, total
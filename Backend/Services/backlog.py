@@ -0,0 +1,145 @@
+"""Priority backlog of orders waiting for an engineer.
+
+Rows live in ``order_backlog`` (priority column indexed); ``OrderBacklog``
+mirrors them in a max-heap keyed on ``calculate_priority`` of the order's
+asset.  An order's key only changes when its asset's health or risk does
+(``rekey``): the new entry is pushed and the old one is skipped when it
+surfaces.  A schedule run pops the top N instead of re-scoring and
+sorting everything, and whatever it could not place goes back.
+
+A run that ranks by something else (impact-weighted exposure, which moves
+whenever any downstream asset does) passes ``score`` to ``pop``: the top N
+by that score are picked in one pass over the live entries.
+
+Several web worker processes share the table (at most one row per
+asset), so a schedule run reloads the mirror, claims what it pops by
+deleting those rows - it keeps only the orders its delete returned - and
+writes the unplaced ones back with their original ``created_at``.
+"""
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from domain.maintenance import MaintenanceOrder
+
+# Same effort figures as build_emergency_order
+BASE_TIME_MINUTES = 120
+TASK_DIFFICULTY = 1.5
+
+
+class BacklogEntry:
+    __slots__ = ("order_id", "asset_id", "task_type", "priority", "seq", "waiting_since")
+
+    def __init__(self, order_id: str, asset_id: str, task_type: str, priority: float, seq: int, waiting_since=None):
+        self.order_id = order_id
+        self.asset_id = asset_id
+        self.task_type = task_type
+        self.priority = priority
+        self.seq = seq
+        self.waiting_since = waiting_since    # created_at of its row, kept when it is written back
+
+
+class OrderBacklog:
+    def __init__(self):
+        self.entries: Dict[str, BacklogEntry] = {}
+        self.by_asset: Dict[str, Set[str]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.entries
+
+    def load(self, rows: Iterable) -> "OrderBacklog":
+        """Rebuild from ``order_backlog`` rows (order_id, asset_id, task_type, priority[, created_at]); one heapify."""
+        self.__init__()
+        for row in rows:
+            entry = BacklogEntry(
+                row.order_id, row.asset_id, row.task_type, float(row.priority), next(self._seq),
+                getattr(row, "created_at", None),
+            )
+            self.entries[entry.order_id] = entry
+            self.by_asset.setdefault(entry.asset_id, set()).add(entry.order_id)
+        self._heap = [(-e.priority, e.seq, e.order_id) for e in self.entries.values()]
+        heapq.heapify(self._heap)
+        self.loaded = True
+        return self
+
+    def push(self, order_id: str, asset_id: str, task_type: str, priority: float) -> None:
+        entry = self.entries.get(order_id)
+        if entry is None:
+            entry = BacklogEntry(order_id, asset_id, task_type, priority, next(self._seq))
+            self.entries[order_id] = entry
+            self.by_asset.setdefault(asset_id, set()).add(order_id)
+        entry.priority = priority
+        heapq.heappush(self._heap, (-priority, entry.seq, order_id))
+
+    def remove(self, order_id: str) -> Optional[BacklogEntry]:
+        entry = self.entries.pop(order_id, None)
+        if entry is not None:
+            orders = self.by_asset[entry.asset_id]
+            orders.discard(order_id)
+            if not orders:
+                del self.by_asset[entry.asset_id]
+        return entry
+
+    def rekey(self, asset_id: str, priority: float) -> List[str]:
+        """New priority for every order on ``asset_id``; returns the order ids that moved."""
+        moved = []
+        for order_id in self.by_asset.get(asset_id, ()):
+            entry = self.entries[order_id]
+            if entry.priority != priority:
+                entry.priority = priority
+                heapq.heappush(self._heap, (-priority, entry.seq, order_id))
+                moved.append(order_id)
+        self._compact()
+        return moved
+
+    def pop(self, n: int, score: Optional[Callable[[BacklogEntry], float]] = None) -> List[BacklogEntry]:
+        """Remove and return the ``n`` highest-priority orders (oldest first among equals).
+
+        ``score`` ranks by another priority instead of the stored one.
+        """
+        if score is not None:
+            top = heapq.nsmallest(n, self.entries.values(), key=lambda e: (-score(e), e.seq))
+            taken = [self.remove(entry.order_id) for entry in top]
+            self._compact()
+            return taken
+        taken: List[BacklogEntry] = []
+        while self._heap and len(taken) < n:
+            key, seq, order_id = heapq.heappop(self._heap)
+            entry = self.entries.get(order_id)
+            if entry is None or entry.seq != seq or -key != entry.priority:
+                continue    # removed, or re-keyed since this entry went in
+            taken.append(self.remove(order_id))
+        return taken
+
+    def restore(self, entries: Iterable[BacklogEntry]) -> None:
+        """Put popped entries back with their original places in line."""
+        for entry in entries:
+            self.entries[entry.order_id] = entry
+            self.by_asset.setdefault(entry.asset_id, set()).add(entry.order_id)
+            heapq.heappush(self._heap, (-entry.priority, entry.seq, entry.order_id))
+
+    def _compact(self) -> None:
+        # Stale keys dominate after many re-keys: rebuild from the live entries
+        if len(self._heap) > 2 * len(self.entries) + 64:
+            self._heap = [(-e.priority, e.seq, e.order_id) for e in self.entries.values()]
+            heapq.heapify(self._heap)
+
+
+def to_order(entry: BacklogEntry, asset) -> MaintenanceOrder:
+    certs = getattr(asset, "required_certifications", None) or []
+    if isinstance(certs, str):
+        certs = [certs]
+    return MaintenanceOrder(
+        order_id=entry.order_id,
+        asset_id=entry.asset_id,
+        required_certifications=set(certs),
+        task_type=entry.task_type,
+        base_time_minutes=BASE_TIME_MINUTES,
+        task_difficulty=TASK_DIFFICULTY,
+    )
@@ -0,0 +1,98 @@
+"""Vectorized scoring over a whole plant.
+
+The scalar helpers (``calculate_priority``, ``calculate_actual_duration``
+and ``domain.risk.risk_score``) read one object at a time through
+``getattr``.  Here assets and engineers are loaded once into NumPy arrays
+(health, risk, and a skill matrix indexed by task type) so every priority
+and every engineer x order duration comes out of a few array operations.
+The arithmetic mirrors the scalar functions step for step, so the results
+are bit-for-bit identical.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.asset import RiskLevel
+from domain.risk import RISK_WEIGHTS
+
+# Columns of the skill matrix; same keys and default as calculate_actual_duration
+SKILL_KEYS = ("repairSpeed", "diagnostics")
+DEFAULT_SKILL = 5
+
+_RISK_WEIGHT_TABLE = np.zeros(max(level.value for level in RiskLevel) + 1)
+for _level, _weight in RISK_WEIGHTS.items():
+    _RISK_WEIGHT_TABLE[_level.value] = _weight
+
+
+def skill_column(task_type: str) -> int:
+    return SKILL_KEYS.index("repairSpeed" if task_type == "Repair" else "diagnostics")
+
+
+def asset_arrays(assets: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """(health, risk) arrays with the scalar helpers' defaults."""
+    count = len(assets)
+    health = np.fromiter((getattr(a, "health_score", 100) for a in assets), dtype=float, count=count)
+    risk = np.fromiter((getattr(a, "risk_level", 0) for a in assets), dtype=float, count=count)
+    return health, risk
+
+
+def priorities(health: np.ndarray, risk: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_priority``."""
+    return risk / (np.maximum(health, 1) / 100.0)
+
+
+def order_priorities(orders: Sequence, asset_map: Dict, stakes: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Priority of each order's asset; orders with an unknown asset score 0.0.
+
+    ``stakes`` replaces the risk of the assets it names (impact-weighted
+    exposure from the dependency graph).
+    """
+    assets = [asset_map.get(o.asset_id) for o in orders]
+    known = np.fromiter((a is not None for a in assets), dtype=bool, count=len(assets))
+    result = np.zeros(len(orders))
+    if known.any():
+        present = [a for a in assets if a is not None]
+        health, risk = asset_arrays(present)
+        if stakes:
+            risk = np.fromiter((stakes.get(a.asset_id, r) for a, r in zip(present, risk)), dtype=float, count=len(present))
+        result[known] = priorities(health, risk)
+    return result
+
+
+def risk_scores(risk_levels: Iterable, health: np.ndarray) -> np.ndarray:
+    """Vectorized ``domain.risk.risk_score``; accepts RiskLevel members or their values."""
+    values = np.array([getattr(level, "value", level) for level in risk_levels], dtype=int)
+    return _RISK_WEIGHT_TABLE[values] + (1.0 - np.asarray(health, dtype=float)) * 100
+
+
+def skill_matrix(engineers: Sequence) -> np.ndarray:
+    """Engineers x SKILL_KEYS raw skill values."""
+    rows: List[List[float]] = []
+    for e in engineers:
+        skills = getattr(e, "skill_matrix", {}) or {}
+        rows.append([float(skills.get(key, DEFAULT_SKILL)) for key in SKILL_KEYS])
+    return np.array(rows, dtype=float).reshape(len(rows), len(SKILL_KEYS))
+
+
+def duration_table(
+    skills: np.ndarray,
+    task_types: Sequence[str],
+    base_time: int = 120,
+    difficulty: float = 1.5,
+) -> np.ndarray:
+    """Engineers x task_types minutes, identical to ``calculate_actual_duration``."""
+    columns = np.array([skill_column(t) for t in task_types], dtype=int)
+    normalized = np.maximum(0.1, skills[:, columns] / 10.0)
+    return (base_time * (difficulty / normalized) + 20).astype(np.int64)
+
+
+def duration_matrix(
+    skills: np.ndarray,
+    orders: Sequence,
+    base_time: int = 120,
+    difficulty: float = 1.5,
+) -> np.ndarray:
+    """Full engineers x orders duration matrix (one column per order)."""
+    task_types = [getattr(o, "task_type", "Repair") for o in orders]
+    unique, inverse = np.unique(task_types, return_inverse=True)
+    return duration_table(skills, list(unique), base_time, difficulty)[:, inverse.ravel()]
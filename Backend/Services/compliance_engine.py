@@ -0,0 +1,139 @@
+"""Batch legality: engineers x time slots over a planning horizon.
+
+``domain.compliance.legally_available`` answers for one engineer and one
+minute.  ``AvailabilityMatrix`` evaluates the same rules (shift window,
+MANDATORY_REST_HOURS, MAX_SHIFT_HOURS, FATIGUE_LIMIT_HOURS and active
+FATIGUE_LIMIT overrides) for a whole roster over e.g. 7 days of 15-minute
+slots in a few NumPy operations.  Each slot is then packed into an int
+bitset over engineers, so "who is legally available at slot t, holding
+these certs" is a single AND and ``bit_count``.
+
+Shifts recur daily.  The per-day rules (rest, max shift, fatigue) are
+read from today's figures, so they gate the shift in progress or starting
+today; later shifts start fresh.
+"""
+import datetime
+from functools import reduce
+from operator import and_
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from domain.compliance import (
+    FATIGUE_LIMIT_HOURS,
+    MANDATORY_REST_HOURS,
+    MAX_SHIFT_HOURS,
+    shift_window,
+)
+
+DAY_MINUTES = 24 * 60
+
+
+def _rest_minutes(engineer, shift_begin: int, day_start: datetime.datetime) -> float:
+    """Rest before the current shift; minutes-since-midnight or datetime ``last_shift_end``."""
+    last_end = getattr(engineer, "last_shift_end", None)
+    if last_end is None:
+        return float("inf")
+    if isinstance(last_end, datetime.datetime):
+        begin = day_start + datetime.timedelta(minutes=shift_begin)
+        return (begin - last_end).total_seconds() / 60.0
+    return getattr(engineer, "shift_start", shift_begin) - last_end
+
+
+class AvailabilityMatrix:
+    def __init__(
+        self,
+        engineers: Iterable,
+        start: Optional[datetime.datetime] = None,
+        days: int = 7,
+        slot_minutes: int = 15,
+        overrides: Iterable = (),
+        now: Optional[datetime.datetime] = None,
+    ):
+        engineers = list(engineers)
+        self.start = (start or datetime.datetime.utcnow()).replace(second=0, microsecond=0)
+        self.slot_minutes = slot_minutes
+        self.slots = days * DAY_MINUTES // slot_minutes
+        self.engineer_ids = [e.engineer_id for e in engineers]
+        self._position = {eid: pos for pos, eid in enumerate(self.engineer_ids)}
+        count = len(engineers)
+        day_start = self.start.replace(hour=0, minute=0)
+
+        # 1. Shift windows, broadcast over every slot
+        windows = np.array([shift_window(e) for e in engineers], dtype=np.int64).reshape(count, 2)
+        begin = windows[:, 0] % DAY_MINUTES
+        length = windows[:, 1] - windows[:, 0]
+        offset = self.start.hour * 60 + self.start.minute + np.arange(self.slots, dtype=np.int64) * slot_minutes
+        since_begin = offset[None, :] - begin[:, None]
+        in_window = (since_begin % DAY_MINUTES) < length[:, None]
+        today = (since_begin // DAY_MINUTES) <= 0
+
+        # 2. Per-engineer rules for today's shift
+        worked = np.array([getattr(e, "hours_worked_today", 0) or 0 for e in engineers], dtype=float)
+        rest = np.array([_rest_minutes(e, int(b), day_start) for e, b in zip(engineers, begin)], dtype=float)
+        compliant = (
+            (rest >= MANDATORY_REST_HOURS * 60)
+            & (worked < MAX_SHIFT_HOURS)
+            & (worked < FATIGUE_LIMIT_HOURS)
+        )
+        self.matrix = in_window & (compliant[:, None] | ~today)
+
+        # 3. An active FATIGUE_LIMIT override allows the engineer outright until it expires
+        now = now or datetime.datetime.utcnow()
+        for override in overrides:
+            pos = self._position.get(override.target_id)
+            if override.constraint == "FATIGUE_LIMIT" and pos is not None and override.is_active(now):
+                self.matrix[pos, :self._slot_ceil(override.expires_at)] = True
+
+        # 4. One int bitset per slot (bit i = engineer i)
+        packed = np.packbits(self.matrix, axis=0, bitorder="little")
+        self.slot_bits: List[int] = [int.from_bytes(row.tobytes(), "little") for row in np.ascontiguousarray(packed.T)]
+
+        self._cert_bits: Dict[str, int] = {}
+        for pos, e in enumerate(engineers):
+            certs = getattr(e, "certifications", []) or []
+            if isinstance(certs, str):
+                certs = [certs]
+            for cert in set(certs):
+                self._cert_bits[cert] = self._cert_bits.get(cert, 0) | (1 << pos)
+        self._everyone = (1 << count) - 1
+
+    def _slot_ceil(self, moment: datetime.datetime) -> int:
+        minutes = (moment - self.start).total_seconds() / 60.0
+        return int(min(max(np.ceil(minutes / self.slot_minutes), 0), self.slots))
+
+    def slot_of(self, moment: datetime.datetime) -> int:
+        return int((moment - self.start).total_seconds() // 60) // self.slot_minutes
+
+    def slot_start(self, slot: int) -> datetime.datetime:
+        return self.start + datetime.timedelta(minutes=slot * self.slot_minutes)
+
+    def qualified(self, certs: Optional[Iterable[str]] = None) -> int:
+        """Bitset of engineers holding every cert in ``certs``."""
+        bits = self._everyone
+        for cert in certs or ():
+            bits &= self._cert_bits.get(cert, 0)
+        return bits
+
+    def available(self, slot: int, certs: Optional[Iterable[str]] = None) -> int:
+        return self.slot_bits[slot] & self.qualified(certs)
+
+    def count(self, slot: int, certs: Optional[Iterable[str]] = None) -> int:
+        return self.available(slot, certs).bit_count()
+
+    def free_through(self, first: int, last: int, certs: Optional[Iterable[str]] = None) -> int:
+        """Engineers legally available in every slot of [first, last)."""
+        return reduce(and_, self.slot_bits[first:last], self.qualified(certs))
+
+    def counts(self, certs: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Available engineers per slot across the whole horizon."""
+        rows = [pos for pos in range(len(self.engineer_ids)) if self.qualified(certs) >> pos & 1]
+        return self.matrix[rows].sum(axis=0)
+
+    def engineers(self, bits: int) -> List[str]:
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(self.engineer_ids[low.bit_length() - 1])
+            bits ^= low
+        return ids
@@ -0,0 +1,119 @@
+"""Crew assembly for orders no single engineer is certified for.
+
+``cover`` is a set cover over certification bitmasks: the fewest engineers
+whose masks together hold every required bit, and among crews of that
+size the lowest total fatigue (ties go to the lowest roster positions).
+Each engineer is first cut down to the part of their mask the order
+needs; per distinct part only the least-fatigued engineer survives, and a
+part contained in another engineer's part is dropped when that engineer
+is less tired (or as tired and earlier on the roster).  What is left is a
+handful of options however large the roster.
+
+The search deepens one crew member at a time and branches on the lowest
+uncovered bit (someone has to hold it), trying its holders in fatigue
+order.  A branch stops once the widest remaining option cannot finish the
+cover within the size limit, or once it is already more tired than the
+best crew found.
+"""
+import math
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+# Largest crew assembled for one order
+MAX_CREW = 4
+
+
+def _reduce(options: List[Tuple[int, float, int]]) -> List[Tuple[int, float, int]]:
+    """Least-fatigued engineer per distinct part, minus parts dominated by a wider, less tired one."""
+    best: Dict[int, Tuple[int, float, int]] = {}
+    for part, fatigue, pos in options:
+        if part and (part not in best or (fatigue, pos) < best[part][1:]):
+            best[part] = (part, fatigue, pos)
+
+    kept: List[Tuple[int, float, int]] = []
+    for option in sorted(best.values(), key=lambda o: (-o[0].bit_count(), o[1], o[2])):
+        part, rank = option[0], option[1:]
+        if not any(part & other[0] == part and other[1:] < rank for other in kept):
+            kept.append(option)
+    return kept
+
+
+def cover(required: int, options: List[Tuple[int, float, int]], max_size: int = MAX_CREW) -> Optional[List[int]]:
+    """Positions of the smallest, least-fatigued crew covering ``required``, widest part first.
+
+    ``options`` are ``(mask, fatigue, position)`` for every candidate; None
+    if no crew of at most ``max_size`` covers the requirement.
+    """
+    options = _reduce([(mask & required, fatigue, pos) for mask, fatigue, pos in options])
+    held = 0
+    for part, _, _ in options:
+        held |= part
+    if not required or held & required != required:
+        return None
+
+    widest = max(part.bit_count() for part, _, _ in options)
+    holders: Dict[int, List[Tuple[int, float, int]]] = {}
+    for option in sorted(options, key=lambda o: (o[1], o[2])):
+        part = option[0]
+        while part:
+            low = part & -part
+            holders.setdefault(low, []).append(option)
+            part ^= low
+
+    best: List = [(float("inf"), ()), None]
+
+    def search(remaining: int, chosen: List, fatigue: float, size: int) -> None:
+        if not remaining:
+            # Exact sum, so equal crews tie however the search reached them
+            key = (math.fsum(o[1] for o in chosen), tuple(sorted(o[2] for o in chosen)))
+            if key < best[0]:
+                best[0], best[1] = key, list(chosen)
+            return
+        if len(chosen) + -(-remaining.bit_count() // widest) > size:
+            return
+        for option in holders[remaining & -remaining]:
+            if fatigue + option[1] > best[0][0] + 1e-9:
+                break
+            chosen.append(option)
+            search(remaining & ~option[0], chosen, fatigue + option[1], size)
+            chosen.pop()
+
+    for size in range(1, max_size + 1):
+        search(required, [], 0.0, size)
+        if best[1] is not None:
+            crew = sorted(best[1], key=lambda o: (-o[0].bit_count(), o[1], o[2]))
+            return [pos for _, _, pos in crew]
+    return None
+
+
+def crew_rosters(db, models, order_ids=None) -> Dict[str, List[str]]:
+    """order_id -> crew engineer ids, lead first."""
+    crew = models.MaintenanceCrewModel
+    query = db.query(crew.order_id, crew.engineer_id, crew.is_lead)
+    if order_ids is not None:
+        query = query.filter(crew.order_id.in_(list(order_ids)))
+    rosters: Dict[str, List[str]] = {}
+    for order_id, engineer_id, is_lead in query.order_by(crew.id):
+        members = rosters.setdefault(order_id, [])
+        if is_lead:
+            members.insert(0, engineer_id)
+        else:
+            members.append(engineer_id)
+    return rosters
+
+
+def crew_bookings(db, models, now) -> List[SimpleNamespace]:
+    """Live bookings of crew members other than the lead (the lead's are on the order row)."""
+    crew, order = models.MaintenanceCrewModel, models.MaintenanceModel
+    rows = db.query(order.order_id, order.asset_id, crew.engineer_id, order.scheduled_date, order.end_time).join(
+        crew, crew.order_id == order.order_id
+    ).filter(
+        order.status == "ASSIGNED",
+        order.end_time > now,
+        crew.is_lead.is_(False),
+    )
+    return [
+        SimpleNamespace(order_id=order_id, asset_id=asset_id, assigned_engineer_id=engineer_id,
+                        scheduled_date=start, end_time=end)
+        for order_id, asset_id, engineer_id, start, end in rows
+    ]
@@ -0,0 +1,204 @@
+"""Structured orchestrator decision trace.
+
+Replaces the per-order ``print`` chatter with compact records in a
+preallocated ring buffer.  One record per order decision:
+
+    (run, order_id, asset_id, priority, candidates, engineer_id,
+     fallback, duration_minutes, decide_us)
+
+Levels (``DECISION_TRACE_LEVEL``):
+
+    off        nothing is recorded; hot paths pay one int comparison
+    summary    one summary per run, stored in ``event_log``
+    decisions  per-order records too, queryable by run id while in the buffer
+    verbose    decisions plus the old human-readable stdout lines
+
+Summaries are written to ``event_log`` as DECISION_TRACE events by a
+background writer thread, so the request that finished the run never
+waits on the database.
+"""
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+OFF, SUMMARY, DECISIONS, VERBOSE = 0, 1, 2, 3
+LEVELS = {"off": OFF, "summary": SUMMARY, "decisions": DECISIONS, "verbose": VERBOSE}
+RECORD_FIELDS = (
+    "run", "order_id", "asset_id", "priority", "candidates",
+    "engineer_id", "fallback", "duration_minutes", "decide_us",
+)
+TRACE_EVENT = "DECISION_TRACE"
+MAX_RUNS = 256   # run summaries kept in memory for lookups
+
+
+class DecisionTrace:
+    def __init__(self, level: int = DECISIONS, capacity: int = 1 << 16):
+        self.level = level
+        self.capacity = capacity
+        self._ring: List[Optional[Tuple]] = [None] * capacity
+        self._cursor = 0                  # total records ever written
+        self._runs: Dict[str, Dict] = {}  # run id -> meta and (once finished) summary
+        self._current: Optional[int] = None
+        self._next_run = 0
+        self._lock = threading.Lock()
+        self._session_factory: Optional[Callable] = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    @property
+    def recording(self) -> bool:
+        return self.level >= DECISIONS
+
+    @property
+    def verbose(self) -> bool:
+        return self.level >= VERBOSE
+
+    def set_level(self, level) -> None:
+        self.level = LEVELS[level] if isinstance(level, str) else int(level)
+
+    def configure(self, session_factory: Callable) -> None:
+        """Where finished-run summaries go; without it they stay in memory only."""
+        self._session_factory = session_factory
+
+    # --- Runs ---
+
+    def begin_run(self, kind: str = "schedule") -> Optional[str]:
+        if self.level == OFF:
+            return None
+        run_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            seq = self._next_run
+            self._next_run += 1
+            self._runs[run_id] = {"seq": seq, "kind": kind, "first": self._cursor, "began": time.perf_counter()}
+            self._current = seq
+            while len(self._runs) > MAX_RUNS:
+                del self._runs[next(iter(self._runs))]
+        return run_id
+
+    def end_run(self, run_id: Optional[str], **details) -> Optional[Dict]:
+        """Close a run, summarise it and queue the summary for ``event_log``."""
+        if run_id is None or run_id not in self._runs:
+            return None
+        meta = self._runs[run_id]
+        records = self.records(run_id)
+        decided = [r for r in records if r[5] is not None]
+        decide_us = [r[8] for r in records]
+        summary = {
+            "run_id": run_id,
+            "kind": meta["kind"],
+            "elapsed_ms": round((time.perf_counter() - meta["began"]) * 1000.0, 3),
+            "orders": len(records),
+            "assigned": len(decided),
+            "fallbacks": sum(1 for r in decided if r[6]),
+            "unassigned": len(records) - len(decided),
+            "booked_minutes": sum(r[7] for r in decided),
+            "decide_us_mean": round(sum(decide_us) / len(decide_us), 2) if decide_us else 0.0,
+            "decide_us_max": round(max(decide_us), 2) if decide_us else 0.0,
+            "records_kept": len(records),
+            "records_dropped": max(0, self._cursor - self.capacity - meta["first"]),
+        }
+        summary.update(details)
+        with self._lock:
+            meta["summary"] = summary
+            meta["last"] = self._cursor
+            if self._current == meta["seq"]:
+                self._current = None
+        if self._session_factory is not None:
+            self._queue.put(summary)
+            self._ensure_writer()
+        return summary
+
+    # --- Records ---
+
+    def record(
+        self,
+        order_id: str,
+        asset_id: str,
+        priority: float,
+        candidates: int,
+        engineer_id: Optional[str],
+        fallback: bool,
+        duration_minutes: int,
+        decide_us: float,
+    ) -> None:
+        slot = self._cursor % self.capacity
+        self._ring[slot] = (
+            self._current, order_id, asset_id, priority, candidates,
+            engineer_id, fallback, duration_minutes, decide_us,
+        )
+        self._cursor += 1
+
+    def extend(self, records: List[Tuple], run_id: Optional[str] = None) -> None:
+        """Adopt records made elsewhere (e.g. by a worker process) into ``run_id`` or the current run."""
+        meta = self._runs.get(run_id) if run_id is not None else None
+        seq = meta["seq"] if meta is not None else self._current
+        for record in records:
+            self._ring[self._cursor % self.capacity] = (seq,) + tuple(record[1:])
+            self._cursor += 1
+
+    def records(self, run_id: str) -> List[Tuple]:
+        meta = self._runs.get(run_id)
+        if meta is None:
+            return []
+        last = meta.get("last", self._cursor)
+        first = max(meta["first"], self._cursor - self.capacity)
+        seq = meta["seq"]
+        found = []
+        for n in range(first, last):
+            record = self._ring[n % self.capacity]
+            if record is not None and record[0] == seq:
+                found.append(record)
+        return found
+
+    def take(self, run_id: Optional[str]) -> List[Tuple]:
+        """Records of a run, then forget the run (worker processes hand these back)."""
+        if run_id is None:
+            return []
+        records = self.records(run_id)
+        meta = self._runs.pop(run_id)
+        if self._current == meta["seq"]:
+            self._current = None
+        return records
+
+    def run_report(self, run_id: str) -> Optional[Dict]:
+        meta = self._runs.get(run_id)
+        if meta is None:
+            return None
+        return {
+            "run_id": run_id,
+            "summary": meta.get("summary"),
+            "records": [dict(zip(RECORD_FIELDS[1:], r[1:])) for r in self.records(run_id)],
+        }
+
+    # --- Async flush ---
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        self._writer = threading.Thread(target=self._drain, name="decision-trace", daemon=True)
+        self._writer.start()
+
+    def _drain(self) -> None:
+        from Persistence.models import EventLogModel
+        while True:
+            summary = self._queue.get()
+            db = self._session_factory()
+            try:
+                db.add(EventLogModel(event_type=TRACE_EVENT, payload=summary))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] Decision trace flush failed: {e}")
+            finally:
+                db.close()
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until queued summaries are written."""
+        self._queue.join()
+
+
+trace = DecisionTrace(LEVELS.get(os.environ.get("DECISION_TRACE_LEVEL", "decisions").lower(), DECISIONS))
@@ -0,0 +1,213 @@
+"""Asset dependency graph and impact-weighted priority.
+
+An edge upstream -> downstream means the downstream asset idles when the
+upstream one is down (a conveyor feeding ten machines).  Each asset's
+*exposure* is its own stake (``risk_level``) plus the damped, weighted
+exposure of everything downstream of it:
+
+    exposure(a) = risk(a) + DAMPING * sum(weight(a, b) * exposure(b))
+
+Weights are not normalized by out-degree (a conveyor feeding ten machines
+carries all ten), so the fixed point only exists without cycles: a loop
+that branches grows without bound.  ``add_edge`` refuses an edge that
+would close a cycle, and ``load`` leaves out of the mirror each stored
+edge that closes one (found by a depth-first walk).  The impact-weighted
+priority is ``calculate_priority`` with exposure in place
+of risk: ``exposure / (health / 100)``.  An asset with nothing downstream
+keeps exactly its old priority.
+
+Exposure does not depend on health, so a health reading costs nothing
+here.  A risk change or an edge change is pushed as a residual up the
+reverse edges (the push method for personalized PageRank): only ancestors
+of the change are touched, and each push stops once it falls below
+``tolerance``.  A push that runs past its budget gives up and recomputes
+every exposure in one pass, leaves first.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+DAMPING = 0.85
+
+
+class ImpactGraph:
+    def __init__(self, damping: float = DAMPING, tolerance: float = 1e-9):
+        self.damping = damping
+        self.tolerance = tolerance
+        self.stake: Dict[str, float] = {}
+        self.exposure: Dict[str, float] = {}
+        self.children: Dict[str, Dict[str, float]] = {}
+        self.parents: Dict[str, Dict[str, float]] = {}
+        self.loaded = False
+
+    # --- Building ---
+
+    def load(self, assets: Iterable, edges: Iterable[Tuple[str, str, float]]) -> "ImpactGraph":
+        """Rebuild from scratch; edges that close a cycle are left out."""
+        self.__init__(self.damping, self.tolerance)
+        for asset in assets:
+            self.stake[asset.asset_id] = float(getattr(asset, "risk_level", 0) or 0)
+            self.exposure[asset.asset_id] = 0.0
+            self.children[asset.asset_id] = {}
+            self.parents[asset.asset_id] = {}
+        for upstream, downstream, weight in edges:
+            if upstream in self.stake and downstream in self.stake and upstream != downstream:
+                self.children[upstream][downstream] = float(weight)
+                self.parents[downstream][upstream] = float(weight)
+        for upstream, downstream in self._back_edges():
+            del self.children[upstream][downstream]
+            del self.parents[downstream][upstream]
+        self._recompute()
+        self.loaded = True
+        return self
+
+    def _back_edges(self) -> List[Tuple[str, str]]:
+        """Edges that close a cycle: those into an asset still on the depth-first stack."""
+        state: Dict[str, int] = {}    # 1 on the stack, 2 done
+        back = []
+        for root in self.stake:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(self.children[root]))]
+            while stack:
+                asset, kids = stack[-1]
+                child = next(kids, None)
+                if child is None:
+                    state[asset] = 2
+                    stack.pop()
+                elif state.get(child) == 1:
+                    back.append((asset, child))
+                elif child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(self.children[child])))
+        return back
+
+    def _recompute(self) -> None:
+        """Every exposure from scratch, leaves first (Kahn's order on out-degree)."""
+        pending = {a: len(kids) for a, kids in self.children.items()}
+        order = [a for a, count in pending.items() if count == 0]
+        for asset in order:
+            for parent in self.parents[asset]:
+                pending[parent] -= 1
+                if pending[parent] == 0:
+                    order.append(parent)
+        for asset in order:
+            self.exposure[asset] = self.stake[asset] + self.damping * sum(
+                weight * self.exposure[child] for child, weight in self.children[asset].items()
+            )
+
+    def _push(self, residual: Dict[str, float], order: Iterable[str]) -> int:
+        """Settle residuals into exposure, passing damped shares up to parents; returns pushes made."""
+        queue = deque(order)
+        waiting = set(queue)
+        pushes = 0
+        budget = 8 * len(self.stake) + 64
+        while queue:
+            if pushes >= budget:
+                self._recompute()
+                return pushes
+            asset = queue.popleft()
+            waiting.discard(asset)
+            amount = residual.pop(asset, 0.0)
+            if amount == 0.0:
+                continue
+            self.exposure[asset] += amount
+            pushes += 1
+            for parent, weight in self.parents[asset].items():
+                share = residual.get(parent, 0.0) + self.damping * weight * amount
+                residual[parent] = share
+                if abs(share) > self.tolerance and parent not in waiting:
+                    waiting.add(parent)
+                    queue.append(parent)
+        return pushes
+
+    # --- Incremental updates ---
+
+    def add_asset(self, asset) -> None:
+        if asset.asset_id in self.stake:
+            self.set_risk(asset.asset_id, getattr(asset, "risk_level", 0) or 0)
+            return
+        self.stake[asset.asset_id] = 0.0
+        self.exposure[asset.asset_id] = 0.0
+        self.children[asset.asset_id] = {}
+        self.parents[asset.asset_id] = {}
+        self.set_risk(asset.asset_id, getattr(asset, "risk_level", 0) or 0)
+
+    def remove_asset(self, asset_id: str) -> None:
+        if asset_id not in self.stake:
+            return
+        for child in list(self.children[asset_id]):
+            self.remove_edge(asset_id, child)
+        for parent in list(self.parents[asset_id]):
+            self.remove_edge(parent, asset_id)
+        self.set_risk(asset_id, 0.0)
+        for table in (self.stake, self.exposure, self.children, self.parents):
+            del table[asset_id]
+
+    def set_risk(self, asset_id: str, risk: float) -> int:
+        """New stake for one asset; only its ancestors are updated."""
+        if asset_id not in self.stake:
+            return 0
+        delta = float(risk) - self.stake[asset_id]
+        self.stake[asset_id] = float(risk)
+        return self._push({asset_id: delta}, [asset_id]) if delta else 0
+
+    def closes_cycle(self, upstream: str, downstream: str) -> bool:
+        """Whether ``upstream -> downstream`` would put an asset downstream of itself."""
+        if upstream == downstream:
+            return True
+        seen, stack = {downstream}, [downstream]
+        while stack:
+            for child in self.children.get(stack.pop(), {}):
+                if child == upstream:
+                    return True
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return False
+
+    def add_edge(self, upstream: str, downstream: str, weight: float = 1.0) -> int:
+        if upstream not in self.stake or downstream not in self.stake or self.closes_cycle(upstream, downstream):
+            raise ValueError(f"Cannot link {upstream} -> {downstream}")
+        old = self.children[upstream].get(downstream, 0.0)
+        self.children[upstream][downstream] = float(weight)
+        self.parents[downstream][upstream] = float(weight)
+        # The upstream asset gains its new share of the downstream's settled exposure
+        delta = self.damping * (float(weight) - old) * self.exposure[downstream]
+        return self._push({upstream: delta}, [upstream]) if delta else 0
+
+    def remove_edge(self, upstream: str, downstream: str) -> int:
+        weight = self.children.get(upstream, {}).pop(downstream, None)
+        if weight is None:
+            return 0
+        del self.parents[downstream][upstream]
+        delta = -self.damping * weight * self.exposure[downstream]
+        return self._push({upstream: delta}, [upstream]) if delta else 0
+
+    # --- Queries ---
+
+    def priority(self, asset) -> float:
+        """Impact-weighted ``calculate_priority`` of an asset (its current health, its exposure)."""
+        if not asset:
+            return 0.0
+        health = max(1, getattr(asset, "health_score", 100))
+        exposure = self.exposure.get(asset.asset_id, float(getattr(asset, "risk_level", 0)))
+        return exposure / (health / 100.0)
+
+    def stakes(self) -> Dict[str, float]:
+        """Exposure of every asset whose downstream adds to it (others are just their risk)."""
+        return {
+            a: exposure for a, exposure in self.exposure.items()
+            if self.children[a] and exposure != self.stake[a]
+        }
+
+    def downstream(self, asset_id: str) -> List[str]:
+        """Every asset that idles when ``asset_id`` is down."""
+        seen, stack = set(), [asset_id]
+        while stack:
+            for child in self.children.get(stack.pop(), {}):
+                if child not in seen and child != asset_id:
+                    seen.add(child)
+                    stack.append(child)
+        return sorted(seen)
+
@@ -0,0 +1,197 @@
+"""Deadline-driven alert escalation.
+
+``escalate_alert`` only answers "is this alert overdue right now?", so
+driving it means polling every open alert.  ``EscalationScheduler`` keeps
+one deadline per open alert (created_at + its ESCALATION_RULES timeout)
+in a min-heap and sleeps until the earliest one, so the cost is a heap
+push per alert and nothing at all while no deadline is due.
+
+Cancelling (resolution, or an escalation already on record) just drops
+the alert from the deadline dict; its heap entry is skipped when it
+surfaces, and the heap is compacted once stale entries dominate.
+
+State is rebuilt from ALERT_CREATED / ALERT_ESCALATED / ALERT_RESOLVED
+events, so a restart picks up every open alert and fires the ones whose
+deadline passed while the process was down.
+
+Every web worker process runs its own scheduler over the same log, so all
+of them reach the same deadline.  A unique partial index on the alert id of
+ALERT_ESCALATED rows (``ESCALATED_ONCE``) lets the database refuse every
+escalation after the first; ``fire`` inserts with ON CONFLICT DO NOTHING,
+so exactly one worker records each escalation regardless of how the
+database schedules concurrent writers.  ``install`` adds the index to an
+event_log created before it existed.
+"""
+import heapq
+import itertools
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.dialects.sqlite import insert
+
+from domain.alert import AlertSeverity
+from domain.escalation import ESCALATION_RULES
+from Persistence.models import ESCALATED_ONCE, EventLogModel
+
+ALERT_EVENTS = ("ALERT_CREATED", "ALERT_ESCALATED", "ALERT_RESOLVED")
+
+# ALERT_ESCALATED, unless ESCALATED_ONCE finds one already on record for the alert
+_ESCALATE_ONCE = insert(EventLogModel.__table__).on_conflict_do_nothing()
+
+
+def install(bind) -> None:
+    """Create the one-escalation-per-alert index if the event log predates it (idempotent)."""
+    ESCALATED_ONCE.create(bind, checkfirst=True)
+
+
+def _payload(raw) -> Dict:
+    return json.loads(raw) if isinstance(raw, str) else (raw or {})
+
+
+class EscalationScheduler:
+    def __init__(self, poll_seconds: float = 5.0):
+        self.poll_seconds = poll_seconds
+        self.last_event_id = 0
+        self._deadlines: Dict[str, Tuple[datetime, AlertSeverity]] = {}
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, alert_id: str, severity: AlertSeverity, created_at: datetime) -> bool:
+        """Track an alert until its severity's timeout; severities without a rule never escalate."""
+        timeout = ESCALATION_RULES.get(severity)
+        if timeout is None:
+            return False
+        with self._lock:
+            if alert_id in self._deadlines:
+                return False
+            deadline = created_at + timeout
+            self._deadlines[alert_id] = (deadline, severity)
+            heapq.heappush(self._heap, (deadline, next(self._seq), alert_id))
+            earliest = self._heap[0][2] == alert_id
+        if earliest:
+            self._wake.set()
+        return True
+
+    def cancel(self, alert_id: str) -> bool:
+        with self._lock:
+            if self._deadlines.pop(alert_id, None) is None:
+                return False
+            # Lazy deletion leaves stale heap entries; rebuild once they dominate
+            if len(self._heap) > 64 and len(self._heap) > 2 * len(self._deadlines):
+                self._heap = [entry for entry in self._heap if self._live(entry)]
+                heapq.heapify(self._heap)
+            return True
+
+    def _live(self, entry) -> bool:
+        current = self._deadlines.get(entry[2])
+        return current is not None and current[0] == entry[0]
+
+    def next_deadline(self) -> Optional[datetime]:
+        with self._lock:
+            while self._heap and not self._live(self._heap[0]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def due(self, now: Optional[datetime] = None) -> List[Tuple[str, AlertSeverity, datetime]]:
+        """Pop every alert whose deadline has passed, earliest first."""
+        now = now or datetime.utcnow()
+        fired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                if self._live(entry):
+                    deadline, severity = self._deadlines.pop(entry[2])
+                    fired.append((entry[2], severity, deadline))
+        return fired
+
+    def fire(self, db, now: Optional[datetime] = None) -> List[str]:
+        """Record ALERT_ESCALATED for everything due, in one transaction; returns the alerts this call recorded."""
+        fired = self.due(now)
+        if not fired:
+            return []
+        recorded = []
+        for alert_id, severity, deadline in fired:
+            payload = {"alert_id": alert_id, "severity": severity.value, "deadline": deadline.isoformat()}
+            if db.execute(_ESCALATE_ONCE, {"event_type": "ALERT_ESCALATED", "payload": payload}).rowcount:
+                recorded.append(alert_id)
+        db.commit()
+        return recorded
+
+    def apply_event(self, event_type: str, payload, created_at: Optional[datetime] = None) -> None:
+        payload = _payload(payload)
+        alert_id = payload.get("alert_id")
+        if alert_id is None:
+            return
+        if event_type == "ALERT_CREATED":
+            try:
+                severity = AlertSeverity(payload.get("severity"))
+            except ValueError:
+                return
+            self.schedule(alert_id, severity, created_at or datetime.utcnow())
+        elif event_type in ("ALERT_ESCALATED", "ALERT_RESOLVED"):
+            self.cancel(alert_id)
+
+    def refresh(self, db) -> int:
+        """Fold in alert events appended since the last refresh (all of them on the first call)."""
+        events = (
+            db.query(EventLogModel)
+            .filter(EventLogModel.event_type.in_(ALERT_EVENTS), EventLogModel.id > self.last_event_id)
+            .order_by(EventLogModel.id)
+            .all()
+        )
+        # One lock for the whole batch so a created+escalated pair never fires in between
+        with self._lock:
+            for event in events:
+                self.apply_event(event.event_type, event.payload, event.created_at)
+                self.last_event_id = event.id
+        return len(events)
+
+    @classmethod
+    def rebuild(cls, db, **kwargs) -> "EscalationScheduler":
+        scheduler = cls(**kwargs)
+        scheduler.refresh(db)
+        return scheduler
+
+    # --- Background driver ---
+
+    def run(self, session_factory) -> None:
+        """Sleep until the next deadline (or the poll interval), refresh from the log, fire."""
+        while not self._stop.is_set():
+            db = session_factory()
+            try:
+                self.refresh(db)
+                self.fire(db)
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] Escalation sweep failed: {e}")
+            finally:
+                db.close()
+            timeout = self.poll_seconds
+            deadline = self.next_deadline()
+            if deadline is not None:
+                timeout = min(timeout, max((deadline - datetime.utcnow()).total_seconds(), 0.0))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def start(self, session_factory) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(session_factory,), name="escalations", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
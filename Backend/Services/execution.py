@@ -0,0 +1,133 @@
+"""Off-loop execution of schedule solves.
+
+``POST /schedule`` used to run the solver on the event loop, stalling
+every other request on the worker.  The route now freezes its inputs with
+``schedule_trace.capture`` (plain lists, cheap to pickle) and hands them
+to ``SolverPool``: a persistent process pool whose result is awaited
+without blocking the loop.  Only reading the inputs and persisting the
+result stay in the web worker.
+
+The pool admits ``max_workers + queue_depth`` runs at a time; beyond that
+``submit`` raises ``PoolSaturated`` so callers can shed load instead of
+queueing without bound.  ``max_workers=0`` solves in a single background
+thread of the web worker instead (no extra processes).
+"""
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .anytime import run_anytime
+from .assignment_solver import plan_cost, solve_min_cost
+from .decision_trace import trace
+from .partitioning import run_partitioned
+from .schedule_trace import replay_inputs
+from .timeline import ScheduleCalendar
+
+
+class PoolSaturated(RuntimeError):
+    pass
+
+
+def solve(
+    assets: List,
+    orders: List,
+    engineers: List,
+    calendar: ScheduleCalendar,
+    strategy: str = "greedy",
+    deadline_ms: Optional[int] = None,
+) -> Tuple[List[Dict], float, str, Optional[Dict]]:
+    """Run one strategy: (allocations, total_cost, winning strategy, anytime report)."""
+    initial_fatigue = {e.engineer_id: e.fatigue or 0.0 for e in engineers}
+    if deadline_ms is not None:
+        # Anytime: greedy first, then the best plan the strategies find within the budget
+        allocations, total_cost, report = run_anytime(assets, orders, engineers, calendar, deadline_ms)
+        return allocations, total_cost, report["winner"], report
+    if strategy == "min_cost":
+        allocations, total_cost = solve_min_cost(assets, orders, engineers, calendar)
+        return allocations, total_cost, strategy, None
+    # Same plan as run_orchestration; independent cert partitions run on separate cores
+    allocations = run_partitioned(assets, orders, engineers, calendar)
+    return allocations, plan_cost(assets, orders, engineers, allocations, initial_fatigue), strategy, None
+
+
+def solve_snapshot(job: Dict) -> Dict:
+    """Worker entry point: solve a captured snapshot and return only what persistence needs."""
+    trace.set_level(job.get("trace_level", trace.level))
+    run_id = trace.begin_run("worker")
+    assets, orders, engineers, calendar = replay_inputs(job)
+    before = {e.engineer_id: e.fatigue for e in engineers}
+
+    began = time.perf_counter()
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        allocations, total_cost, strategy, report = solve(
+            assets, orders, engineers, calendar, job.get("strategy", "greedy"), job.get("deadline_ms")
+        )
+    solve_ms = (time.perf_counter() - began) * 1000.0
+
+    return {
+        "allocations": allocations,
+        "total_cost": total_cost,
+        "strategy": strategy,
+        "anytime": report,
+        "fatigue": {e.engineer_id: e.fatigue for e in engineers if e.fatigue != before[e.engineer_id]},
+        "records": trace.take(run_id),
+        "solve_ms": solve_ms,
+    }
+
+
+def _noop() -> None:
+    return None
+
+
+class SolverPool:
+    def __init__(self, max_workers: int = 2, queue_depth: int = 8):
+        self.max_workers = max(max_workers, 0)
+        self.queue_depth = max(queue_depth, 0)
+        self.in_flight = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.max_workers, 1) + self.queue_depth
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers == 0:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+                else:
+                    # The web worker runs background threads; never fork it mid-request
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def start(self) -> None:
+        """Spawn the workers up front so the first schedule run does not pay for it."""
+        executor = self._get_executor()
+        for future in [executor.submit(_noop) for _ in range(max(self.max_workers, 1))]:
+            future.result()
+
+    async def submit(self, fn: Callable, *args):
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                raise PoolSaturated(f"{self.in_flight} schedule runs already in progress")
+            self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,311 @@
+"""Bounded health history and threshold-crossing forecasts.
+
+``HealthHistory`` keeps, per asset, a fixed-size ring buffer of
+``(timestamp, health)`` for each tier in ``TIERS``: every raw reading,
+then hourly and daily means.  A coarser tier takes the mean of its bucket
+when the bucket closes, so a year of readings costs the same few hundred
+bytes per asset as a day of them.  All tiers are plain NumPy arrays
+(asset row x slot), grown by doubling when assets are added, and saved to
+or loaded from one ``.npz`` file.  Times are int32 seconds from the
+store's epoch.
+
+Readings are logged to ``health_readings`` in the transaction of the
+change that produced them (``log_readings``); the rings are each
+process's view of that log.  ``refresh`` folds in whatever any web worker
+logged since the last call, so every worker forecasts from every reading.
+The ``.npz`` file is a checkpoint (with the last reading id it covers)
+that spares a restart the replay; a background thread rewrites it every
+few minutes and prunes readings older than the longest tier.
+
+``forecast`` fits a least-squares line to every asset's recent raw
+readings at once (masked sums over the ring arrays, no per-asset loop)
+and returns the hours until each decaying asset reaches the threshold.
+"""
+import datetime
+import itertools
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import insert
+
+from Persistence.models import HealthReadingModel
+
+# (name, bucket seconds, slots); bucket 0 keeps every reading
+TIERS = (("raw", 0, 32), ("hourly", 3600, 24), ("daily", 86400, 60))
+SCHEDULING_THRESHOLD = 50.0
+MIN_POINTS = 3
+# Older readings no longer reach any tier
+RETENTION = datetime.timedelta(seconds=max(bucket * slots for _, bucket, slots in TIERS))
+
+
+def log_readings(db, asset_ids: Sequence[str], health: Iterable[float], when: Optional[datetime.datetime] = None) -> None:
+    """Append one reading per asset to ``health_readings`` (caller commits)."""
+    when = when or datetime.datetime.now()
+    rows = [{"asset_id": a, "health": float(h), "recorded_at": when} for a, h in zip(asset_ids, health)]
+    if rows:
+        db.execute(insert(HealthReadingModel), rows)
+
+
+class _Ring:
+    def __init__(self, rows: int, slots: int, bucket: int):
+        self.bucket = bucket
+        self.times = np.zeros((rows, slots), dtype=np.int32)
+        self.values = np.zeros((rows, slots), dtype=np.float32)
+        self.head = np.zeros(rows, dtype=np.int32)
+        self.size = np.zeros(rows, dtype=np.int32)
+        # Open bucket per asset (coarse tiers only)
+        self.open = np.full(rows, -1, dtype=np.int64)
+        self.total = np.zeros(rows, dtype=np.float64)
+        self.count = np.zeros(rows, dtype=np.int32)
+
+    ARRAYS = ("times", "values", "head", "size", "open", "total", "count")
+
+    def grow(self, rows: int) -> None:
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            fill = -1 if name == "open" else 0
+            new = np.full((rows,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def write(self, rows: np.ndarray, times: np.ndarray, values: np.ndarray) -> None:
+        slots = self.times.shape[1]
+        pos = self.head[rows]
+        self.times[rows, pos] = times
+        self.values[rows, pos] = values
+        self.head[rows] = (pos + 1) % slots
+        self.size[rows] = np.minimum(self.size[rows] + 1, slots)
+
+    def add(self, rows: np.ndarray, times: np.ndarray, values: np.ndarray) -> None:
+        if not self.bucket:
+            self.write(rows, times, values)
+            return
+        buckets = times // self.bucket
+        closing = (self.open[rows] >= 0) & (self.open[rows] != buckets)
+        if closing.any():
+            done = rows[closing]
+            mids = self.open[done] * self.bucket + self.bucket // 2
+            self.write(done, mids, self.total[done] / self.count[done])
+        restart = self.open[rows] != buckets
+        self.open[rows[restart]] = buckets[restart]
+        self.total[rows[restart]] = 0.0
+        self.count[rows[restart]] = 0
+        self.total[rows] += values
+        self.count[rows] += 1
+
+    def ordered(self, row: int):
+        """(times, values) of one asset, oldest first."""
+        size, head, slots = int(self.size[row]), int(self.head[row]), self.times.shape[1]
+        order = (np.arange(head - size, head)) % slots
+        return self.times[row, order], self.values[row, order]
+
+
+class HealthHistory:
+    def __init__(self, epoch: Optional[datetime.datetime] = None, tiers=TIERS):
+        self.epoch = epoch or datetime.datetime(2020, 1, 1)
+        self.tiers = tiers
+        self.rows: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.rings = {name: _Ring(0, slots, bucket) for name, bucket, slots in tiers}
+        self.last_reading_id = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _seconds(self, when: datetime.datetime) -> int:
+        return int((when - self.epoch).total_seconds())
+
+    def _row_indices(self, asset_ids: Sequence[str]) -> np.ndarray:
+        for asset_id in asset_ids:
+            if asset_id not in self.rows:
+                self.rows[asset_id] = len(self.ids)
+                self.ids.append(asset_id)
+        capacity = len(next(iter(self.rings.values())).head)
+        if len(self.ids) > capacity:
+            for ring in self.rings.values():
+                ring.grow(max(len(self.ids), 2 * capacity, 64))
+        return np.fromiter((self.rows[a] for a in asset_ids), dtype=np.int64, count=len(asset_ids))
+
+    def record(self, asset_id: str, health: float, when: Optional[datetime.datetime] = None) -> None:
+        self.record_many([asset_id], [health], when)
+
+    def record_many(self, asset_ids: Sequence[str], health: Iterable[float], when: Optional[datetime.datetime] = None) -> None:
+        """One reading per asset (ids must be distinct), all stamped ``when``."""
+        if not len(asset_ids):
+            return
+        values = np.asarray(list(health), dtype=np.float32)
+        with self._lock:
+            rows = self._row_indices(list(asset_ids))
+            times = np.full(len(rows), self._seconds(when or datetime.datetime.now()), dtype=np.int64)
+            for ring in self.rings.values():
+                ring.add(rows, times, values)
+
+    def refresh(self, db) -> int:
+        """Fold in readings logged since the last refresh, by any process; returns how many."""
+        reading = HealthReadingModel
+        with self._refresh_lock:
+            rows = db.query(reading.id, reading.asset_id, reading.health, reading.recorded_at).filter(
+                reading.id > self.last_reading_id
+            ).order_by(reading.id).all()
+            # One record_many per logged batch (same stamp); a repeated asset starts the next one
+            for when, group in itertools.groupby(rows, key=lambda row: row.recorded_at):
+                ids: List[str] = []
+                values: List[float] = []
+                for row in group:
+                    if row.asset_id in ids:
+                        self.record_many(ids, values, when)
+                        ids, values = [], []
+                    ids.append(row.asset_id)
+                    values.append(row.health)
+                self.record_many(ids, values, when)
+            if rows:
+                self.last_reading_id = rows[-1].id
+        return len(rows)
+
+    def series(self, asset_id: str, tier: str = "raw") -> List[Dict]:
+        row = self.rows.get(asset_id)
+        if row is None:
+            return []
+        with self._lock:
+            times, values = self.rings[tier].ordered(row)
+        return [
+            {"at": (self.epoch + datetime.timedelta(seconds=int(t))).isoformat(), "health": round(float(v), 2)}
+            for t, v in zip(times, values)
+        ]
+
+    def forget(self, asset_id: str) -> None:
+        """Clear an asset's rings (its row is reused if it comes back)."""
+        row = self.rows.get(asset_id)
+        if row is None:
+            return
+        with self._lock:
+            for ring in self.rings.values():
+                ring.head[row] = ring.size[row] = ring.count[row] = 0
+                ring.open[row] = -1
+
+    # --- Persistence ---
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            arrays = {
+                f"{name}.{field}": getattr(ring, field)[:len(self.ids)]
+                for name, ring in self.rings.items() for field in _Ring.ARRAYS
+            }
+            arrays["ids"] = np.array(self.ids, dtype=str)
+            arrays["epoch"] = np.array(self.epoch.isoformat())
+            arrays["last_reading_id"] = np.array(self.last_reading_id)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"    # every worker checkpoints to the same path
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "HealthHistory":
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as data:
+            history = cls(datetime.datetime.fromisoformat(str(data["epoch"])))
+            history.ids = [str(a) for a in data["ids"]]
+            history.rows = {a: i for i, a in enumerate(history.ids)}
+            if "last_reading_id" in data.files:
+                history.last_reading_id = int(data["last_reading_id"])
+            for name, ring in history.rings.items():
+                for field in _Ring.ARRAYS:
+                    setattr(ring, field, data[f"{name}.{field}"].copy())
+        return history
+
+    # --- Background checkpoint ---
+
+    def checkpoint(self, path: str, db) -> None:
+        """Catch up, save, and drop readings too old for any tier (already folded in here)."""
+        self.refresh(db)
+        self.save(path)
+        reading = HealthReadingModel
+        db.query(reading).filter(
+            reading.id <= self.last_reading_id,
+            reading.recorded_at < datetime.datetime.now() - RETENTION,
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def run(self, path: str, session_factory, every_seconds: float) -> None:
+        while not self._stop.wait(every_seconds):
+            db = session_factory()
+            try:
+                self.checkpoint(path, db)
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] Health history checkpoint failed: {e}")
+            finally:
+                db.close()
+
+    def start(self, path: str, session_factory, every_seconds: float) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, args=(path, session_factory, every_seconds), name="health-history", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def forecast(
+    history: HealthHistory,
+    now: Optional[datetime.datetime] = None,
+    threshold: float = SCHEDULING_THRESHOLD,
+    window_hours: float = 7 * 24,
+    min_points: int = MIN_POINTS,
+) -> Dict[str, np.ndarray]:
+    """Linear decay fit per asset over the raw tier, all assets in one pass.
+
+    Returns arrays aligned with ``asset_ids``: ``slope`` (health per hour),
+    ``health`` (fitted value now) and ``hours`` until the fit reaches
+    ``threshold`` - 0 if it already has, inf if the asset is not decaying
+    or has fewer than ``min_points`` readings in the window.
+    """
+    now_s = history._seconds(now or datetime.datetime.now())
+    count = len(history)
+    ring = history.rings["raw"]
+    with history._lock:
+        times = ring.times[:count].astype(np.float64)
+        values = ring.values[:count].astype(np.float64)
+        size = ring.size[:count].copy()
+    t = (times - now_s) / 3600.0
+    mask = (np.arange(times.shape[1]) < size[:, None]) & (t >= -window_hours) & (t <= 0)
+
+    n = mask.sum(axis=1).astype(np.float64)
+    st = np.where(mask, t, 0.0).sum(axis=1)
+    sv = np.where(mask, values, 0.0).sum(axis=1)
+    stt = np.where(mask, t * t, 0.0).sum(axis=1)
+    stv = np.where(mask, t * values, 0.0).sum(axis=1)
+    denom = n * stt - st * st
+
+    fitted = (n >= min_points) & (denom > 1e-12)
+    slope = np.zeros(count)
+    np.divide(n * stv - st * sv, denom, out=slope, where=fitted)
+    level = np.full(count, np.nan)
+    np.divide(sv - slope * st, n, out=level, where=fitted)
+
+    hours = np.full(count, np.inf)
+    decaying = fitted & (slope < 0)
+    np.divide(threshold - level, slope, out=hours, where=decaying)
+    hours[fitted & (level <= threshold)] = 0.0
+    return {"asset_ids": np.array(history.ids, dtype=object), "slope": slope, "health": level, "hours": hours}
+
+
+def due_within(history: HealthHistory, hours: float, now: Optional[datetime.datetime] = None,
+               threshold: float = SCHEDULING_THRESHOLD) -> Dict[str, float]:
+    """asset_id -> hours until the threshold, for assets forecast to cross it within ``hours``."""
+    result = forecast(history, now, threshold)
+    soon = np.flatnonzero(result["hours"] <= hours)
+    return {result["asset_ids"][i]: float(result["hours"][i]) for i in soon}
@@ -0,0 +1,318 @@
+"""Event-driven planning that keeps the schedule as live state.
+
+``POST /schedule`` rebuilds the world on every call: every asset is scanned
+against the health threshold and every engineer is re-indexed.  The planner
+here bootstraps that state once and then reacts to single events (a health
+reading, a completed order, an engineer joining or leaving), touching only
+the orders and engineers the event concerns.  A reaction is a few index and
+calendar operations, independent of plant size.  ``check`` keeps the full
+rescan available to detect (and repair) any drift from the database.
+"""
+import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Set
+
+from domain.maintenance import MaintenanceOrder
+from .matching import EngineerIndex, FATIGUE_LIMIT
+from .orchestrator import assign_order, build_emergency_order, calculate_priority
+from .timeline import ScheduleCalendar
+
+# Same trigger as the /schedule scan
+HEALTH_THRESHOLD = 50.0
+
+_ASSET_FIELDS = ("asset_id", "health_score", "risk_level", "required_certifications")
+_ENGINEER_FIELDS = ("engineer_id", "name", "certifications", "skill_matrix", "availability", "fatigue")
+
+
+def _snapshot(obj, fields) -> SimpleNamespace:
+    """Detached copy of a row, safe to keep after its session is closed."""
+    return SimpleNamespace(**{field: getattr(obj, field, None) for field in fields})
+
+
+def _order_for_row(row, asset) -> MaintenanceOrder:
+    certs = getattr(asset, "required_certifications", None) or []
+    return MaintenanceOrder(
+        order_id=row.order_id,
+        asset_id=row.asset_id,
+        required_certifications=set(certs),
+        task_type="Emergency Repair",
+        base_time_minutes=120,
+        task_difficulty=1.5
+    )
+
+
+class IncrementalPlanner:
+    def __init__(self, threshold: float = HEALTH_THRESHOLD):
+        self.threshold = threshold
+        self.assets: Dict[str, SimpleNamespace] = {}
+        self.engineers: Dict[str, SimpleNamespace] = {}
+        self.index = EngineerIndex([])
+        self.calendar = ScheduleCalendar()
+
+        self.orders: Dict[str, object] = {}          # open orders, planned or waiting
+        self.plan: Dict[str, Dict] = {}              # order_id -> allocation
+        self.open_by_asset: Dict[str, str] = {}      # asset_id -> open order_id
+        self.by_engineer: Dict[str, Set[str]] = {}   # engineer_id -> planned order_ids
+        self.waiting: Dict[str, object] = {}         # orders nobody could take yet
+        self.fallback: Set[str] = set()              # planned without the required certs
+        self.used_ids: Set[str] = set()              # every order id already in the database
+
+    # --- State ---
+
+    def bootstrap(
+        self,
+        assets: Iterable,
+        engineers: Iterable,
+        open_orders: Iterable,
+        used_ids: Iterable[str] = (),
+        crews: Optional[Dict[str, List[str]]] = None,
+    ) -> List[Dict]:
+        """Load the plant once, adopt the open orders and plan every uncovered need.
+
+        ``crews`` maps crewed order ids to their members, lead first.
+        """
+        self.__init__(self.threshold)
+        crews = crews or {}
+        self.used_ids = set(used_ids)
+        for asset in assets:
+            self.assets[asset.asset_id] = _snapshot(asset, _ASSET_FIELDS)
+        for engineer in engineers:
+            snap = _snapshot(engineer, _ENGINEER_FIELDS)
+            snap.fatigue = snap.fatigue or 0.0
+            self.engineers[snap.engineer_id] = snap
+        self.index = EngineerIndex(self.engineers.values())
+
+        rows = list(open_orders)
+        self.calendar.seed(rows)
+        self.calendar.seed(
+            SimpleNamespace(assigned_engineer_id=member, scheduled_date=row.scheduled_date, end_time=row.end_time)
+            for row in rows for member in crews.get(row.order_id, [])[1:]
+        )
+        for row in rows:
+            self.orders[row.order_id] = _order_for_row(row, self.assets.get(row.asset_id))
+            self.open_by_asset[row.asset_id] = row.order_id
+            if row.assigned_engineer_id and row.scheduled_date and row.end_time:
+                engineer = self.engineers.get(row.assigned_engineer_id)
+                allocation = {
+                    "order_id": row.order_id,
+                    "engineer_id": row.assigned_engineer_id,
+                    "engineer_name": getattr(engineer, "name", "Unknown Engineer"),
+                    "asset_id": row.asset_id,
+                    "duration_minutes": int((row.end_time - row.scheduled_date).total_seconds() // 60),
+                    "start_time": row.scheduled_date.isoformat(),
+                    "end_time": row.end_time.isoformat(),
+                }
+                if len(crews.get(row.order_id, [])) > 1:
+                    allocation["crew"] = list(crews[row.order_id])
+                self._track(allocation)
+
+        needs = [
+            asset for asset in self.assets.values()
+            if float(asset.health_score) < self.threshold and asset.asset_id not in self.open_by_asset
+        ]
+        orders = []
+        for asset in needs:
+            order = self._new_order(asset)
+            self.orders[order.order_id] = order
+            orders.append(order)
+        return self._place_batch(orders)
+
+    def fatigue_of(self, engineer_id: str) -> float:
+        return self.engineers[engineer_id].fatigue
+
+    def _now(self) -> datetime.datetime:
+        return datetime.datetime.utcnow()
+
+    def _required_mask(self, order) -> int:
+        asset = self.assets.get(order.asset_id)
+        return self.index.mask_of(getattr(asset, "required_certifications", None) or [])
+
+    def _track(self, allocation: Dict) -> None:
+        order_id = allocation["order_id"]
+        self.plan[order_id] = allocation
+        held = 0
+        for engineer_id in allocation.get("crew") or [allocation["engineer_id"]]:
+            self.by_engineer.setdefault(engineer_id, set()).add(order_id)
+            engineer = self.engineers.get(engineer_id)
+            if engineer is not None:
+                held |= self.index.engineer_mask(engineer)
+        required = self._required_mask(self.orders[order_id])
+        if held & required != required:
+            self.fallback.add(order_id)
+
+    def _untrack(self, order_id: str, refund: bool = False) -> Optional[Dict]:
+        """Drop an order from the plan and free its slot; ``refund`` returns unworked fatigue."""
+        allocation = self.plan.pop(order_id, None)
+        if allocation is None:
+            return None
+        self.fallback.discard(order_id)
+        for engineer_id in allocation.get("crew") or [allocation["engineer_id"]]:
+            self.by_engineer.get(engineer_id, set()).discard(order_id)
+            self.calendar.release(
+                engineer_id,
+                datetime.datetime.fromisoformat(allocation["start_time"]),
+                datetime.datetime.fromisoformat(allocation["end_time"]),
+            )
+            engineer = self.engineers.get(engineer_id)
+            if refund and engineer is not None:
+                self.index.set_fatigue(engineer, max(0.0, engineer.fatigue - allocation["duration_minutes"] / 60.0))
+        return allocation
+
+    def _forget(self, order_id: str) -> None:
+        order = self.orders.pop(order_id, None)
+        self.waiting.pop(order_id, None)
+        if order is not None and self.open_by_asset.get(order.asset_id) == order_id:
+            del self.open_by_asset[order.asset_id]
+
+    def _new_order(self, asset) -> MaintenanceOrder:
+        # Emergency ids only carry three random digits; the upsert would overwrite a reused one
+        order = build_emergency_order(asset)
+        while order.order_id in self.orders or order.order_id in self.used_ids:
+            order = build_emergency_order(asset)
+        self.used_ids.add(order.order_id)
+        return order
+
+    def _place(self, order, earliest: Optional[datetime.datetime] = None) -> Optional[Dict]:
+        self.orders[order.order_id] = order
+        self.open_by_asset[order.asset_id] = order.order_id
+        allocation = assign_order(order, self.assets.get(order.asset_id), self.index, self.calendar, earliest)
+        if allocation is None:
+            self.waiting[order.order_id] = order
+            return None
+        self.waiting.pop(order.order_id, None)
+        self._track(allocation)
+        return allocation
+
+    def _place_batch(self, orders: List, earliest: Optional[datetime.datetime] = None) -> List[Dict]:
+        prioritized = sorted(
+            orders, key=lambda o: calculate_priority(self.assets.get(o.asset_id)), reverse=True
+        )
+        allocations = [self._place(order, earliest) for order in prioritized]
+        return [a for a in allocations if a is not None]
+
+    def _repack(self, engineer_id: str) -> List[Dict]:
+        """Pull an engineer's not-yet-started solo orders forward into freed time (crews keep their slot)."""
+        engineer = self.engineers.get(engineer_id)
+        if engineer is None:
+            return []
+        now = self._now()
+        upcoming = sorted(
+            (self.plan[o] for o in self.by_engineer.get(engineer_id, ())
+             if datetime.datetime.fromisoformat(self.plan[o]["start_time"]) > now and not self.plan[o].get("crew")),
+            key=lambda a: a["start_time"],
+        )
+        for allocation in upcoming:
+            self.calendar.release(
+                engineer_id,
+                datetime.datetime.fromisoformat(allocation["start_time"]),
+                datetime.datetime.fromisoformat(allocation["end_time"]),
+            )
+
+        moved = []
+        for allocation in upcoming:
+            start_time, end_time = self.calendar.book(engineer, allocation["duration_minutes"], now)
+            if start_time.isoformat() != allocation["start_time"]:
+                allocation["start_time"] = start_time.isoformat()
+                allocation["end_time"] = end_time.isoformat()
+                moved.append(allocation)
+        return moved
+
+    # --- Events ---
+
+    def on_asset_added(self, asset) -> List[Dict]:
+        self.assets[asset.asset_id] = _snapshot(asset, _ASSET_FIELDS)
+        return self.on_health(asset.asset_id, asset.health_score)
+
+    def on_health(self, asset_id: str, health_score: float, risk_level: Optional[float] = None) -> List[Dict]:
+        """A new health reading; opens an order on a threshold crossing, drops unstaffed ones on recovery."""
+        asset = self.assets.get(asset_id)
+        if asset is None:
+            return []
+        asset.health_score = health_score
+        if risk_level is not None:
+            asset.risk_level = risk_level
+
+        order_id = self.open_by_asset.get(asset_id)
+        if float(health_score) < self.threshold:
+            if order_id is None:
+                allocation = self._place(self._new_order(asset), self._now())
+                return [allocation] if allocation else []
+        elif order_id in self.waiting:
+            self._forget(order_id)
+        return []
+
+    def on_order_completed(self, order_id: str) -> List[Dict]:
+        """Close an order and pull its engineers' later work into the freed slot."""
+        allocation = self._untrack(order_id)
+        self._forget(order_id)
+        if allocation is None:
+            return []
+        return [moved for engineer_id in allocation.get("crew") or [allocation["engineer_id"]]
+                for moved in self._repack(engineer_id)]
+
+    def on_engineer_added(self, engineer) -> List[Dict]:
+        """Enrol a new engineer, hand them fallback work they are certified for, then retry waiting orders."""
+        snap = _snapshot(engineer, _ENGINEER_FIELDS)
+        snap.fatigue = snap.fatigue or 0.0
+        self.engineers[snap.engineer_id] = snap
+        self.index.add(snap)
+
+        now = self._now()
+        mask = self.index.engineer_mask(snap)
+        changes = []
+        upgrades = sorted(
+            self.fallback, key=lambda o: calculate_priority(self.assets.get(self.orders[o].asset_id)), reverse=True
+        )
+        for order_id in upgrades:
+            required = self._required_mask(self.orders[order_id])
+            if snap.fatigue >= FATIGUE_LIMIT:
+                break
+            started = datetime.datetime.fromisoformat(self.plan[order_id]["start_time"]) <= now
+            if mask & required != required or started:
+                continue
+            self._untrack(order_id, refund=True)
+            allocation = self._place(self.orders[order_id], now)
+            if allocation is not None:
+                changes.append(allocation)
+        return changes + self.retry_waiting()
+
+    def on_engineer_removed(self, engineer_id: str) -> List[Dict]:
+        """Retire an engineer and re-plan only the orders they were holding."""
+        engineer = self.engineers.get(engineer_id)
+        if engineer is None:
+            return []
+        orphaned = [self.orders[o] for o in list(self.by_engineer.get(engineer_id, ()))]
+        for order in orphaned:
+            self._untrack(order.order_id)
+        self.index.remove(engineer)
+        del self.engineers[engineer_id]
+        self.by_engineer.pop(engineer_id, None)
+        return self._place_batch(orphaned, self._now())
+
+    def retry_waiting(self) -> List[Dict]:
+        if not self.waiting or not self.index.rested_count:
+            return []
+        return self._place_batch(list(self.waiting.values()), self._now())
+
+    # --- Consistency ---
+
+    def check(self, assets: Iterable, open_orders: Iterable) -> Dict:
+        """Full rescan of fresh rows against the planner's state."""
+        assets = list(assets)
+        db_orders = {row.order_id: row for row in open_orders}
+        covered = {row.asset_id for row in db_orders.values()} | {o.asset_id for o in self.waiting.values()}
+
+        report = {
+            "uncovered_assets": sorted(
+                a.asset_id for a in assets
+                if float(a.health_score) < self.threshold and a.asset_id not in covered
+            ),
+            "unknown_orders": sorted(set(db_orders) - set(self.orders)),
+            "missing_orders": sorted(set(self.plan) - set(db_orders)),
+            "health_drift": sorted(
+                a.asset_id for a in assets
+                if a.asset_id not in self.assets or self.assets[a.asset_id].health_score != a.health_score
+            ),
+        }
+        report["consistent"] = not any(report.values())
+        return report
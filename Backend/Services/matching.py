@@ -0,0 +1,177 @@
+"""Certification-indexed engineer pools for the orchestrator.
+
+Certifications are interned into bit positions so an engineer's
+qualifications collapse into a single int mask, with an inverted index
+(cert -> engineer positions) used to build pools without touching the
+whole roster.  Each distinct requirement set gets a lazily built pool
+holding its qualified engineers in a heap ordered by (fatigue, roster
+position), which is exactly the tie-break of ``min(eligible, key=fatigue)``.
+
+Fatigue bumps push a fresh entry into every pool the engineer belongs to;
+stale entries are dropped when they surface, so both selection and
+updates are O(log n).
+
+When nobody holds a whole requirement set, ``crew`` assembles the smallest
+team that holds it between them (see ``crew.cover``).
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+from .crew import MAX_CREW, cover
+
+# Engineers at or above this fatigue are never selected
+FATIGUE_LIMIT = 100.0
+
+
+class EngineerIndex:
+    def __init__(self, engineers: Iterable):
+        self.engineers = list(engineers)
+        self._bits: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._position = {id(e): pos for pos, e in enumerate(self.engineers)}
+
+        self._masks: List[int] = []
+        self._held = 0   # every cert anyone on the roster holds
+        for pos, e in enumerate(self.engineers):
+            certs = getattr(e, "certifications", []) or []
+            if isinstance(certs, str):
+                certs = [certs]
+            self._masks.append(self.mask_of(certs))
+            self._held |= self._masks[-1]
+            for cert in set(certs):
+                self._postings.setdefault(cert, []).append(pos)
+
+        self._fatigue = [getattr(e, "fatigue", 0) for e in self.engineers]
+        self._version = [0] * len(self.engineers)
+        self.rested_count = sum(1 for f in self._fatigue if f < FATIGUE_LIMIT)
+
+        # requirement mask -> heap of (fatigue, position, version)
+        self._pools: Dict[int, list] = {}
+        # requirement mask -> rested engineers qualified for it
+        self._pool_rested: Dict[int, int] = {}
+        self._last_mask = 0
+        # position -> requirement masks of the pools it belongs to
+        self._memberships: List[List[int]] = [[] for _ in self.engineers]
+
+    def mask_of(self, certs: Iterable[str]) -> int:
+        mask = 0
+        for cert in certs:
+            bit = self._bits.get(cert)
+            if bit is None:
+                bit = self._bits[cert] = len(self._bits)
+            mask |= 1 << bit
+        return mask
+
+    def engineer_mask(self, engineer) -> int:
+        return self._masks[self._position[id(engineer)]]
+
+    def _build_pool(self, required: List[str], mask: int) -> list:
+        if required:
+            postings = [self._postings.get(cert, []) for cert in set(required)]
+            shortest = min(postings, key=len)
+            members = [pos for pos in shortest if self._masks[pos] & mask == mask]
+        else:
+            members = range(len(self.engineers))
+
+        heap = []
+        for pos in members:
+            heap.append((self._fatigue[pos], pos, self._version[pos]))
+            self._memberships[pos].append(mask)
+        heapq.heapify(heap)
+        self._pools[mask] = heap
+        self._pool_rested[mask] = sum(1 for entry in heap if entry[0] < FATIGUE_LIMIT)
+        return heap
+
+    @property
+    def last_candidates(self) -> int:
+        """Rested engineers qualified for the requirements of the latest ``best`` call."""
+        return self._pool_rested[self._last_mask]
+
+    def best(self, required_certs) -> Optional[object]:
+        """Least-fatigued rested engineer holding every cert in ``required_certs``."""
+        if isinstance(required_certs, str):
+            required_certs = [required_certs]
+        required = list(required_certs or [])
+        mask = self.mask_of(required)
+        heap = self._pools.get(mask)
+        if heap is None:
+            heap = self._build_pool(required, mask)
+        self._last_mask = mask
+
+        while heap and heap[0][2] != self._version[heap[0][1]]:
+            heapq.heappop(heap)
+        if not heap or heap[0][0] >= FATIGUE_LIMIT:
+            return None
+        return self.engineers[heap[0][1]]
+
+    def crew(self, required_certs, max_size: int = MAX_CREW) -> Optional[List]:
+        """Fewest, then least-fatigued, rested engineers who hold ``required_certs`` between them."""
+        if isinstance(required_certs, str):
+            required_certs = [required_certs]
+        required = set(required_certs or [])
+        mask = self.mask_of(required)
+        if not mask or self._held & mask != mask:
+            return None
+
+        seen = set()
+        options = []
+        for cert in required:
+            for pos in self._postings.get(cert, ()):
+                if pos not in seen:
+                    seen.add(pos)
+                    if self._fatigue[pos] < FATIGUE_LIMIT:
+                        options.append((self._masks[pos], self._fatigue[pos], pos))
+        positions = cover(mask, options, max_size)
+        return None if positions is None else [self.engineers[pos] for pos in positions]
+
+    def set_fatigue(self, engineer, fatigue: float) -> None:
+        """Record a fatigue change and re-key the engineer in all of its pools."""
+        pos = self._position[id(engineer)]
+        old = self._fatigue[pos]
+        engineer.fatigue = fatigue
+        self._fatigue[pos] = fatigue
+        self._version[pos] += 1
+        change = (fatigue < FATIGUE_LIMIT) - (old < FATIGUE_LIMIT)
+        self.rested_count += change
+
+        entry = (fatigue, pos, self._version[pos])
+        for mask in self._memberships[pos]:
+            heapq.heappush(self._pools[mask], entry)
+            self._pool_rested[mask] += change
+
+    def add(self, engineer) -> None:
+        """Append a newly authorized engineer and enrol them in every pool they qualify for."""
+        pos = len(self.engineers)
+        certs = getattr(engineer, "certifications", []) or []
+        if isinstance(certs, str):
+            certs = [certs]
+        mask = self.mask_of(certs)
+
+        self.engineers.append(engineer)
+        self._position[id(engineer)] = pos
+        self._masks.append(mask)
+        self._held |= mask
+        for cert in set(certs):
+            self._postings.setdefault(cert, []).append(pos)
+        fatigue = getattr(engineer, "fatigue", 0)
+        self._fatigue.append(fatigue)
+        self._version.append(0)
+        self._memberships.append([])
+        self.rested_count += fatigue < FATIGUE_LIMIT
+
+        for pool_mask, heap in self._pools.items():
+            if mask & pool_mask == pool_mask:
+                heapq.heappush(heap, (fatigue, pos, 0))
+                self._memberships[pos].append(pool_mask)
+                self._pool_rested[pool_mask] += fatigue < FATIGUE_LIMIT
+
+    def remove(self, engineer) -> None:
+        """Retire an engineer; their heap entries go stale and are never selected again."""
+        pos = self._position.pop(id(engineer))
+        rested = self._fatigue[pos] < FATIGUE_LIMIT
+        self.rested_count -= rested
+        self._fatigue[pos] = float("inf")
+        self._version[pos] += 1
+        for mask in self._memberships[pos]:
+            self._pool_rested[mask] -= rested
+
@@ -1,11 +1,18 @@
 ﻿from typing import List, Optional, Dict
 import datetime
+import random
+import time
 # We use the Model types for type hinting to ensure compatibility with DB objects
 from Persistence.models import AssetModel, EngineerModel, MaintenanceModel
+from domain.maintenance import MaintenanceOrder
 
 # Local helpers
 from .alert_services import raise_critical_alert
 from .audit_service import log_allocation
+from .batch_scoring import order_priorities
+from .decision_trace import DECISIONS, trace
+from .matching import EngineerIndex
+from .timeline import ScheduleCalendar
 
 def calculate_priority(asset: Optional[AssetModel]) -> float:
     if not asset:
@@ -23,98 +30,189 @@ def calculate_actual_duration(engineer: EngineerModel, task_type: str, base_time
     base_calc = base_time * (difficulty / normalized_skill)
     return int(base_calc + 20) 
 
+def build_emergency_order(asset) -> MaintenanceOrder:
+    req_certs = set(asset.required_certifications) if asset.required_certifications else set()
+    return MaintenanceOrder(
+        order_id=f"ORD-{asset.asset_id[:5]}-{random.randint(100,999)}",
+        asset_id=asset.asset_id,
+        required_certifications=req_certs,
+        task_type="Emergency Repair",
+        base_time_minutes=120,
+        task_difficulty=1.5
+    )
+
+def build_predictive_order(asset) -> MaintenanceOrder:
+    """Work for an asset still above the threshold but forecast to cross it soon."""
+    req_certs = set(asset.required_certifications) if asset.required_certifications else set()
+    return MaintenanceOrder(
+        order_id=f"PRD-{asset.asset_id}-{random.randint(100,999)}",
+        asset_id=asset.asset_id,
+        required_certifications=req_certs,
+        task_type="Predictive Repair",
+        base_time_minutes=120,
+        task_difficulty=1.5
+    )
+
+def assign_order(
+    order,
+    asset,
+    index: EngineerIndex,
+    calendar: ScheduleCalendar,
+    earliest: Optional[datetime.datetime] = None,
+    allow_fallback: bool = True,
+    priority: float = 0.0,
+) -> Optional[Dict]:
+    """Greedy placement of a single order; returns its allocation or None if nobody is rested.
+
+    Requirements no single engineer covers go to a crew that covers them
+    together; only when no crew fits does the order fall back to the
+    general pool.  With ``allow_fallback=False`` an order nobody certified
+    can take returns None instead.
+    """
+    recording = trace.level >= DECISIONS
+    began = time.perf_counter() if recording else 0.0
+    required_certs = getattr(asset, "required_certifications", []) or []
+    if isinstance(required_certs, str):
+        required_certs = [required_certs]
+
+    if trace.verbose:
+        print(f"  - Requirements: {required_certs if required_certs else 'None'}")
+
+    # 2. Capability Matching (certification index, fatigue-gated)
+    best_eng = index.best(required_certs)
+    candidates = index.last_candidates if recording else 0
+
+    # --- FALLBACK LOGIC ---
+    if best_eng is None and not allow_fallback:
+        return None
+    if best_eng is None and required_certs:
+        # 2b. Crew: rested engineers who hold the certs between them
+        allocation = assign_crew(order, index.crew(required_certs), index, calendar, earliest)
+        if allocation is not None:
+            if recording:
+                trace.record(order.order_id, order.asset_id, priority, candidates, allocation["engineer_id"],
+                             False, allocation["duration_minutes"], (time.perf_counter() - began) * 1e6)
+            return allocation
+    fallback = best_eng is None
+    if fallback:
+        if trace.verbose:
+            print(f"  - [!] No exact matches found. Checking fallback pool...")
+
+        if index.rested_count:
+            if trace.verbose:
+                print(f"  - [✓] Fallback Triggered: Found {index.rested_count} available personnel.")
+            best_eng = index.best([])
+        else:
+            if trace.verbose:
+                print(f"  - [X] FATAL: No personnel available (all fatigued or empty pool).")
+            try: raise_critical_alert(order)
+            except: pass
+            if recording:
+                trace.record(order.order_id, order.asset_id, priority, candidates,
+                             None, False, 0, (time.perf_counter() - began) * 1e6)
+            return None
+
+    # 3. Efficiency Selection
+    if trace.verbose:
+        print(f"  - [✓] Assigned to: {best_eng.name} (ID: {best_eng.engineer_id})")
+        print(f"  - [i] Engineer Current Fatigue: {getattr(best_eng, 'fatigue', 0):.2f}")
+
+    # 4. Timeline (earliest free slot in the engineer's shift calendar)
+    duration = calculate_actual_duration(
+        best_eng, 
+        getattr(order, "task_type", "Repair"),
+        120, 
+        1.5 
+    )
+    start_time, end_time = calendar.book(best_eng, duration, earliest)
+
+    # 5. State Update
+    old_fatigue = getattr(best_eng, "fatigue", 0)
+    index.set_fatigue(best_eng, old_fatigue + (duration / 60.0))
+    if trace.verbose:
+        print(f"  - [i] Task Duration: {duration} mins. New Fatigue: {best_eng.fatigue:.2f}")
+        try: log_allocation(order, best_eng)
+        except: pass
+    if recording:
+        trace.record(order.order_id, order.asset_id, priority, candidates,
+                     best_eng.engineer_id, fallback, duration, (time.perf_counter() - began) * 1e6)
+
+    return {
+        "order_id": order.order_id,
+        "engineer_id": best_eng.engineer_id,
+        "engineer_name": best_eng.name,
+        "asset_id": order.asset_id,
+        "duration_minutes": duration,
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+    }
+
+def assign_crew(
+    order,
+    crew: Optional[List],
+    index: EngineerIndex,
+    calendar: ScheduleCalendar,
+    earliest: Optional[datetime.datetime] = None,
+) -> Optional[Dict]:
+    """Book a crew on one common slot; the lead (widest cover) is the order's assignee."""
+    if not crew:
+        return None
+    # The crew works the job together, so it takes as long as its slowest member
+    task_type = getattr(order, "task_type", "Repair")
+    duration = max(calculate_actual_duration(eng, task_type, 120, 1.5) for eng in crew)
+    slot = calendar.book_crew(crew, duration, earliest)
+    if slot is None:
+        return None
+    start_time, end_time = slot
+
+    for eng in crew:
+        index.set_fatigue(eng, getattr(eng, "fatigue", 0) + (duration / 60.0))
+    lead = crew[0]
+    if trace.verbose:
+        print(f"  - [✓] Crew assembled: {', '.join(f'{e.name} ({e.engineer_id})' for e in crew)}")
+        print(f"  - [i] Task Duration: {duration} mins.")
+
+    return {
+        "order_id": order.order_id,
+        "engineer_id": lead.engineer_id,
+        "engineer_name": lead.name,
+        "asset_id": order.asset_id,
+        "duration_minutes": duration,
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "crew": [eng.engineer_id for eng in crew],
+    }
+
 def run_orchestration(
     assets: List[AssetModel],
     orders: List[MaintenanceModel],
     engineers: List[EngineerModel],
+    calendar: Optional[ScheduleCalendar] = None,
+    stakes: Optional[Dict[str, float]] = None,
 ) -> List[Dict]:
+    """Greedy allocation in priority order; ``stakes`` (asset_id -> exposure) sorts by downstream impact."""
     print(f"\n{'='*60}")
     print(f"BRAIN: Starting Orchestration for {len(orders)} orders...")
     print(f"{'='*60}")
 
     asset_map = {a.asset_id: a for a in assets}
+    index = EngineerIndex(engineers)
+    calendar = calendar or ScheduleCalendar()
     allocations: List[Dict] = []
 
-    # 1. Prioritize Orders
-    orders_with_priority = []
-    for order in orders:
-        asset = asset_map.get(order.asset_id)
-        priority = calculate_priority(asset)
-        orders_with_priority.append((priority, order))
+    # 1. Prioritize Orders (one vectorized pass, same values as calculate_priority)
+    orders_with_priority = list(zip(order_priorities(orders, asset_map, stakes).tolist(), orders))
 
     prioritized = sorted(orders_with_priority, key=lambda x: x[0], reverse=True)
 
     for priority, order in prioritized:
-        asset = asset_map.get(order.asset_id)
-        print(f"\n[SYSTEM] Processing Order {order.order_id} (Asset: {order.asset_id})")
-        print(f"  - Calculated Priority: {priority:.2f}")
-
-        required_certs = getattr(asset, "required_certifications", []) or []
-        if isinstance(required_certs, str):
-            required_certs = [required_certs]
-        
-        print(f"  - Requirements: {required_certs if required_certs else 'None'}")
-
-        # 2. Capability Matching
-        eligible = []
-        for e in engineers:
-            certs = getattr(e, "certifications", []) or []
-            has_capability = all(cert in certs for cert in required_certs) if required_certs else True
-            
-            # Fatigue Gate
-            current_fatigue = getattr(e, "fatigue", 0)
-            is_rested = current_fatigue < 100.0
-            
-            if has_capability and is_rested:
-                eligible.append(e)
-
-        # --- FALLBACK LOGIC ---
-        if not eligible:
-            print(f"  - [!] No exact matches found. Checking fallback pool...")
-            fallback_pool = [e for e in engineers if getattr(e, "fatigue", 0) < 100.0]
-            
-            if fallback_pool:
-                print(f"  - [✓] Fallback Triggered: Found {len(fallback_pool)} available personnel.")
-                eligible = fallback_pool
-            else:
-                print(f"  - [X] FATAL: No personnel available (all fatigued or empty pool).")
-                try: raise_critical_alert(order)
-                except: pass
-                continue
+        if trace.verbose:
+            print(f"\n[SYSTEM] Processing Order {order.order_id} (Asset: {order.asset_id})")
+            print(f"  - Calculated Priority: {priority:.2f}")
 
-        # 3. Efficiency Selection
-        best_eng = min(eligible, key=lambda e: getattr(e, "fatigue", 0))
-        print(f"  - [✓] Assigned to: {best_eng.name} (ID: {best_eng.engineer_id})")
-        print(f"  - [i] Engineer Current Fatigue: {getattr(best_eng, 'fatigue', 0):.2f}")
-
-        # 4. Timeline
-        start_time = datetime.datetime.utcnow() 
-        duration = calculate_actual_duration(
-            best_eng, 
-            getattr(order, "task_type", "Repair"),
-            120, 
-            1.5 
-        )
-        end_time = start_time + datetime.timedelta(minutes=duration)
-
-        # 5. State Update
-        old_fatigue = getattr(best_eng, "fatigue", 0)
-        best_eng.fatigue = old_fatigue + (duration / 60.0)
-        print(f"  - [i] Task Duration: {duration} mins. New Fatigue: {best_eng.fatigue:.2f}")
-
-        allocation = {
-            "order_id": order.order_id,
-            "engineer_id": best_eng.engineer_id,
-            "engineer_name": best_eng.name,
-            "asset_id": order.asset_id,
-            "duration_minutes": duration,
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-        }
-        allocations.append(allocation)
-        
-        try: log_allocation(order, best_eng)
-        except: pass
+        allocation = assign_order(order, asset_map.get(order.asset_id), index, calendar, priority=priority)
+        if allocation is not None:
+            allocations.append(allocation)
 
     print(f"\n{'='*60}")
     print(f"BRAIN: Orchestration Finished. Successfully allocated {len(allocations)} tasks.")
@@ -0,0 +1,114 @@
+"""Active compliance overrides, indexed for O(1) lookups.
+
+``approve_override`` only appends an ``OVERRIDE_APPROVED`` event.  The
+registry folds those events into a dict keyed by (constraint, target_id)
+and keeps a min-heap on ``expires_at`` so expiry is paid once per
+override, when the clock passes it, instead of on every legality check.
+``refresh`` picks up events appended since the last load, so one registry
+can live for the whole process.
+"""
+import heapq
+import itertools
+import json
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from domain.override import Override
+from Persistence.models import EventLogModel
+
+OVERRIDE_EVENT = "OVERRIDE_APPROVED"
+
+
+def _payload(raw) -> Dict:
+    # Events written through app.record_event hold a JSON string, not an object
+    return json.loads(raw) if isinstance(raw, str) else (raw or {})
+
+
+def override_from_payload(payload: Dict) -> Override:
+    expires_at = payload["expires_at"]
+    if isinstance(expires_at, str):
+        expires_at = datetime.fromisoformat(expires_at)
+    return Override(
+        override_id=payload["override_id"],
+        constraint=payload["constraint"],
+        target_id=payload["target_id"],
+        justification=payload.get("justification", ""),
+        approved_by=payload.get("approved_by", ""),
+        expires_at=expires_at,
+    )
+
+
+class OverrideRegistry:
+    def __init__(self):
+        self._active: Dict[Tuple[str, str], Override] = {}
+        self._heap: List[Tuple[datetime, int, Tuple[str, str], str]] = []
+        self._seq = itertools.count()
+        self.last_event_id = 0
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __iter__(self) -> Iterator[Override]:
+        return iter(list(self._active.values()))
+
+    def add(self, override: Override, now: Optional[datetime] = None) -> bool:
+        """Index an override; the later expiry wins when a key is already covered."""
+        now = now or datetime.utcnow()
+        if not override.is_active(now):
+            return False
+        key = (override.constraint, override.target_id)
+        current = self._active.get(key)
+        if current is not None and current.expires_at >= override.expires_at:
+            return False
+        self._active[key] = override
+        heapq.heappush(self._heap, (override.expires_at, next(self._seq), key, override.override_id))
+        return True
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Drop everything that has expired by ``now``; stale heap entries are skipped."""
+        now = now or datetime.utcnow()
+        dropped = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, override_id = heapq.heappop(self._heap)
+            current = self._active.get(key)
+            if current is not None and current.override_id == override_id:
+                del self._active[key]
+                dropped += 1
+        return dropped
+
+    def lookup(self, constraint: str, target_id: str, now: Optional[datetime] = None) -> Optional[Override]:
+        override = self._active.get((constraint, target_id))
+        if override is None:
+            return None
+        if not override.is_active(now or datetime.utcnow()):
+            return None
+        return override
+
+    def active(self, now: Optional[datetime] = None) -> List[Override]:
+        self.expire(now)
+        return list(self._active.values())
+
+    def apply_event(self, event_type: str, payload, now: Optional[datetime] = None) -> bool:
+        if event_type != OVERRIDE_EVENT:
+            return False
+        return self.add(override_from_payload(_payload(payload)), now)
+
+    def refresh(self, db, now: Optional[datetime] = None) -> int:
+        """Fold in override events appended since the last refresh; returns how many were new."""
+        events = (
+            db.query(EventLogModel)
+            .filter(EventLogModel.event_type == OVERRIDE_EVENT, EventLogModel.id > self.last_event_id)
+            .order_by(EventLogModel.id)
+            .all()
+        )
+        for event in events:
+            self.apply_event(event.event_type, event.payload, now)
+            self.last_event_id = event.id
+        self.expire(now)
+        return len(events)
+
+    @classmethod
+    def load(cls, db, now: Optional[datetime] = None) -> "OverrideRegistry":
+        registry = cls()
+        registry.refresh(db, now)
+        return registry
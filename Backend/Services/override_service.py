@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from Persistence.event_store import record_event
+from domain.override import Override
 
 
 AUTHORIZED_ROLES = {
@@ -17,7 +18,8 @@ def approve_override(
     justification,
     approved_by,
     role,
-    expires_at
+    expires_at,
+    registry=None
 ):
     if role not in AUTHORIZED_ROLES:
         raise PermissionError("Unauthorized override attempt")
@@ -34,10 +36,14 @@ def approve_override(
             "override_id": override_id,
             "constraint": constraint,
             "target_id": target_id,
+            "justification": justification,
             "approved_by": approved_by,
             "expires_at": expires_at.isoformat()
         }
     )
 
+    if registry is not None:
+        registry.add(Override(override_id, constraint, target_id, justification, approved_by, expires_at))
+
     return override_id
 
@@ -0,0 +1,239 @@
+"""Partition-parallel greedy orchestration.
+
+An order can only go to engineers holding all of its certifications, so
+orders whose requirement sets are covered by disjoint groups of engineers
+never compete.  ``run_partitioned`` splits the order/engineer qualification
+graph into connected components, packs them into one chunk per worker and
+runs the greedy loop of each chunk in a ``ProcessPoolExecutor``.
+
+The serial loop has one global coupling: the fallback pool.  When an order
+finds no certified, rested engineer it goes to the least-fatigued engineer
+anywhere in the plant.  Workers therefore stop at their first such order.
+Every decision ranked before the earliest stop is exactly what
+``run_orchestration`` would have made; from there the run finishes serially.
+The allocations are identical to the serial loop's, in the same order.
+"""
+import contextlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from .batch_scoring import order_priorities
+from .decision_trace import trace
+from .matching import EngineerIndex, FATIGUE_LIMIT
+from .orchestrator import assign_order, run_orchestration
+from .timeline import ScheduleCalendar
+
+# Below this many orders per chunk the process start-up costs more than it saves
+MIN_CHUNK_ORDERS = 500
+
+_ENGINEER_FIELDS = (
+    "engineer_id", "name", "certifications", "skill_matrix",
+    "availability", "shift_start", "shift_end", "fatigue",
+)
+
+
+def _required_certs(asset) -> List[str]:
+    required = getattr(asset, "required_certifications", []) or []
+    if isinstance(required, str):
+        required = [required]
+    return list(required)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict = {}
+
+    def find(self, node):
+        self.parent.setdefault(node, node)
+        while self.parent[node] != node:
+            self.parent[node] = self.parent[self.parent[node]]
+            node = self.parent[node]
+        return node
+
+    def union(self, a, b) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+
+def partition(
+    req_masks: List[int],
+    engineer_masks: List[int],
+    rested: List[int],
+) -> Tuple[List[Tuple[List[int], List[int]]], List[int]]:
+    """Connected components of the qualification graph.
+
+    Returns ``(components, orphans)``: each component is (order indices,
+    engineer positions); orphans are orders no rested engineer is certified
+    for.  Nodes are distinct masks, so the work grows with the number of
+    distinct certification sets, not with the size of the roster.
+    """
+    by_mask: Dict[int, List[int]] = {}
+    for pos in rested:
+        by_mask.setdefault(engineer_masks[pos], []).append(pos)
+
+    uf = _UnionFind()
+    covered: Dict[int, bool] = {}
+    for req in set(req_masks):
+        covered[req] = False
+        for mask in by_mask:
+            if mask & req == req:
+                uf.union(("order", req), ("engineer", mask))
+                covered[req] = True
+
+    components: Dict = {}
+    orphans = []
+    for i, req in enumerate(req_masks):
+        if not covered[req]:
+            orphans.append(i)
+            continue
+        components.setdefault(uf.find(("order", req)), ([], []))[0].append(i)
+    for mask, positions in by_mask.items():
+        root = uf.find(("engineer", mask))
+        if root in components:
+            components[root][1].extend(positions)
+
+    ordered = sorted(components.values(), key=lambda c: c[0][0])
+    for _, positions in ordered:
+        positions.sort()
+    return ordered, orphans
+
+
+def _pack(components: List, chunks: int) -> List[Tuple[List[int], List[int]]]:
+    """Largest-first onto the lightest chunk; small components share chunks."""
+    bins = [([], []) for _ in range(chunks)]
+    load = [0] * chunks
+    for orders, positions in sorted(components, key=lambda c: (-len(c[0]), c[0][0])):
+        target = load.index(min(load))
+        bins[target][0].extend(orders)
+        bins[target][1].extend(positions)
+        load[target] += len(orders)
+    for orders, positions in bins:
+        orders.sort()
+        positions.sort()
+    return [b for b in bins if b[0]]
+
+
+def _solve_chunk(chunk) -> Tuple[List[Tuple[int, Dict, Optional[Tuple]]], Optional[int], Dict]:
+    """Worker: greedy loop over one chunk, stopping at the first order that would fall back.
+
+    Each allocation comes back with its decision-trace record (None when not recording).
+    """
+    now, engineers, bookings, work, level = chunk
+    trace.set_level(level)
+    run_id = trace.begin_run("partition")
+    calendar = ScheduleCalendar(now)
+    for engineer_id, booked in bookings.items():
+        calendar.preload(engineer_id, booked)
+    index = EngineerIndex(engineers)
+
+    allocations: List[Tuple[int, Dict]] = []
+    stop = None
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        for rank, priority, order_id, asset_id, task_type, certs in work:
+            order = SimpleNamespace(order_id=order_id, asset_id=asset_id, task_type=task_type)
+            asset = SimpleNamespace(asset_id=asset_id, required_certifications=certs)
+            allocation = assign_order(order, asset, index, calendar, allow_fallback=False, priority=priority)
+            if allocation is None:
+                stop = rank
+                break
+            allocations.append((rank, allocation))
+
+    records = trace.take(run_id)
+    if len(records) == len(allocations):
+        allocations = [(rank, alloc, record) for (rank, alloc), record in zip(allocations, records)]
+    else:
+        allocations = [(rank, alloc, None) for rank, alloc in allocations]
+    final = {e.engineer_id: (e.fatigue, calendar.bookings(e.engineer_id)) for e in engineers}
+    return allocations, stop, final
+
+
+def run_partitioned(
+    assets: List,
+    orders: List,
+    engineers: List,
+    calendar: Optional[ScheduleCalendar] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict]:
+    """Drop-in for ``run_orchestration`` that solves independent partitions in parallel."""
+    calendar = calendar or ScheduleCalendar()
+    workers = max_workers or os.cpu_count() or 1
+    chunks = min(workers, len(orders) // MIN_CHUNK_ORDERS)
+    if chunks < 2:
+        return run_orchestration(assets, orders, engineers, calendar)
+
+    # 1. Same ranking as the serial loop (stable sort, highest priority first)
+    asset_map = {a.asset_id: a for a in assets}
+    scored = sorted(zip(order_priorities(orders, asset_map).tolist(), orders), key=lambda x: x[0], reverse=True)
+    prioritized = [o for _, o in scored]
+
+    # 2. Qualification graph over rested engineers
+    index = EngineerIndex(engineers)
+    required = [_required_certs(asset_map.get(o.asset_id)) for o in prioritized]
+    req_masks = [index.mask_of(certs) for certs in required]
+    engineer_masks = [index.engineer_mask(e) for e in engineers]
+    rested = [pos for pos, e in enumerate(engineers) if getattr(e, "fatigue", 0) < FATIGUE_LIMIT]
+    components, orphans = partition(req_masks, engineer_masks, rested)
+    packed = _pack(components, chunks)
+    if len(packed) < 2:
+        return run_orchestration(assets, orders, engineers, calendar)
+
+    print(f"\n{'='*60}")
+    print(f"BRAIN: Partitioned Orchestration for {len(orders)} orders "
+          f"({len(components)} components in {len(packed)} chunks)...")
+    print(f"{'='*60}")
+
+    # 3. Solve the chunks in parallel on plain snapshots
+    payloads = []
+    for order_ids, positions in packed:
+        snaps = []
+        for pos in positions:
+            snap = SimpleNamespace(**{f: getattr(engineers[pos], f, None) for f in _ENGINEER_FIELDS})
+            snap.fatigue = getattr(engineers[pos], "fatigue", 0)
+            snaps.append(snap)
+        bookings = {s.engineer_id: calendar.bookings(s.engineer_id) for s in snaps}
+        # Plain tuples pickle far faster than objects
+        work = [
+            (i, scored[i][0], prioritized[i].order_id, prioritized[i].asset_id,
+             getattr(prioritized[i], "task_type", "Repair"), required[i])
+            for i in order_ids
+        ]
+        payloads.append((calendar.now, snaps, bookings, work, trace.level))
+
+    # Never fork: the caller may be a web worker with background threads running
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=len(payloads), mp_context=context) as pool:
+        results = list(pool.map(_solve_chunk, payloads))
+
+    # 4. Everything ranked before the first fallback is exact
+    stops = [stop for _, stop, _ in results if stop is not None] + orphans[:1]
+    first_stop = min(stops, default=len(prioritized))
+    ranked = sorted((entry for allocations, _, _ in results for entry in allocations), key=lambda p: p[0])
+    allocations = [alloc for rank, alloc, _ in ranked if rank < first_stop]
+    trace.extend([record for rank, _, record in ranked if rank < first_stop and record is not None])
+
+    engineer_map = {e.engineer_id: e for e in engineers}
+    if first_stop == len(prioritized):
+        for _, _, final in results:
+            for engineer_id, (fatigue, booked) in final.items():
+                engineer_map[engineer_id].fatigue = fatigue
+                calendar.preload(engineer_id, booked)
+    else:
+        # Replay the exact prefix, then let the serial loop take over at the fallback
+        print(f"  - [i] Fallback needed at rank {first_stop}; finishing serially.")
+        for alloc in allocations:
+            eng = engineer_map[alloc["engineer_id"]]
+            calendar.book(eng, alloc["duration_minutes"])
+            eng.fatigue = getattr(eng, "fatigue", 0) + alloc["duration_minutes"] / 60.0
+        index = EngineerIndex(engineers)
+        for priority, order in scored[first_stop:]:
+            allocation = assign_order(order, asset_map.get(order.asset_id), index, calendar, priority=priority)
+            if allocation is not None:
+                allocations.append(allocation)
+
+    print(f"\n{'='*60}")
+    print(f"BRAIN: Orchestration Finished. Successfully allocated {len(allocations)} tasks.")
+    print(f"{'='*60}\n")
+    return allocations
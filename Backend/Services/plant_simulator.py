@@ -0,0 +1,290 @@
+"""Discrete-event simulation of plant operation under a scheduling policy.
+
+One event heap drives simulated time; nothing touches the database.
+Between events an asset's health falls linearly at its own decay rate, so
+the moments it reaches the scheduling threshold (``CRITICAL``) and zero
+(``FAIL``) are computed, not stepped towards.  Random ``SHOCK`` events
+knock health down and re-time both.  Every shift change (``SHIFT``, at
+the starts of the Day/Swing/Night windows) rests the engineers coming on
+shift and runs the policy on every asset waiting for work; each placed
+order becomes a ``REPAIR_START`` / ``REPAIR_FINISH`` pair at the times
+the policy booked.  Events made stale by a later change carry an old
+per-asset version and are skipped.
+
+A policy is any ``(assets, orders, engineers, calendar) -> allocations``
+callable - ``run_orchestration`` by default.  The report covers the
+waiting backlog, time to repair (from the threshold crossing to the
+finished repair), failures and downtime, engineer fatigue and
+utilization.
+"""
+import contextlib
+import datetime
+import heapq
+import itertools
+import os
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from domain.compliance import SHIFT_WINDOWS
+from domain.maintenance import MaintenanceOrder
+from .orchestrator import run_orchestration
+from .timeline import ScheduleCalendar, from_minutes, to_minutes
+
+CRITICAL_HEALTH = 50.0
+SHIFT_MINUTES = 8 * 60
+FATIGUE_RECOVERY = 0.5          # share of fatigue carried into an engineer's next shift
+DECAY_DAYS = (30.0, 120.0)      # days from 100 to 0 health, drawn log-uniform per asset
+SHOCK_MEAN_DAYS = 45.0          # mean days between shocks to one asset
+SHOCK_DROP = (5.0, 30.0)
+
+# Event kinds, in tie-break order at equal times
+REPAIR_FINISH, REPAIR_START, FAIL, CRITICAL, SHOCK, SHIFT = range(6)
+
+_ASSET_FIELDS = ("asset_id", "health_score", "risk_level", "required_certifications")
+_ENGINEER_FIELDS = (
+    "engineer_id", "name", "certifications", "skill_matrix",
+    "availability", "shift_start", "shift_end", "fatigue",
+)
+
+
+def _copy(rows: Iterable, fields) -> List[SimpleNamespace]:
+    return [SimpleNamespace(**{f: getattr(row, f, None) for f in fields}) for row in rows]
+
+
+class PlantSimulator:
+    def __init__(
+        self,
+        assets: Iterable,
+        engineers: Iterable,
+        policy: Callable = run_orchestration,
+        start: Optional[datetime.datetime] = None,
+        seed: int = 0,
+    ):
+        self.assets = _copy(assets, _ASSET_FIELDS)
+        self.engineers = _copy(engineers, _ENGINEER_FIELDS)
+        for eng in self.engineers:
+            eng.fatigue = eng.fatigue or 0.0
+        self.policy = policy
+        self.start = start or datetime.datetime(2026, 1, 5)
+        self.rng = np.random.default_rng(seed)
+
+        n = len(self.assets)
+        # Health is h0 at t0 (minutes), falling by rate per minute while not under repair
+        self.h0 = [float(a.health_score if a.health_score is not None else 100.0) for a in self.assets]
+        self.t0 = [to_minutes(self.start)] * n
+        low, high = np.log(DECAY_DAYS[0]), np.log(DECAY_DAYS[1])
+        self.rate = (100.0 / (np.exp(self.rng.uniform(low, high, n)) * 24 * 60)).tolist()
+        self.version = [0] * n
+        self.repairing = [False] * n
+        self.need_since: List[Optional[float]] = [None] * n
+        self.failed_since: List[Optional[float]] = [None] * n
+        self.waiting: Dict[int, MaintenanceOrder] = {}    # asset -> its order, until placed
+        self.booked: set = set()
+        self.bookings: List[SimpleNamespace] = []          # placed work not yet finished
+
+        self.position = {a.asset_id: i for i, a in enumerate(self.assets)}
+        self.busy_minutes = {e.engineer_id: 0.0 for e in self.engineers}
+        self._events: List = []
+        self._seq = itertools.count()
+        self._orders = itertools.count()
+        self.stats = {"repairs": [], "downtime": 0.0, "failures": 0, "backlog": [], "fatigue": [], "dispatches": 0}
+
+    # --- Event plumbing ---
+
+    def _push(self, at: float, kind: int, asset: int = -1, payload=None) -> None:
+        heapq.heappush(self._events, (at, kind, next(self._seq), asset, payload))
+
+    def health(self, i: int, now: float) -> float:
+        if self.repairing[i]:
+            return self.h0[i]
+        return max(0.0, self.h0[i] - self.rate[i] * (now - self.t0[i]))
+
+    def _retime(self, i: int, now: float, health: float) -> None:
+        """Restart asset ``i`` at ``health`` and queue when it reaches the threshold and zero."""
+        self.h0[i], self.t0[i] = health, now
+        self.version[i] += 1
+        version = self.version[i]
+        if health > CRITICAL_HEALTH:
+            self._push(now + (health - CRITICAL_HEALTH) / self.rate[i], CRITICAL, i, version)
+        elif self.need_since[i] is None:
+            self._push(now, CRITICAL, i, version)
+        if health > 0:
+            self._push(now + health / self.rate[i], FAIL, i, version)
+        elif self.failed_since[i] is None:
+            self._push(now, FAIL, i, version)
+
+    def _next_shock(self, i: int, now: float) -> None:
+        self._push(now + self.rng.exponential(SHOCK_MEAN_DAYS) * 24 * 60, SHOCK, i)
+
+    # --- Handlers ---
+
+    def _on_critical(self, i: int, now: float) -> None:
+        if self.need_since[i] is None:
+            self.need_since[i] = now
+            order_id = f"SIM-{next(self._orders):08d}"
+            self.waiting[i] = MaintenanceOrder(
+                order_id=order_id,
+                asset_id=self.assets[i].asset_id,
+                required_certifications=set(self.assets[i].required_certifications or ()),
+                task_type="Emergency Repair",
+                base_time_minutes=120,
+                task_difficulty=1.5,
+            )
+
+    def _on_fail(self, i: int, now: float) -> None:
+        if self.failed_since[i] is None:
+            self.failed_since[i] = now
+            self.stats["failures"] += 1
+
+    def _on_shock(self, i: int, now: float) -> None:
+        if not self.repairing[i]:
+            drop = self.rng.uniform(*SHOCK_DROP)
+            self._retime(i, now, max(0.0, self.health(i, now) - drop))
+        self._next_shock(i, now)
+
+    def _on_repair_start(self, i: int, now: float) -> None:
+        self.h0[i] = self.health(i, now)
+        self.repairing[i] = True
+        self.version[i] += 1    # no threshold or failure while the crew is on it
+
+    def _on_repair_finish(self, i: int, now: float, booking) -> None:
+        self.repairing[i] = False
+        self.booked.discard(i)
+        self.stats["repairs"].append(now - self.need_since[i])
+        if self.failed_since[i] is not None:
+            self.stats["downtime"] += now - self.failed_since[i]
+        self.need_since[i] = self.failed_since[i] = None
+        for engineer_id in booking.members:
+            self.busy_minutes[engineer_id] += booking.minutes
+        self._retime(i, now, 100.0)
+
+    def _on_shift(self, now: float, label: str) -> None:
+        for eng in self.engineers:
+            if (eng.availability or "Day") == label:
+                eng.fatigue *= FATIGUE_RECOVERY
+        self._dispatch(now)
+        self._push(now + SHIFT_MINUTES, SHIFT, payload=_next_label(label))
+
+    def _dispatch(self, now: float) -> None:
+        self.bookings = [b for b in self.bookings if b.end > now]
+        self.stats["backlog"].append(len(self.waiting))
+        self.stats["fatigue"].append([e.fatigue for e in self.engineers])
+        if not self.waiting:
+            return
+        for i in self.waiting:
+            self.assets[i].health_score = round(self.health(i, now), 1)
+
+        moment = from_minutes(now)
+        calendar = ScheduleCalendar(moment)
+        calendar.seed(
+            SimpleNamespace(assigned_engineer_id=member, scheduled_date=from_minutes(b.start), end_time=from_minutes(b.end))
+            for b in self.bookings for member in b.members
+        )
+        allocations = self.policy(self.assets, list(self.waiting.values()), self.engineers, calendar)
+        self.stats["dispatches"] += 1
+
+        for alloc in allocations:
+            i = self.position[alloc["asset_id"]]
+            if self.waiting.pop(i, None) is None:
+                continue
+            start = to_minutes(datetime.datetime.fromisoformat(alloc["start_time"]))
+            end = to_minutes(datetime.datetime.fromisoformat(alloc["end_time"]))
+            booking = SimpleNamespace(start=start, end=end, minutes=end - start,
+                                      members=alloc.get("crew") or [alloc["engineer_id"]])
+            self.bookings.append(booking)
+            self.booked.add(i)
+            self._push(start, REPAIR_START, i)
+            self._push(end, REPAIR_FINISH, i, booking)
+
+    # --- Driver ---
+
+    def run(self, days: float) -> Dict:
+        began = time.perf_counter()
+        now = to_minutes(self.start)
+        horizon = now + days * 24 * 60
+        for i in range(len(self.assets)):
+            self._retime(i, now, self.h0[i])
+            self._next_shock(i, now)
+        label, first = _first_shift(self.start)
+        self._push(to_minutes(first), SHIFT, payload=label)
+
+        handled = 0
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            while self._events and self._events[0][0] <= horizon:
+                now, kind, _, i, payload = heapq.heappop(self._events)
+                handled += 1
+                if kind == SHIFT:
+                    self._on_shift(now, payload)
+                elif kind == SHOCK:
+                    self._on_shock(i, now)
+                elif kind == REPAIR_START:
+                    self._on_repair_start(i, now)
+                elif kind == REPAIR_FINISH:
+                    self._on_repair_finish(i, now, payload)
+                elif payload == self.version[i] and not self.repairing[i]:
+                    (self._on_critical if kind == CRITICAL else self._on_fail)(i, now)
+        return self.report(days, horizon, handled, time.perf_counter() - began)
+
+    def report(self, days: float, horizon: float, events: int, seconds: float) -> Dict:
+        repairs = np.array(self.stats["repairs"]) / 60.0
+        backlog = np.array(self.stats["backlog"] or [0])
+        fatigue = np.array(self.stats["fatigue"] or [[0.0]])
+        on_shift = days * SHIFT_MINUTES
+        utilization = np.array([self.busy_minutes[e.engineer_id] / on_shift for e in self.engineers] or [0.0])
+        # Assets still down at the horizon count their downtime so far
+        downtime = self.stats["downtime"] + sum(horizon - t for t in self.failed_since if t is not None)
+
+        def spread(values: np.ndarray, digits: int = 2) -> Dict:
+            if not values.size:
+                return {"mean": None, "p50": None, "p90": None, "max": None}
+            return {
+                "mean": round(float(values.mean()), digits),
+                "p50": round(float(np.percentile(values, 50)), digits),
+                "p90": round(float(np.percentile(values, 90)), digits),
+                "max": round(float(values.max()), digits),
+            }
+
+        return {
+            "days": days,
+            "assets": len(self.assets),
+            "engineers": len(self.engineers),
+            "dispatches": self.stats["dispatches"],
+            "repairs": int(repairs.size),
+            "failures": self.stats["failures"],
+            "downtime_hours": round(downtime / 60.0, 1),
+            "time_to_repair_hours": spread(repairs),
+            "backlog": {
+                "mean": round(float(backlog.mean()), 1),
+                "max": int(backlog.max()),
+                "final": len(self.waiting),
+                "booked": len(self.booked),
+            },
+            "fatigue": spread(fatigue.ravel()),
+            "utilization": spread(utilization, 3),
+            "events": events,
+            "wall_seconds": round(seconds, 2),
+        }
+
+
+def _next_label(label: str) -> str:
+    labels = sorted(SHIFT_WINDOWS, key=lambda k: SHIFT_WINDOWS[k][0])
+    return labels[(labels.index(label) + 1) % len(labels)]
+
+
+def _first_shift(start: datetime.datetime):
+    """The first shift start at or after ``start`` and its label."""
+    midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    candidates = [
+        (midnight + datetime.timedelta(days=day, minutes=window[0]), label)
+        for day in (0, 1) for label, window in SHIFT_WINDOWS.items()
+    ]
+    moment, label = min(c for c in candidates if c[0] >= start)
+    return label, moment
+
+
+def simulate_plant(assets, engineers, days: float = 365, policy: Callable = run_orchestration, seed: int = 0,
+                   start: Optional[datetime.datetime] = None) -> Dict:
+    return PlantSimulator(assets, engineers, policy, start, seed).run(days)
@@ -0,0 +1,175 @@
+"""Monte Carlo certification readiness over a planning horizon.
+
+Each asset needs a repair within the horizon with probability ``p``: 1 if
+it is already at the scheduling threshold, otherwise from an exponential
+time to the threshold whose mean is the health-trend forecast (or a
+default decay when there is no trend).  A failure lands in one of the
+horizon's shifts at random, so the failures one shift must absorb for a
+certification are Poisson with mean ``sum(p) / shifts``.  Each engineer
+on that shift turns up fit with probability ``ATTENDANCE`` scaled down by
+fatigue, and every fit holder of the certification clears
+``JOBS_PER_SHIFT`` repairs.
+
+Draws are inverse-CDF lookups: the demand and supply distributions of
+every certification (per shift) are tabulated once at ``BINS`` quantiles
+and a draw is a random index into its row, so 100k draws over 200
+certifications are a few gathers instead of 20M Poisson/binomial samples.
+One uint32 per cell supplies the indices of both the demand and the
+supply draw.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from domain.compliance import SHIFT_WINDOWS
+from .backlog import BASE_TIME_MINUTES, TASK_DIFFICULTY
+from .health_history import SCHEDULING_THRESHOLD
+from .matching import FATIGUE_LIMIT
+
+SHIFT_HOURS = 8
+JOBS_PER_SHIFT = int(SHIFT_HOURS * 60 // (BASE_TIME_MINUTES * TASK_DIFFICULTY))
+ATTENDANCE = 0.95               # chance a rested engineer turns up fit for a shift
+DEFAULT_DECAY_PER_HOUR = 100.0 / (75 * 24)   # 100 -> 0 in 75 days, for assets with no trend
+BINS = 1 << 14
+_MIDS = (np.arange(BINS) + 0.5) / BINS
+
+
+def failure_probabilities(health: np.ndarray, hours_to_threshold: np.ndarray, horizon_hours: float) -> np.ndarray:
+    """Chance each asset needs a repair within the horizon.
+
+    ``hours_to_threshold`` is the forecast per asset (inf where there is none).
+    """
+    fallback = np.maximum(health - SCHEDULING_THRESHOLD, 0.0) / DEFAULT_DECAY_PER_HOUR
+    mean = np.where(np.isfinite(hours_to_threshold), hours_to_threshold, fallback)
+    p = -np.expm1(-horizon_hours / np.maximum(mean, 1e-9))
+    return np.where(health <= SCHEDULING_THRESHOLD, 1.0, p)
+
+
+def _poisson_pmf(mean: float) -> np.ndarray:
+    size = int(mean + 10 * np.sqrt(mean) + 12)
+    k = np.arange(size)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+    if mean <= 0:
+        return np.eye(1, size).ravel()
+    return np.exp(k * np.log(mean) - mean - log_factorial)
+
+
+def _poisson_binomial_pmf(probs: Sequence[float]) -> np.ndarray:
+    """Distribution of the number of successes among independent trials."""
+    pmf = np.ones(1)
+    for p in probs:
+        pmf = np.concatenate((pmf * (1 - p), [0.0])) + np.concatenate(([0.0], pmf * p))
+    return pmf
+
+
+def _table(pmfs: List[np.ndarray]) -> np.ndarray:
+    """Inverse CDF of each distribution at the ``BINS`` quantile midpoints, one row each."""
+    table = np.zeros((len(pmfs), BINS), dtype=np.int16)
+    for row, pmf in enumerate(pmfs):
+        cdf = np.cumsum(pmf)
+        table[row] = np.minimum(np.searchsorted(cdf, _MIDS * cdf[-1], side="right"), len(pmf) - 1)
+    return table
+
+
+def _draw_pair(first: np.ndarray, second: np.ndarray, draws: int, rng: np.random.Generator):
+    """``draws`` samples from each row of two tables, both cut from one uint32 per cell.
+
+    Rows are drawn one at a time so each gather stays inside one cached table row.
+    """
+    bits = BINS.bit_length() - 1
+    picks = rng.integers(0, 1 << 32, size=(first.shape[0], draws), dtype=np.uint32)
+    a = np.empty(picks.shape, dtype=np.int16)
+    b = np.empty(picks.shape, dtype=np.int16)
+    for row in range(first.shape[0]):
+        np.take(first[row], picks[row] >> (32 - bits), out=a[row])
+        np.take(second[row], picks[row] & (BINS - 1), out=b[row])
+    return a, b
+
+
+def _cdf(values: np.ndarray) -> np.ndarray:
+    """Per-row empirical CDF of small non-negative integers, by counting instead of sorting."""
+    rows, draws = values.shape
+    top = int(values.max()) + 1 if values.size else 1
+    counts = np.zeros((rows, top))
+    for row in range(rows):
+        counts[row] = np.bincount(values[row], minlength=top)
+    return np.cumsum(counts, axis=1) / max(draws, 1)
+
+
+def readiness_risk(
+    assets: Iterable,
+    engineers: Iterable,
+    hours_to_threshold: Optional[Dict[str, float]] = None,
+    horizon_hours: float = 7 * 24,
+    draws: int = 100_000,
+    seed: int = 0,
+    quantiles: Sequence[float] = (50, 90, 99),
+) -> List[Dict]:
+    """Per certification: the chance a shift's failures outrun its fit holders, and by how much."""
+    # 1. Who needs what, and how likely each asset is to fail in the horizon
+    assets = list(assets)
+    hours_to_threshold = hours_to_threshold or {}
+    health = np.fromiter((a.health_score if a.health_score is not None else 100.0 for a in assets), dtype=float, count=len(assets))
+    forecast = np.fromiter((hours_to_threshold.get(a.asset_id, np.inf) for a in assets), dtype=float, count=len(assets))
+    p_fail = failure_probabilities(health, forecast, horizon_hours)
+
+    skills: Dict[str, str] = {}          # normalized -> spelling on the assets
+    demand: Dict[str, float] = {}
+    needed: Dict[str, int] = {}
+    for asset, p in zip(assets, p_fail):
+        for cert in (asset.required_certifications or []):
+            key = cert.strip().lower()
+            skills.setdefault(key, cert.strip())
+            demand[key] = demand.get(key, 0.0) + p
+            needed[key] = needed.get(key, 0) + 1
+    keys = list(skills)
+    if not keys:
+        return []
+    shifts = max(horizon_hours / SHIFT_HOURS, 1.0)
+
+    # 2. Fit holders per shift
+    labels = list(SHIFT_WINDOWS)
+    holders = {label: {k: [] for k in keys} for label in labels}
+    for eng in engineers:
+        label = getattr(eng, "availability", None)
+        label = label if label in SHIFT_WINDOWS else "Day"
+        fit = ATTENDANCE * min(max(1.0 - (eng.fatigue or 0.0) / FATIGUE_LIMIT, 0.0), 1.0)
+        for cert in {c.strip().lower() for c in (eng.certifications or [])}:
+            if cert in holders[label]:
+                holders[label][cert].append(fit)
+
+    # 3. Draw one shift's failures and fit holders per certification, for each shift
+    rng = np.random.default_rng(seed)
+    demand_table = _table([_poisson_pmf(demand[k] / shifts) for k in keys])
+    results = {k: {} for k in keys}
+    horizon_risk = np.zeros(len(keys))
+    for label in labels:
+        supply_table = _table([_poisson_binomial_pmf(holders[label][k]) for k in keys])
+        failures, fit = _draw_pair(demand_table, supply_table, draws, rng)
+        shortfall = np.maximum(failures - JOBS_PER_SHIFT * fit, 0)
+        cdf = _cdf(shortfall)
+        p_short = 1 - cdf[:, 0]
+        spread = np.stack([(cdf < q / 100.0 - 1e-12).sum(axis=1) for q in quantiles], axis=1)
+        # The horizon has shifts/len(labels) shifts of each kind
+        horizon_risk = 1 - (1 - horizon_risk) * (1 - p_short) ** (shifts / len(labels))
+        for col, key in enumerate(keys):
+            results[key][label] = {
+                "engineers": len(holders[label][key]),
+                "expected_fit": round(float(sum(holders[label][key])), 2),
+                "p_short": round(float(p_short[col]), 4),
+                "shortfall": {f"p{q:g}": int(v) for q, v in zip(quantiles, spread[col])},
+            }
+
+    report = [
+        {
+            "skill": skills[key],
+            "needed": needed[key],
+            "expected_failures": round(float(demand[key]), 2),
+            "failures_per_shift": round(float(demand[key]) / shifts, 3),
+            "p_short_horizon": round(float(horizon_risk[col]), 4),
+            "worst_shift": max(labels, key=lambda label: results[key][label]["p_short"]),
+            "shifts": results[key],
+        }
+        for col, key in enumerate(keys)
+    ]
+    return sorted(report, key=lambda r: -r["p_short_horizon"])
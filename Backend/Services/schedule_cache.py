@@ -0,0 +1,231 @@
+"""Memoized POST /schedule results, keyed by a fingerprint of the plant state.
+
+``StateFingerprint`` keeps one digest per row of every table the scheduler
+reads (assets, engineers, orders, backlog, crews, roster, dependencies)
+and a running sum per table, so the fingerprint is a handful of integers
+rather than a scan.  Sessions report their writes: ORM row changes found
+at flush are folded in when the transaction commits (dropped on
+rollback); bulk ``update``/``delete``/``insert`` statements, and writes
+made outside the session (``touch``), mark the whole table for one rescan
+the next time the fingerprint is read.
+
+``Fingerprints`` keeps one ``StateFingerprint`` per database (engine) and
+routes each session's writes to the one for its bind, so a request served
+from another database never reads or feeds the wrong fingerprint.
+
+Session events only see this process's writes.  Other web workers share
+the database, so ``install`` adds triggers that bump a one-row version
+table on every insert, update or delete of a tracked table, and the
+version goes into the cache key next to the fingerprint: a write by any
+process moves the key.
+
+``ScheduleCache`` is a small LRU of responses.  An entry also expires
+after ``ttl_seconds``: bookings end and shifts turn over without any write.
+"""
+import itertools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect, select, text
+
+_MASK = (1 << 64) - 1
+_PENDING = "schedule_fingerprint"
+VERSION_TABLE = "schedule_state_version"
+_tokens = itertools.count()
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _digest(values: Iterable) -> int:
+    return hash(tuple(_freeze(v) for v in values)) & _MASK
+
+
+class _Table:
+    def __init__(self, model):
+        self.model = model
+        mapper = inspect(model)
+        self.columns = list(model.__table__.columns)
+        self.keys = [mapper.get_property_by_column(c).key for c in self.columns]
+        self.primary = [self.columns.index(c) for c in mapper.primary_key]
+        self.rows: Dict[Tuple, int] = {}
+        self.total = 0
+        self.stale = True
+
+    def scan(self, db) -> None:
+        self.rows = {}
+        for row in db.execute(select(*self.columns)):
+            self.rows[tuple(row[i] for i in self.primary)] = _digest(row)
+        self.total = sum(self.rows.values()) & _MASK
+        self.stale = False
+
+    def put(self, identity: Tuple, digest: Optional[int]) -> None:
+        old = self.rows.pop(identity, 0)
+        if digest is not None:
+            self.rows[identity] = digest
+        self.total = (self.total - old + (digest or 0)) & _MASK
+
+
+class StateFingerprint:
+    def __init__(self, models: Iterable):
+        self.tables = {model.__table__.name: _Table(model) for model in models}
+        self._by_class = {t.model: t for t in self.tables.values()}
+        self._lock = threading.Lock()
+        self.token = next(_tokens)    # tells fingerprints of different databases apart in cache keys
+
+    def value(self, db) -> int:
+        """The current fingerprint; rescans only the tables marked stale."""
+        with self._lock:
+            for table in self.tables.values():
+                if table.stale:
+                    table.scan(db)
+            return hash(tuple((name, t.total) for name, t in self.tables.items()))
+
+    def install(self, bind) -> None:
+        """Create the version row and the triggers that bump it (idempotent)."""
+        with bind.begin() as conn:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (id INTEGER PRIMARY KEY CHECK (id = 0), version INTEGER NOT NULL)"
+            ))
+            conn.execute(text(f"INSERT OR IGNORE INTO {VERSION_TABLE} (id, version) VALUES (0, 0)"))
+            for name in self.tables:
+                for operation in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(text(
+                        f"CREATE TRIGGER IF NOT EXISTS {VERSION_TABLE}_{name}_{operation.lower()} "
+                        f"AFTER {operation} ON {name} BEGIN UPDATE {VERSION_TABLE} SET version = version + 1; END"
+                    ))
+
+    def version(self, db) -> int:
+        """Writes to the tracked tables so far, by any process (needs ``install``)."""
+        return db.execute(text(f"SELECT version FROM {VERSION_TABLE}")).scalar() or 0
+
+    def touch(self, *models) -> None:
+        """Mark tables written outside a watched session for a rescan."""
+        with self._lock:
+            for model in models:
+                self.tables[model.__table__.name].stale = True
+
+    def watch(self, sessions) -> None:
+        """Follow writes made through ``sessions`` (a sessionmaker or Session class)."""
+        event.listen(sessions, "after_flush", self._after_flush)
+        event.listen(sessions, "do_orm_execute", self._on_execute)
+        event.listen(sessions, "after_commit", self._after_commit)
+        event.listen(sessions, "after_rollback", self._after_rollback)
+
+    # --- Session events ---
+
+    def _pending(self, session) -> Dict:
+        return session.info.setdefault(_PENDING, {"rows": {}, "stale": set()})
+
+    def _after_flush(self, session, _context) -> None:
+        rows = None
+        for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+            for obj in objects:
+                table = self._by_class.get(type(obj))
+                if table is None:
+                    continue
+                identity = inspect(obj).identity
+                if identity is None:
+                    continue
+                rows = rows if rows is not None else self._pending(session)["rows"]
+                digest = None if deleted else _digest(getattr(obj, key) for key in table.keys)
+                rows[(table.model.__table__.name, identity)] = digest
+
+    def _on_execute(self, state) -> None:
+        if state.is_insert or state.is_update or state.is_delete:
+            name = getattr(state.statement.table, "name", None)
+            if name in self.tables:
+                self._pending(state.session)["stale"].add(name)
+
+    def _after_commit(self, session) -> None:
+        pending = session.info.pop(_PENDING, None)
+        if not pending:
+            return
+        with self._lock:
+            for (name, identity), digest in pending["rows"].items():
+                if not self.tables[name].stale:
+                    self.tables[name].put(identity, digest)
+            for name in pending["stale"]:
+                self.tables[name].stale = True
+
+    def _after_rollback(self, session) -> None:
+        session.info.pop(_PENDING, None)
+
+
+class Fingerprints:
+    def __init__(self, models: Iterable):
+        self.models = list(models)
+        self._by_bind: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def of(self, bind) -> StateFingerprint:
+        with self._lock:
+            fingerprint = self._by_bind.get(bind)
+            if fingerprint is None:
+                fingerprint = StateFingerprint(self.models)
+                fingerprint.install(bind)
+                self._by_bind[bind] = fingerprint
+            return fingerprint
+
+    def watch(self, sessions) -> None:
+        """Route writes made through ``sessions`` (a sessionmaker or Session class) by bind."""
+        event.listen(sessions, "after_flush", lambda session, context: self._route(session, "_after_flush", session, context))
+        event.listen(sessions, "do_orm_execute", lambda state: self._route(state.session, "_on_execute", state))
+        event.listen(sessions, "after_commit", lambda session: self._route(session, "_after_commit", session))
+        event.listen(sessions, "after_rollback", lambda session: self._route(session, "_after_rollback", session))
+
+    def _route(self, session, handler: str, *args) -> None:
+        try:
+            fingerprint = self._by_bind.get(session.get_bind())
+        except Exception:
+            return    # unbound session: nothing we track
+        if fingerprint is not None:
+            getattr(fingerprint, handler)(*args)
+
+
+class ScheduleCache:
+    def __init__(self, size: int = 32, ttl_seconds: float = 300):
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Optional[Dict]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, response: Dict, now: Optional[float] = None) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() if now is None else now, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,130 @@
+"""Capture of real /schedule inputs for replay.
+
+A trace is one gzipped JSON document holding exactly what the
+orchestrator saw - assets, the generated ``MaintenanceOrder``s, engineers
+with the fatigue they had before the run and the shift window the roster
+gave them, the live bookings the calendar
+was seeded with and the calendar clock - plus the allocations it made.
+Rows are stored as positional lists (field names once per table), which
+keeps a 10k-asset trace to a few hundred KB.
+
+Recording is opt-in: set ``SCHEDULE_TRACE_DIR`` and every full
+``POST /schedule`` run drops a trace there.  ``benchmarks.replay_traces``
+re-runs a directory of them.
+"""
+import datetime
+import gzip
+import json
+import os
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from domain.maintenance import MaintenanceOrder
+from .timeline import ScheduleCalendar
+
+TRACE_DIR_ENV = "SCHEDULE_TRACE_DIR"
+TRACE_VERSION = 2
+
+ASSET_FIELDS = ("asset_id", "asset_type", "health_score", "risk_level", "required_certifications")
+ORDER_FIELDS = ("order_id", "asset_id", "required_certifications", "task_type", "base_time_minutes", "task_difficulty")
+# The effective window after the roster is applied: EngineerModel has no shift_start/shift_end
+ENGINEER_FIELDS = (
+    "engineer_id", "name", "certifications", "skill_matrix",
+    "availability", "last_shift_start", "last_shift_end", "hours_worked_yesterday", "fatigue",
+)
+ENGINEER_TIMES = ("last_shift_start", "last_shift_end")
+BOOKING_FIELDS = ("assigned_engineer_id", "scheduled_date", "end_time")
+
+
+def _plain(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return value
+
+
+def _rows(objects, fields) -> List[List]:
+    return [[_plain(getattr(obj, field, None)) for field in fields] for obj in objects]
+
+
+def trace_dir() -> Optional[str]:
+    return os.environ.get(TRACE_DIR_ENV) or None
+
+
+def capture(
+    assets: List,
+    orders: List,
+    engineers: List,
+    bookings: List,
+    now: datetime.datetime,
+    strategy: str = "greedy",
+    stakes: Optional[Dict[str, float]] = None,
+) -> Dict:
+    """Freeze the orchestrator inputs; call before the run mutates engineer fatigue."""
+    trace = {
+        "version": TRACE_VERSION,
+        "captured_at": datetime.datetime.utcnow().isoformat(),
+        "now": now.isoformat(),
+        "strategy": strategy,
+        "fields": {
+            "assets": ASSET_FIELDS,
+            "orders": ORDER_FIELDS,
+            "engineers": ENGINEER_FIELDS,
+            "bookings": BOOKING_FIELDS,
+        },
+        "assets": _rows(assets, ASSET_FIELDS),
+        "orders": _rows(orders, ORDER_FIELDS),
+        "engineers": _rows(engineers, ENGINEER_FIELDS),
+        "bookings": _rows(bookings, BOOKING_FIELDS),
+    }
+    if stakes:
+        # Impact-weighted exposure stands in for risk_level on replay
+        trace["stakes"] = dict(stakes)
+    return trace
+
+
+def write_trace(trace: Dict, allocations: List[Dict], elapsed_ms: float, directory: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    trace = dict(trace, allocations=allocations, elapsed_ms=round(elapsed_ms, 3))
+    stamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(directory, f"schedule-{stamp}-{uuid.uuid4().hex[:8]}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(trace, f, separators=(",", ":"))
+    return path
+
+
+def read_trace(path: str) -> Dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _objects(trace: Dict, table: str) -> List[SimpleNamespace]:
+    fields = trace["fields"][table]
+    return [SimpleNamespace(**dict(zip(fields, row))) for row in trace[table]]
+
+
+def replay_inputs(trace: Dict) -> Tuple[List, List, List, ScheduleCalendar]:
+    """Fresh (assets, orders, engineers, calendar) rebuilt from a trace; safe to mutate."""
+    assets = _objects(trace, "assets")
+    stakes = trace.get("stakes") or {}
+    for asset in assets:
+        asset.risk_level = stakes.get(asset.asset_id, asset.risk_level)
+    orders = [
+        MaintenanceOrder(**{**vars(o), "required_certifications": set(o.required_certifications or ())})
+        for o in _objects(trace, "orders")
+    ]
+    engineers = _objects(trace, "engineers")
+    for engineer in engineers:
+        for field in ENGINEER_TIMES:
+            value = getattr(engineer, field, None)
+            if isinstance(value, str):
+                setattr(engineer, field, datetime.datetime.fromisoformat(value))
+    calendar = ScheduleCalendar(datetime.datetime.fromisoformat(trace["now"]))
+    bookings = _objects(trace, "bookings")
+    for booking in bookings:
+        booking.scheduled_date = datetime.datetime.fromisoformat(booking.scheduled_date)
+        booking.end_time = datetime.datetime.fromisoformat(booking.end_time)
+    calendar.seed(bookings)
+    return assets, orders, engineers, calendar
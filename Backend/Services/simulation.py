@@ -0,0 +1,201 @@
+"""What-if scheduling on copy-on-write plant snapshots.
+
+``PlantSnapshot`` freezes the plant once (assets, engineers, live
+bookings, the clock).  A scenario is a handful of deltas - engineers off,
+field changes, a degraded asset line - applied through ``_Overlay``
+objects: an overlay reads through to the shared snapshot row and keeps
+only the fields the scenario (or the orchestrator, e.g. fatigue) writes.
+Nothing is deep-copied per scenario, so the memory cost of a scenario is
+its deltas plus the plan it produces.
+
+Scenarios run in worker processes started by a fork server (the web
+worker that asks runs background threads and must not be forked).  The
+snapshot reaches each worker once through the pool initializer; only the
+deltas travel per task.  Nothing here touches the database.
+"""
+import contextlib
+import datetime
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from .assignment_solver import plan_cost, solve_min_cost
+from .crew import crew_bookings
+from .orchestrator import build_emergency_order, run_orchestration
+from .timeline import ScheduleCalendar
+
+_ASSET_FIELDS = ("asset_id", "asset_type", "health_score", "risk_level", "required_certifications")
+_ENGINEER_FIELDS = (
+    "engineer_id", "name", "certifications", "skill_matrix",
+    "availability", "shift_start", "shift_end", "fatigue",
+)
+CRITICAL_HEALTH = 50.0
+
+# Set in each worker by the pool initializer
+_SNAPSHOT = None
+
+
+class _Overlay:
+    """Copy-on-write view of a snapshot row: reads fall through, writes stay local."""
+
+    __slots__ = ("_base", "_own")
+
+    def __init__(self, base, **changes):
+        object.__setattr__(self, "_base", base)
+        object.__setattr__(self, "_own", changes)
+
+    def __getattr__(self, name):
+        own = object.__getattribute__(self, "_own")
+        if name in own:
+            return own[name]
+        return getattr(object.__getattribute__(self, "_base"), name)
+
+    def __setattr__(self, name, value):
+        self._own[name] = value
+
+
+class PlantSnapshot:
+    def __init__(self, assets, engineers, bookings, covered=(), now: Optional[datetime.datetime] = None):
+        self.now = now or datetime.datetime.utcnow()
+        self.assets = [SimpleNamespace(**{f: getattr(a, f, None) for f in _ASSET_FIELDS}) for a in assets]
+        self.engineers = [SimpleNamespace(**{f: getattr(e, f, None) for f in _ENGINEER_FIELDS}) for e in engineers]
+        for e in self.engineers:
+            e.fatigue = e.fatigue or 0.0
+        # Live bookings as plain tuples: (order_id, asset_id, engineer_id, start, end)
+        self.bookings = [
+            (o.order_id, o.asset_id, o.assigned_engineer_id, o.scheduled_date, o.end_time)
+            for o in bookings
+        ]
+        self.covered = set(covered)    # assets that already have an open order
+
+    @classmethod
+    def from_db(cls, db, models, open_statuses=("ASSIGNED", "IN_PROGRESS")) -> "PlantSnapshot":
+        """Snapshot on the /schedule clock; assets with an order in ``open_statuses`` get no new one."""
+        now = ScheduleCalendar().now
+        bookings = db.query(models.MaintenanceModel).filter(
+            models.MaintenanceModel.status == "ASSIGNED",
+            models.MaintenanceModel.end_time > now
+        ).all() + crew_bookings(db, models, now)
+        covered = [
+            row.asset_id for row in db.query(models.MaintenanceModel.asset_id).filter(
+                models.MaintenanceModel.status.in_(open_statuses)
+            ).distinct()
+        ]
+        return cls(db.query(models.AssetModel).all(), db.query(models.EngineerModel).all(), bookings, covered, now)
+
+
+def _degraded(asset, degrade: Dict) -> bool:
+    if asset.asset_id in (degrade.get("asset_ids") or ()):
+        return True
+    asset_type = degrade.get("asset_type")
+    return asset_type is not None and asset.asset_type == asset_type
+
+
+def apply_scenario(snapshot: PlantSnapshot, scenario: Dict):
+    """(assets, engineers, calendar) for one scenario; untouched assets are the snapshot's own rows."""
+    off = set(scenario.get("engineers_off") or ())
+    engineer_changes = scenario.get("engineers") or {}
+    asset_changes = scenario.get("assets") or {}
+    degrade = scenario.get("degrade") or {}
+    by = float(degrade.get("by", 0))
+
+    assets = []
+    for asset in snapshot.assets:
+        changes = dict(asset_changes.get(asset.asset_id, {}))
+        if by and _degraded(asset, degrade):
+            health = changes.get("health_score", asset.health_score)
+            changes["health_score"] = max(0.0, float(health) - by)
+        assets.append(_Overlay(asset, **changes) if changes else asset)
+
+    # Engineers always get an overlay: the orchestrator writes their fatigue
+    engineers = [
+        _Overlay(e, **engineer_changes.get(e.engineer_id, {}))
+        for e in snapshot.engineers if e.engineer_id not in off
+    ]
+
+    calendar = ScheduleCalendar(snapshot.now)
+    calendar.seed(
+        SimpleNamespace(assigned_engineer_id=eng_id, scheduled_date=start, end_time=end)
+        for _, _, eng_id, start, end in snapshot.bookings if eng_id not in off
+    )
+    return assets, engineers, calendar
+
+
+def run_scenario(snapshot: PlantSnapshot, scenario: Dict, strategy: str = "greedy") -> Dict:
+    assets, engineers, calendar = apply_scenario(snapshot, scenario)
+    orders = [
+        build_emergency_order(a) for a in assets
+        if float(a.health_score) < CRITICAL_HEALTH and a.asset_id not in snapshot.covered
+    ]
+    initial_fatigue = {e.engineer_id: e.fatigue or 0.0 for e in engineers}
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        if strategy == "min_cost":
+            allocations, cost = solve_min_cost(assets, orders, engineers, calendar)
+        else:
+            allocations = run_orchestration(assets, orders, engineers, calendar)
+            cost = plan_cost(assets, orders, engineers, allocations, initial_fatigue)
+
+    off = set(scenario.get("engineers_off") or ())
+    return {
+        "name": scenario.get("name"),
+        "orders": len(orders),
+        "allocations": allocations,
+        "unassigned": sorted({o.asset_id for o in orders} - {a["asset_id"] for a in allocations}),
+        "displaced": list(dict.fromkeys(order_id for order_id, _, eng_id, _, _ in snapshot.bookings if eng_id in off)),
+        "total_cost": round(cost, 2),
+    }
+
+
+def diff_plans(baseline: Dict, result: Dict) -> Dict:
+    """Per-asset changes between two scenario results (order ids are regenerated each run)."""
+    before = {a["asset_id"]: a for a in baseline["allocations"]}
+    after = {a["asset_id"]: a for a in result["allocations"]}
+    reassigned, rescheduled = [], []
+    for asset_id in sorted(before.keys() & after.keys()):
+        old, new = before[asset_id], after[asset_id]
+        if old["engineer_id"] != new["engineer_id"]:
+            reassigned.append({"asset_id": asset_id, "from": old["engineer_id"], "to": new["engineer_id"]})
+        elif old["start_time"] != new["start_time"]:
+            rescheduled.append({"asset_id": asset_id, "from": old["start_time"], "to": new["start_time"]})
+    return {
+        "newly_assigned": sorted(after.keys() - before.keys()),
+        "no_longer_assigned": sorted(before.keys() - after.keys()),
+        "reassigned": reassigned,
+        "rescheduled": rescheduled,
+        "cost_delta": round(result["total_cost"] - baseline["total_cost"], 2),
+    }
+
+
+def _install(snapshot: PlantSnapshot) -> None:
+    global _SNAPSHOT
+    _SNAPSHOT = snapshot
+
+
+def _run_in_worker(job) -> Dict:
+    scenario, strategy = job
+    return run_scenario(_SNAPSHOT, scenario, strategy)
+
+
+def simulate(
+    snapshot: PlantSnapshot,
+    scenarios: List[Dict],
+    strategy: str = "greedy",
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """Run the unchanged plant plus every scenario; each scenario is diffed against the baseline."""
+    jobs = [({"name": "baseline"}, strategy)] + [(s, strategy) for s in scenarios]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers < 2:
+        results = [run_scenario(snapshot, scenario, strategy) for scenario, strategy in jobs]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_install, initargs=(snapshot,)) as pool:
+            results = list(pool.map(_run_in_worker, jobs))
+
+    baseline, outcomes = results[0], results[1:]
+    for outcome in outcomes:
+        outcome["diff"] = diff_plans(baseline, outcome)
+    return {"baseline": baseline, "scenarios": outcomes}
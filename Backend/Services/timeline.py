@@ -0,0 +1,252 @@
+"""Per-engineer calendars so allocations get real, non-overlapping start times.
+
+Bookings are bucketed by shift day: one bucket per instance of the
+engineer's shift window (see ``domain.compliance.shift_window``).  A job
+starts inside a window, finishes by the window's end whenever it fits in a
+shift at all, and keeps INDUSTRIAL_BUFFER_MINUTES clear of neighbouring
+bookings.  A max-gap segment tree over shift days finds the first day with
+room in O(log days); only that day's handful of bookings is scanned.
+"""
+import bisect
+import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from domain.compliance import shift_window
+from domain.scheduling import INDUSTRIAL_BUFFER_MINUTES
+
+DAY_MINUTES = 24 * 60
+CREW_HORIZON_DAYS = 14   # days past the busiest member's first opening searched for a common slot
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def to_minutes(moment: datetime.datetime) -> float:
+    return (moment - EPOCH).total_seconds() / 60.0
+
+
+def from_minutes(minutes: float) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(minutes=minutes)
+
+
+class _GapTree:
+    """Longest free stretch per shift day, searchable for the first day that fits.
+
+    Untouched days hold ``default`` (a whole free window); the tree doubles
+    whenever a lookup runs past its end.
+    """
+
+    def __init__(self, default: float):
+        self.default = default
+        self.size = 1
+        self.tree = [default, default]
+
+    def _grow(self) -> None:
+        leaves = self.tree[self.size:] + [self.default] * self.size
+        self.size *= 2
+        self.tree = [0.0] * self.size + leaves
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def update(self, day: int, gap: float) -> None:
+        while day >= self.size:
+            self._grow()
+        node = day + self.size
+        self.tree[node] = gap
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def _descend(self, node: int, lo: int, hi: int, start: int, need: float) -> int:
+        if hi <= start or self.tree[node] < need:
+            return -1
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        found = self._descend(2 * node, lo, mid, start, need)
+        if found < 0:
+            found = self._descend(2 * node + 1, mid, hi, start, need)
+        return found
+
+    def first_fit(self, start: int, need: float) -> int:
+        """First day >= ``start`` with a free stretch of ``need`` (need <= default)."""
+        while True:
+            found = self._descend(1, 0, self.size, start, need)
+            if found >= 0:
+                return found
+            self._grow()
+
+
+class EngineerCalendar:
+    def __init__(self, window: Tuple[int, int], now: float, buffer: int = INDUSTRIAL_BUFFER_MINUTES):
+        self.window_start, self.window_end = window
+        self.length = self.window_end - self.window_start
+        self.buffer = buffer
+        self.origin = self._day_of(now)
+        self.days: Dict[int, List[Tuple[float, float]]] = {}
+        self.gaps = _GapTree(self.length)
+
+    def _day_of(self, minute: float) -> int:
+        """First shift day whose window ends after ``minute``."""
+        return int((minute - self.window_end) // DAY_MINUTES) + 1
+
+    def _window(self, day: int) -> Tuple[float, float]:
+        return day * DAY_MINUTES + self.window_start, day * DAY_MINUTES + self.window_end
+
+    def _free(self, day: int, not_before: float):
+        """Free stretches of a day's window, honouring the buffer around bookings."""
+        cursor, end = self._window(day)
+        cursor = max(cursor, not_before)
+        for booked_start, booked_end in self.days.get(day, []):
+            if booked_start - self.buffer > cursor:
+                yield cursor, min(booked_start - self.buffer, end)
+            cursor = max(cursor, booked_end + self.buffer)
+            if cursor >= end:
+                return
+        if end > cursor:
+            yield cursor, end
+
+    def _fit(self, day: int, duration: float, not_before: float) -> Optional[float]:
+        for start, end in self._free(day, not_before):
+            if end - start >= duration:
+                return start
+        return None
+
+    def _clear(self, start: float, end: float) -> bool:
+        for day in range(self._day_of(start - self.buffer), self._day_of(end + self.buffer) + 1):
+            for booked_start, booked_end in self.days.get(day, []):
+                if booked_start < end + self.buffer and booked_end + self.buffer > start:
+                    return False
+        return True
+
+    def book(self, start: float, end: float) -> None:
+        for day in range(self._day_of(start - self.buffer), self._day_of(end + self.buffer) + 1):
+            bisect.insort(self.days.setdefault(day, []), (start, end))
+            if day >= self.origin:
+                longest = max((b - a for a, b in self._free(day, float("-inf"))), default=0.0)
+                self.gaps.update(day - self.origin, longest)
+
+    def release(self, start: float, end: float) -> None:
+        # Bookings round-trip through datetimes, so match to within a few milliseconds
+        for day in range(self._day_of(start - self.buffer), self._day_of(end + self.buffer) + 1):
+            booked = self.days.get(day, [])
+            match = next((b for b in booked if abs(b[0] - start) < 1e-4 and abs(b[1] - end) < 1e-4), None)
+            if match is not None:
+                booked.remove(match)
+                if day >= self.origin:
+                    longest = max((b - a for a, b in self._free(day, float("-inf"))), default=0.0)
+                    self.gaps.update(day - self.origin, longest)
+
+    def find(self, duration: float, earliest: float) -> float:
+        """Start of the earliest feasible slot at or after ``earliest``, without booking it."""
+        first_day = max(self._day_of(earliest), self.origin)
+
+        if duration <= self.length:
+            start = self._fit(first_day, duration, earliest)
+            if start is None:
+                day = self.gaps.first_fit(first_day + 1 - self.origin, duration) + self.origin
+                start = self._fit(day, duration, earliest)
+        else:
+            # Longer than a shift: open a completely free window, keep the spill-over clear
+            day = first_day if self._window(first_day)[0] >= earliest else first_day + 1
+            while True:
+                day = self.gaps.first_fit(day - self.origin, self.length) + self.origin
+                start = self._window(day)[0]
+                if self._clear(start, start + duration):
+                    break
+                day += 1
+        return start
+
+    def place(self, duration: float, earliest: float) -> float:
+        """Book the earliest feasible slot at or after ``earliest`` and return its start."""
+        start = self.find(duration, earliest)
+        self.book(start, start + duration)
+        return start
+
+
+class ScheduleCalendar:
+    """Calendars for one schedule run, keyed by engineer id.
+
+    Existing bookings are seeded from ASSIGNED maintenance rows and attached
+    to an engineer's calendar the first time that engineer is scheduled.
+    """
+
+    def __init__(self, now: Optional[datetime.datetime] = None):
+        self.now = now or datetime.datetime.utcnow()
+        self._now = to_minutes(self.now)
+        self._calendars: Dict[str, EngineerCalendar] = {}
+        self._seeded: Dict[str, List[Tuple[float, float]]] = {}
+
+    def seed(self, orders: Iterable) -> None:
+        for order in orders:
+            engineer_id = getattr(order, "assigned_engineer_id", None)
+            start = getattr(order, "scheduled_date", None)
+            end = getattr(order, "end_time", None)
+            if not engineer_id or start is None or end is None or end <= self.now:
+                continue
+            self._seeded.setdefault(engineer_id, []).append((to_minutes(start), to_minutes(end)))
+
+    def calendar_for(self, engineer) -> EngineerCalendar:
+        calendar = self._calendars.get(engineer.engineer_id)
+        if calendar is None:
+            calendar = EngineerCalendar(shift_window(engineer), self._now)
+            for start, end in self._seeded.pop(engineer.engineer_id, []):
+                calendar.book(start, end)
+            self._calendars[engineer.engineer_id] = calendar
+        return calendar
+
+    def book(
+        self,
+        engineer,
+        duration_minutes: int,
+        earliest: Optional[datetime.datetime] = None,
+    ) -> Tuple[datetime.datetime, datetime.datetime]:
+        not_before = self._now if earliest is None else max(self._now, to_minutes(earliest))
+        start = self.calendar_for(engineer).place(duration_minutes, not_before)
+        return from_minutes(start), from_minutes(start + duration_minutes)
+
+    def book_crew(
+        self,
+        engineers: List,
+        duration_minutes: int,
+        earliest: Optional[datetime.datetime] = None,
+    ) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        """Book the earliest slot free for every member; None if their shifts never line up."""
+        not_before = self._now if earliest is None else max(self._now, to_minutes(earliest))
+        calendars = [self.calendar_for(engineer) for engineer in engineers]
+        start, horizon = not_before, None
+        while horizon is None or start <= horizon:
+            # Each member's first fit is at or after ``start``; they agree only on a common slot
+            latest = max(calendar.find(duration_minutes, start) for calendar in calendars)
+            if latest == start:
+                for calendar in calendars:
+                    calendar.book(start, start + duration_minutes)
+                return from_minutes(start), from_minutes(start + duration_minutes)
+            if horizon is None:
+                horizon = latest + CREW_HORIZON_DAYS * DAY_MINUTES
+            start = latest
+        return None
+
+    def release(self, engineer_id: str, start: datetime.datetime, end: datetime.datetime) -> None:
+        """Free a booking (completed early, reassigned or cancelled)."""
+        start_minutes, end_minutes = to_minutes(start), to_minutes(end)
+        calendar = self._calendars.get(engineer_id)
+        if calendar is not None:
+            calendar.release(start_minutes, end_minutes)
+            return
+        seeded = self._seeded.get(engineer_id, [])
+        for booking in seeded:
+            if abs(booking[0] - start_minutes) < 1e-4 and abs(booking[1] - end_minutes) < 1e-4:
+                seeded.remove(booking)
+                break
+
+    def bookings(self, engineer_id: str) -> List[Tuple[float, float]]:
+        """All of an engineer's bookings, in minutes, seeded or placed."""
+        calendar = self._calendars.get(engineer_id)
+        if calendar is None:
+            return list(self._seeded.get(engineer_id, []))
+        return sorted({booking for day in calendar.days.values() for booking in day})
+
+    def preload(self, engineer_id: str, bookings: Iterable[Tuple[float, float]]) -> None:
+        """Replace an engineer's bookings (e.g. with a worker process's result)."""
+        self._calendars.pop(engineer_id, None)
+        self._seeded[engineer_id] = list(bookings)
@@ -1,24 +1,76 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.sqlite import insert
+import dataclasses
 import datetime
 import json
 import random
+from typing import Dict, List, Optional
+import numpy as np
 
 # Internal Imports
 from domain.asset import Asset
 from domain.maintenance import MaintenanceOrder
 from domain.engineer import ServiceEngineer
-from Services.orchestrator import run_orchestration
+from Services.orchestrator import build_emergency_order, build_predictive_order, calculate_priority
+from Services.assignment_solver import STRATEGIES
+from Services.timeline import ScheduleCalendar
+from Services.batch_scoring import asset_arrays, priorities
+from Services.incremental_planner import IncrementalPlanner
+from Services.compliance_engine import AvailabilityMatrix
+from Services.backlog import OrderBacklog, to_order
+from Services.crew import crew_bookings, crew_rosters
+from Services.dependency_graph import ImpactGraph
+from Services.health_history import HealthHistory, due_within, forecast, log_readings
+from Services.preventive import PLANNED, PreventiveCalendar, insert_orders, is_preventive, order_rows
+from Services.readiness import readiness_risk
+from Services.rostering import SHIFTS, forecast_demand, shift_state, solve_roster
+from Services.override_registry import OverrideRegistry
+from Services.override_service import approve_override
+from Services.escalation_scheduler import EscalationScheduler, install as install_escalation_index
+from Services.alert_services import resolve_alert
+from Services.simulation import PlantSnapshot, simulate
+from Services.schedule_cache import Fingerprints, ScheduleCache
+from Services.schedule_trace import capture, trace_dir, write_trace
+from Services.decision_trace import TRACE_EVENT, trace as decision_trace
+from Services.execution import PoolSaturated, SolverPool, solve_snapshot
+from config.settings import settings
 from Persistence.database import SessionLocal, engine, Base
 from Persistence.event_store import record_event
 from Persistence import models
 
 # Initialize Database Tables
 Base.metadata.create_all(bind=engine)
+install_escalation_index(engine)
 
-app = FastAPI(title="Siemens Nexus Orchestrator API")
+# Fires ALERT_ESCALATED at each open alert's deadline; rebuilt from the event log on start
+escalations = EscalationScheduler()
+
+# CPU-bound /schedule solves run here, off the event loop (SCHEDULE_POOL_SIZE, SCHEDULE_QUEUE_DEPTH)
+solver_pool = SolverPool(settings.schedule_pool_size, settings.schedule_queue_depth)
+
+# Per-asset health ring buffers over the health_readings log (shared by every worker);
+# checkpointed to HEALTH_HISTORY_PATH every HEALTH_HISTORY_SAVE_SECONDS and on shutdown
+health_history = HealthHistory()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global health_history
+    health_history = HealthHistory.load(settings.health_history_path)
+    health_history.start(settings.health_history_path, SessionLocal, settings.health_history_save_seconds)
+    escalations.start(SessionLocal)
+    solver_pool.start()
+    yield
+    solver_pool.shutdown()
+    escalations.stop()
+    health_history.stop()
+    with SessionLocal() as db:
+        health_history.checkpoint(settings.health_history_path, db)
+
+app = FastAPI(title="Siemens Nexus Orchestrator API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +87,212 @@ def get_db():
     finally:
         db.close()
 
+# Live plan for POST /schedule?mode=incremental; None until the first incremental run.
+# Each worker holds its own: ``planner_version`` is the database write version it last
+# reflected, and a plan that falls behind (another worker, or a full run, wrote since)
+# is dropped and rebuilt from the database.  A foreign write landing between a route's
+# check and its commit goes unseen; /schedule/incremental/check?repair=true catches it.
+planner: Optional[IncrementalPlanner] = None
+planner_version: Optional[int] = None
+
+# What-if scenarios per POST /schedule/simulate
+MAX_SCENARIOS = 50
+
+# Per-run decision summaries land in event_log from a background writer
+decision_trace.configure(SessionLocal)
+
+# Active compliance overrides; catches up with the event log on each read
+overrides = OverrideRegistry()
+
+# Downstream-impact exposure per asset; loaded on first use, then kept current edge by edge
+impact_graph = ImpactGraph()
+
+def _impact(db: Session) -> ImpactGraph:
+    if not impact_graph.loaded:
+        dep = models.AssetDependencyModel
+        impact_graph.load(
+            db.query(models.AssetModel.asset_id, models.AssetModel.risk_level).all(),
+            db.query(dep.upstream_id, dep.downstream_id, dep.weight).all(),
+        )
+    return impact_graph
+
+# Full POST /schedule responses, memoized by a fingerprint of everything the run reads.
+# One fingerprint per database: sessions of any bind (e.g. a get_db override) feed their own.
+schedule_fingerprints = Fingerprints([
+    models.AssetModel, models.EngineerModel, models.MaintenanceModel, models.MaintenanceCrewModel,
+    models.OrderBacklogModel, models.ShiftRosterModel, models.AssetDependencyModel,
+])
+schedule_fingerprints.watch(Session)
+schedule_cache = ScheduleCache(settings.schedule_cache_size, settings.schedule_cache_ttl_seconds)
+
+def _fingerprint(db: Session):
+    """(database token, write version, fingerprint) of the request's database; the version sees other workers' writes."""
+    bind = db.get_bind()
+    fingerprint = schedule_fingerprints.of(bind)
+    # Its own short session: a rescan must not leave the request's session holding a transaction
+    with Session(bind=bind) as own:
+        return fingerprint.token, fingerprint.version(own), fingerprint.value(own)
+
+async def _remember(db: Session, before, key, response: Dict) -> None:
+    """Cache a run that left the state as it found it; a run that wrote something is never replayed."""
+    if before is not None and await run_in_threadpool(_fingerprint, db) == before:
+        schedule_cache.put(before + key, response)
+
+# Orders nobody could take yet, highest priority first; heap mirror of order_backlog.
+# Other workers write the table too, so each schedule run reloads it and claims what it pops.
+backlog = OrderBacklog()
+
+def _backlog(db: Session, reload: bool = False) -> OrderBacklog:
+    if reload or not backlog.loaded:
+        row = models.OrderBacklogModel
+        backlog.load(db.query(row.order_id, row.asset_id, row.task_type, row.priority, row.created_at).order_by(row.created_at))
+    return backlog
+
+def _claim(db: Session, entries) -> List:
+    """Delete the popped orders' rows and keep the ones this worker deleted; another run already took the rest."""
+    entries = list(entries)
+    if not entries:
+        return []
+    table = models.OrderBacklogModel.__table__
+    claimed = {order_id for (order_id,) in db.execute(
+        table.delete().where(table.c.order_id.in_([e.order_id for e in entries])).returning(table.c.order_id)
+    )}
+    db.commit()
+    return [e for e in entries if e.order_id in claimed]
+
+def _release(db: Session, entries) -> None:
+    """Write claimed orders nobody placed back, in their old place in line (caller commits)."""
+    entries = list(entries)
+    if not entries:
+        return
+    db.execute(insert(models.OrderBacklogModel).on_conflict_do_nothing(), [
+        {"order_id": e.order_id, "asset_id": e.asset_id, "task_type": e.task_type, "priority": e.priority,
+         "created_at": e.waiting_since or datetime.datetime.utcnow()}
+        for e in entries
+    ])
+    backlog.restore(entries)
+
+def _give_back(db: Session, entries) -> None:
+    """Release a failed run's claimed orders in a commit of their own."""
+    try:
+        _release(db, entries)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+def _enqueue(db: Session, orders, asset_map: Dict) -> int:
+    """Persist new orders in the backlog at their asset's priority (caller commits).
+
+    An asset another worker queued first keeps that order: the insert skips it.
+    """
+    queue = _backlog(db)
+    rows = []
+    for order in orders:
+        asset = asset_map.get(order.asset_id)
+        for _ in range(3):
+            if order.order_id not in queue:
+                break
+            order = build_predictive_order(asset) if order.task_type == "Predictive Repair" else build_emergency_order(asset)
+        if order.order_id in queue:
+            # Ids share a short asset-id prefix and a 3-digit suffix: spell the asset out
+            order = dataclasses.replace(order, order_id=f"{order.order_id}-{order.asset_id}")
+        priority = calculate_priority(asset)
+        queue.push(order.order_id, order.asset_id, order.task_type, priority)
+        rows.append({"order_id": order.order_id, "asset_id": order.asset_id, "task_type": order.task_type, "priority": priority})
+    if rows:
+        db.execute(insert(models.OrderBacklogModel).on_conflict_do_nothing(), rows)
+    return len(rows)
+
+def _rekey_backlog(db: Session, asset) -> None:
+    """Re-key an asset's waiting orders after its health or risk changed (caller commits)."""
+    if not backlog.loaded or asset.asset_id not in backlog.by_asset:
+        return
+    priority = calculate_priority(asset)
+    if backlog.rekey(asset.asset_id, priority):
+        db.query(models.OrderBacklogModel).filter(models.OrderBacklogModel.asset_id == asset.asset_id).update(
+            {models.OrderBacklogModel.priority: priority}, synchronize_session=False
+        )
+
+# Next preventive due date per asset (min-heap); loaded on first use, rolled forward by each run
+preventive = PreventiveCalendar()
+
+def _preventive(db: Session) -> PreventiveCalendar:
+    if not preventive.loaded:
+        preventive.load(
+            db.query(models.AssetModel.asset_id, models.AssetModel.asset_type, models.AssetModel.last_inspection),
+            dict(db.query(models.PreventiveRuleModel.asset_type, models.PreventiveRuleModel.interval_days)),
+            datetime.date.today(),
+        )
+    return preventive
+
+def _apply_roster(db: Session, engineers, now: datetime.datetime) -> int:
+    """Set shift fields from the stored roster around ``now`` (UTC, as shifts are stored); returns how many engineers it touched."""
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    rows = db.query(models.ShiftRosterModel).filter(
+        models.ShiftRosterModel.start >= midnight - datetime.timedelta(days=2),
+        models.ShiftRosterModel.start <= now + datetime.timedelta(days=2),
+    ).all()
+    state = shift_state(rows, now)
+    touched = 0
+    for eng in engineers:
+        entry = state.get(eng.engineer_id)
+        if entry is None:
+            continue
+        for field in ("last_shift_start", "last_shift_end", "availability"):
+            if entry[field] is not None:
+                setattr(eng, field, entry[field])
+        eng.hours_worked_yesterday = round(entry["hours_worked_yesterday"], 2)
+        touched += 1
+    return touched
+
+def _open_orders(db: Session):
+    return db.query(models.MaintenanceModel).filter(
+        models.MaintenanceModel.status.notin_(("COMPLETED", PLANNED))
+    ).all()
+
+def _write_version(db: Session) -> int:
+    return schedule_fingerprints.of(db.get_bind()).version(db)
+
+def _live_planner(db: Session) -> Optional[IncrementalPlanner]:
+    """The incremental planner, or None once the database moved on without it."""
+    global planner
+    version = _write_version(db)   # first read installs the version triggers, before the route writes
+    if planner is not None and version != planner_version:
+        planner = None
+    return planner
+
+def _planner_synced(db: Session) -> None:
+    """Record the write version the plan reflects; call after its changes, before the commit."""
+    global planner_version
+    if planner is not None:
+        db.flush()
+        planner_version = _write_version(db)
+
+def _rebuild_planner(db: Session) -> List[Dict]:
+    """Bootstrap a fresh plan from the database (seconds on a large plant: run it off the event loop)."""
+    global planner
+    fresh = IncrementalPlanner()
+    allocations = fresh.bootstrap(
+        db.query(models.AssetModel).all(),
+        db.query(models.EngineerModel).all(),
+        _open_orders(db),
+        [row.order_id for row in db.query(models.MaintenanceModel.order_id)],
+        crew_rosters(db, models),
+    )
+    planner = fresh   # swapped in whole: event routes never see a half-built plan
+    return allocations
+
+def _apply_planner_changes(db: Session, allocations: List[Dict]):
+    """Persist what an incremental event changed, plus the fatigue it cost."""
+    if not allocations:
+        return
+    _persist_allocations(db, allocations)
+    for eng_id in {eng_id for a in allocations for eng_id in a.get("crew") or [a["engineer_id"]]}:
+        db.query(models.EngineerModel).filter(models.EngineerModel.engineer_id == eng_id).update(
+            {models.EngineerModel.fatigue: planner.fatigue_of(eng_id)}
+        )
+
 # --- ASSET ROUTES ---
 
 @app.get("/assets")
@@ -54,9 +312,19 @@ async def create_asset(data: dict, db: Session = Depends(get_db)):
             responsible_teams=data.get("responsible_teams", []),
             required_certifications=data.get("required_certifications", [])
         )
+        _live_planner(db)
         db.add(new_asset)
+        log_readings(db, [new_asset.asset_id], [new_asset.health_score])
         db.commit()
         db.refresh(new_asset)
+        if impact_graph.loaded:
+            impact_graph.add_asset(new_asset)
+        if preventive.loaded:
+            preventive.add_asset(new_asset.asset_id, new_asset.asset_type, new_asset.last_inspection)
+        if planner is not None:
+            _apply_planner_changes(db, planner.on_asset_added(new_asset))
+            _planner_synced(db)
+            db.commit()
         return {"message": "Asset Deployment Successful", "asset_id": new_asset.asset_id}
     except Exception as e:
         db.rollback()
@@ -66,22 +334,70 @@ async def create_asset(data: dict, db: Session = Depends(get_db)):
 async def trigger_chaos(db: Session = Depends(get_db)):
     """SIMULATION: Decay health of 40% of assets to trigger the scheduler."""
     assets = db.query(models.AssetModel).all()
-    affected = 0
+    _live_planner(db)
+    affected = []
     for asset in assets:
         if random.random() < 0.4:
             asset.health_score = round(random.uniform(10, 48), 1)
             asset.risk_level = random.randint(3, 5)
-            affected += 1
+            affected.append(asset)
+            if impact_graph.loaded:
+                impact_graph.set_risk(asset.asset_id, asset.risk_level)
+            _rekey_backlog(db, asset)
+            if planner is not None:
+                _apply_planner_changes(db, planner.on_health(asset.asset_id, asset.health_score, asset.risk_level))
+    log_readings(db, [a.asset_id for a in affected], [a.health_score for a in affected])
+    _planner_synced(db)
     db.commit()
-    return {"status": "Chaos Protocol Active", "affected_units": affected}
+    return {"status": "Chaos Protocol Active", "affected_units": len(affected)}
 
 @app.post("/assets/reset-health")
 async def reset_health(db: Session = Depends(get_db)):
     """Restore all assets to optimal status."""
+    _live_planner(db)
     db.query(models.AssetModel).update({models.AssetModel.health_score: 100.0, models.AssetModel.risk_level: 1})
+    if backlog.loaded:
+        for asset_id in list(backlog.by_asset):
+            backlog.rekey(asset_id, 1.0)   # calculate_priority at health 100, risk 1
+    db.query(models.OrderBacklogModel).update({models.OrderBacklogModel.priority: 1.0})
+    ids = [a for (a,) in db.query(models.AssetModel.asset_id)]
+    log_readings(db, ids, [100.0] * len(ids))
+    _planner_synced(db)
     db.commit()
+    impact_graph.loaded = False   # every stake changed: cheaper to rebuild on next use
+    if planner is not None:
+        for asset_id in list(planner.assets):
+            planner.on_health(asset_id, 100.0, 1)
     return {"message": "All systems restored to 100% health"}
 
+@app.put("/assets/{asset_id}/health")
+async def update_asset_health(asset_id: str, data: dict, db: Session = Depends(get_db)):
+    """Sensor/health update for one asset; the incremental planner reacts to just this change."""
+    asset = db.query(models.AssetModel).filter(models.AssetModel.asset_id == asset_id).first()
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    _live_planner(db)
+    try:
+        asset.health_score = float(data.get("health_score", asset.health_score))
+        asset.risk_level = int(data.get("risk_level", asset.risk_level))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid health update: {str(e)}")
+
+    log_readings(db, [asset.asset_id], [asset.health_score])
+    _rekey_backlog(db, asset)
+
+    # Exposure ignores health, so only a risk change reaches the graph (and only its ancestors)
+    if impact_graph.loaded:
+        impact_graph.set_risk(asset.asset_id, asset.risk_level)
+
+    decisions = []
+    if planner is not None:
+        decisions = planner.on_health(asset.asset_id, asset.health_score, asset.risk_level)
+        _apply_planner_changes(db, decisions)
+        _planner_synced(db)
+    db.commit()
+    return {"asset_id": asset.asset_id, "health_score": asset.health_score, "decisions": decisions}
+
 @app.delete("/assets/{asset_id}")
 async def delete_asset(asset_id: str, db: Session = Depends(get_db)):
     try:
@@ -93,17 +409,106 @@ async def delete_asset(asset_id: str, db: Session = Depends(get_db)):
         if not asset:
             raise HTTPException(status_code=404, detail="Asset not found")
         
+        dep = models.AssetDependencyModel
+        db.query(dep).filter((dep.upstream_id == asset.asset_id) | (dep.downstream_id == asset.asset_id)).delete(
+            synchronize_session=False
+        )
+        db.query(models.OrderBacklogModel).filter(models.OrderBacklogModel.asset_id == asset.asset_id).delete(
+            synchronize_session=False
+        )
+        db.query(models.HealthReadingModel).filter(models.HealthReadingModel.asset_id == asset.asset_id).delete(
+            synchronize_session=False
+        )
         db.delete(asset)
         db.commit()
+        if impact_graph.loaded:
+            impact_graph.remove_asset(asset.asset_id)
+        preventive.remove_asset(asset.asset_id)
+        for order_id in list(backlog.by_asset.get(asset.asset_id, ())):
+            backlog.remove(order_id)
+        health_history.forget(asset.asset_id)
         return {"status": "success", "message": f"Unit {clean_id} decommissioned"}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Deletion blocked: {str(e)}")
 
+def _dependency_view(graph: ImpactGraph, edge) -> Dict:
+    return {
+        "upstream_id": edge.upstream_id,
+        "downstream_id": edge.downstream_id,
+        "weight": edge.weight,
+        "upstream_exposure": round(graph.exposure.get(edge.upstream_id, 0.0), 3),
+    }
+
+@app.get("/assets/dependencies")
+def get_dependencies(asset_id: Optional[str] = None, db: Session = Depends(get_db)):
+    """Dependency edges, all or those touching ``asset_id`` (plus what it takes down with it)."""
+    dep = models.AssetDependencyModel
+    query = db.query(dep)
+    if asset_id:
+        query = query.filter((dep.upstream_id == asset_id) | (dep.downstream_id == asset_id))
+    graph = _impact(db)
+    response = {"edges": [_dependency_view(graph, edge) for edge in query.order_by(dep.id)]}
+    if asset_id:
+        response["exposure"] = round(graph.exposure.get(asset_id, 0.0), 3)
+        response["downstream"] = graph.downstream(asset_id)
+    return response
+
+@app.post("/assets/dependencies")
+def add_dependency(data: dict, db: Session = Depends(get_db)):
+    """Declare that ``downstream_id`` idles while ``upstream_id`` is down."""
+    upstream_id, downstream_id = data.get("upstream_id"), data.get("downstream_id")
+    try:
+        weight = float(data.get("weight", 1.0))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="weight must be a number")
+    if not upstream_id or not downstream_id or upstream_id == downstream_id:
+        raise HTTPException(status_code=400, detail="upstream_id and downstream_id must name two different assets")
+    if not 0 < weight <= 1:
+        raise HTTPException(status_code=400, detail="weight must be in (0, 1]")
+    found = {a for (a,) in db.query(models.AssetModel.asset_id).filter(
+        models.AssetModel.asset_id.in_([upstream_id, downstream_id])
+    )}
+    if len(found) < 2:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    dep = models.AssetDependencyModel
+    if db.query(dep.id).filter(dep.upstream_id == upstream_id, dep.downstream_id == downstream_id).first():
+        raise HTTPException(status_code=400, detail="Dependency already exists")
+    graph = _impact(db)
+    if graph.closes_cycle(upstream_id, downstream_id):
+        raise HTTPException(status_code=400, detail=f"{upstream_id} already depends on {downstream_id}; dependencies cannot form a cycle")
+    edge = dep(upstream_id=upstream_id, downstream_id=downstream_id, weight=weight)
+    db.add(edge)
+    record_event(db, "DEPENDENCY_ADDED", {
+        "asset_id": upstream_id,
+        "message": f"{downstream_id} now depends on {upstream_id} (weight {weight:g})",
+    })
+    db.commit()
+    graph.add_edge(upstream_id, downstream_id, weight)
+    return _dependency_view(graph, edge)
+
+@app.delete("/assets/dependencies/{upstream_id}/{downstream_id}")
+def remove_dependency(upstream_id: str, downstream_id: str, db: Session = Depends(get_db)):
+    dep = models.AssetDependencyModel
+    graph = _impact(db)
+    removed = db.query(dep).filter(dep.upstream_id == upstream_id, dep.downstream_id == downstream_id).delete(
+        synchronize_session=False
+    )
+    if not removed:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    record_event(db, "DEPENDENCY_REMOVED", {
+        "asset_id": upstream_id,
+        "message": f"{downstream_id} no longer depends on {upstream_id}",
+    })
+    db.commit()
+    graph.remove_edge(upstream_id, downstream_id)
+    return {"status": "success", "upstream_exposure": round(graph.exposure.get(upstream_id, 0.0), 3)}
+
 # --- ENGINEER ROUTES ---
 def calculate_nexus_fatigue(engineer):
-    # Use datetime.datetime.now() to match your import style
-    now = datetime.datetime.now()
+    # UTC, the clock roster shifts are stored on
+    now = datetime.datetime.utcnow()
     
     # 1. RECOVERY LOGIC
     if hasattr(engineer, 'last_shift_end') and engineer.last_shift_end:
@@ -137,6 +542,7 @@ def calculate_nexus_fatigue(engineer):
 def get_engineers(db: Session = Depends(get_db)):
     # FIX: Use models.EngineerModel to match your import style
     engineers = db.query(models.EngineerModel).all()
+    _apply_roster(db, engineers, datetime.datetime.utcnow())
     
     for eng in engineers:
         # Calculate on the fly
@@ -155,13 +561,18 @@ async def add_engineer(data: dict, db: Session = Depends(get_db)):
             skill_matrix=data.get("skill_matrix", {}), 
             availability=data.get("availability", "Day"),
             # We initialize these so the fatigue logic has a starting point
-            last_shift_start=datetime.datetime.now(),
-            last_shift_end=datetime.datetime.now() - datetime.timedelta(days=2),
+            last_shift_start=datetime.datetime.utcnow(),
+            last_shift_end=datetime.datetime.utcnow() - datetime.timedelta(days=2),
             hours_worked_yesterday=0.0,
             fatigue=0.0
         )
+        _live_planner(db)
         db.add(new_eng)
         db.commit()
+        if planner is not None:
+            _apply_planner_changes(db, planner.on_engineer_added(new_eng))
+            _planner_synced(db)
+            db.commit()
         return {"message": "Personnel Authorized"}
     except Exception as e:
         db.rollback()
@@ -186,14 +597,28 @@ async def delete_engineer(engineer_id: str, db: Session = Depends(get_db)):
             models.MaintenanceModel.status != "COMPLETED"
         ).first()
 
+        if not active_task:
+            # Crew members hold the order too, not just its lead
+            active_task = db.query(models.MaintenanceModel).join(
+                models.MaintenanceCrewModel,
+                models.MaintenanceCrewModel.order_id == models.MaintenanceModel.order_id,
+            ).filter(
+                models.MaintenanceCrewModel.engineer_id == clean_id,
+                models.MaintenanceModel.status != "COMPLETED"
+            ).first()
+
         if active_task:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Personnel cannot be removed: Active assignment found on Order {active_task.order_id}"
             )
 
+        _live_planner(db)
         db.delete(engineer)
         db.commit()
+        if planner is not None:
+            _apply_planner_changes(db, planner.on_engineer_removed(clean_id))
+            _planner_synced(db)
         
         # Log the decommissioning
         record_event(db, "PERSONNEL_DEPARTURE", {
@@ -213,96 +638,323 @@ async def delete_engineer(engineer_id: str, db: Session = Depends(get_db)):
     
 
 # --- ORCHESTRATION & ANALYSIS ---
-@app.post("/schedule")
-async def trigger_schedule(db: Session = Depends(get_db)):
-    # 1. Fetch current state
+# An asset with an order in one of these needs no new one
+OPEN_STATUSES = ("ASSIGNED", "IN_PROGRESS")
+
+def _persist_allocations(db: Session, allocations: List[Dict]):
+    """Upsert allocations as ASSIGNED orders and log each assignment (caller commits).
+
+    One upsert statement and one event insert, each executed over all rows.
+    """
+    if not allocations:
+        return
+    rows, events = [], []
+    for alloc in allocations:
+        start_dt = datetime.datetime.fromisoformat(alloc['start_time'])
+        # Use duration from brain or default to 120 mins
+        end_dt = start_dt + datetime.timedelta(minutes=alloc.get('duration_minutes', 120))
+        if decision_trace.verbose:
+            print(f"DEBUG: Processing {alloc['order_id']} | Start: {start_dt} | End: {end_dt}") # New tracking print
+        rows.append({
+            "order_id": alloc['order_id'],
+            "asset_id": alloc['asset_id'],
+            "assigned_engineer_id": alloc['engineer_id'],
+            "status": "ASSIGNED",
+            "priority": 3,
+            "scheduled_date": start_dt,
+            "end_time": end_dt,
+        })
+        lead = "Crew led by" if alloc.get("crew") else "Engineer"
+        events.append({
+            "engineer_id": alloc['engineer_id'],
+            "asset_id": alloc['asset_id'],
+            "severity": "CRITICAL",
+            "message": f"EMERGENCY: {lead} {alloc['engineer_name']} assigned/re-assigned to {alloc['asset_id']}."
+        })
+
+    # If the order_id already exists, update the engineer and dates instead of crashing
+    stmt = insert(models.MaintenanceModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['order_id'],
+        set_={
+            "assigned_engineer_id": stmt.excluded.assigned_engineer_id,
+            "scheduled_date": stmt.excluded.scheduled_date,
+            "end_time": stmt.excluded.end_time,
+        }
+    )
+    db.execute(stmt, rows)
+    record_events(db, "ASSIGNMENT", events)
+
+    # Crews: one row per assignee; a re-planned order drops its previous crew first
+    db.query(models.MaintenanceCrewModel).filter(
+        models.MaintenanceCrewModel.order_id.in_([alloc['order_id'] for alloc in allocations])
+    ).delete(synchronize_session=False)
+    crew_rows = [
+        {"order_id": alloc['order_id'], "engineer_id": engineer_id, "is_lead": n == 0}
+        for alloc in allocations if alloc.get("crew")
+        for n, engineer_id in enumerate(alloc["crew"])
+    ]
+    if crew_rows:
+        db.execute(insert(models.MaintenanceCrewModel), crew_rows)
+
+def _schedule_inputs(db: Session, batch: int, priority: str = "own"):
+    """Assets, engineers, the top ``batch`` backlog orders and live bookings for a full /schedule run.
+
+    New needs found by the scan join the persisted backlog first; the popped
+    entries come back as the last element so the caller can return the
+    unplaced ones.  ``priority="impact"`` takes the top orders by
+    impact-weighted priority, the order the solver will rank them in.
+    """
     db_assets = db.query(models.AssetModel).all()
     db_engineers = db.query(models.EngineerModel).all()
+    # Rostered shifts decide each engineer's window and rest (saved with the schedule);
+    # read on the calendar's own (UTC) clock so shift windows line up with bookings
+    now = ScheduleCalendar().now
+    _apply_roster(db, db_engineers, now)
     
-    active_orders = []
     print(f"\n--- SCHEDULER SCAN START ---") # Kept for tracking
-    
-    for asset in db_assets:
-        current_health = float(asset.health_score)
-        if current_health < 50.0:
-            existing_work = db.query(models.MaintenanceModel).filter(
-                models.MaintenanceModel.asset_id == asset.asset_id,
-                models.MaintenanceModel.status == "IN_PROGRESS"
-            ).first()
-            
-            if not existing_work:
-                req_certs = set(asset.required_certifications) if asset.required_certifications else set()
-                active_orders.append(
-                    MaintenanceOrder(
-                        order_id=f"ORD-{asset.asset_id[:5]}-{random.randint(100,999)}",
-                        asset_id=asset.asset_id,
-                        required_certifications=req_certs,
-                        task_type="Emergency Repair",
-                        base_time_minutes=120,
-                        task_difficulty=1.5
-                    )
-                )
+
+    # One anti-join: assets with no open order that are below 50, or whose
+    # health trend crosses 50 within the horizon (book before the failure)
+    soon = {}
+    if settings.forecast_horizon_hours > 0:
+        health_history.refresh(db)    # readings any worker logged since the last run
+        soon = due_within(health_history, settings.forecast_horizon_hours)
+    order = models.MaintenanceModel
+    open_work = db.query(order.asset_id).filter(
+        order.status.in_(OPEN_STATUSES), order.asset_id.isnot(None)
+    ).distinct().subquery()
+    idle = db.query(models.AssetModel.asset_id, models.AssetModel.health_score).outerjoin(
+        open_work, open_work.c.asset_id == models.AssetModel.asset_id
+    ).filter(open_work.c.asset_id.is_(None))
+    if not soon:
+        idle = idle.filter(models.AssetModel.health_score < 50.0)
+    asset_map = {asset.asset_id: asset for asset in db_assets}
+    emergency, predictive = [], []
+    for asset_id, health in idle:
+        if float(health) < 50.0:
+            emergency.append(build_emergency_order(asset_map[asset_id]))
+        elif asset_id in soon:
+            predictive.append(build_predictive_order(asset_map[asset_id]))
+    active_orders = emergency + predictive
+
+    # New needs join the backlog (one order per asset); the run claims its top ``batch``.
+    # Backlog writes commit on their own session: committing this one would expire every row loaded above.
+    with Session(bind=db.get_bind()) as own:
+        queue = _backlog(own, reload=True)
+        if _enqueue(own, [o for o in active_orders if o.asset_id not in queue.by_asset], asset_map):
+            own.commit()
+            queue = _backlog(own, reload=True)    # rows another worker inserted first won
+        if priority == "impact":
+            graph = _impact(db)
+            taken = queue.pop(batch, lambda entry: graph.priority(asset_map.get(entry.asset_id)))
+        else:
+            taken = queue.pop(batch)
+        taken = _claim(own, taken)
+    active_orders = [to_order(entry, asset_map.get(entry.asset_id)) for entry in taken]
+
+    bookings = db.query(models.MaintenanceModel).filter(
+        models.MaintenanceModel.status == "ASSIGNED",
+        models.MaintenanceModel.end_time > now
+    ).all() + crew_bookings(db, models, now) if active_orders else []
+    return db_assets, db_engineers, active_orders, bookings, now, taken
+
+def _commit_schedule(db: Session, db_engineers, allocations: List[Dict], fatigue: Dict[str, float], unplaced: List):
+    """Write a solved plan: allocations, the fatigue it cost and the claimed orders it left, in one commit."""
+    for eng in db_engineers:
+        if eng.engineer_id in fatigue:
+            eng.fatigue = fatigue[eng.engineer_id]
+    try:
+        _persist_allocations(db, allocations)
+        _release(db, unplaced)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+@app.post("/schedule")
+async def trigger_schedule(
+    strategy: str = "greedy",
+    mode: str = "full",
+    deadline_ms: Optional[int] = None,
+    priority: str = "impact",
+    batch: Optional[int] = None,
+    refresh: bool = False,
+    db: Session = Depends(get_db),
+):
+    global planner
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{strategy}'. Use one of: {', '.join(STRATEGIES)}")
+    if mode not in ("full", "incremental"):
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Use one of: full, incremental")
+    if deadline_ms is not None and deadline_ms <= 0:
+        raise HTTPException(status_code=400, detail="deadline_ms must be positive")
+    if priority not in ("impact", "own"):
+        raise HTTPException(status_code=400, detail=f"Unknown priority '{priority}'. Use one of: impact, own")
+    batch = settings.schedule_batch_size if batch is None else batch
+    if batch <= 0:
+        raise HTTPException(status_code=400, detail="batch must be positive")
+
+    run_id = decision_trace.begin_run(mode)
+
+    # The same state already produced a run that changed nothing: hand back its outcome
+    before = None
+    if mode == "full":
+        key = (strategy, priority, batch, deadline_ms)
+        before = await run_in_threadpool(_fingerprint, db)
+        cached = None if refresh else schedule_cache.get(before + key)
+        if cached is not None:
+            decision_trace.end_run(run_id, status="cached")
+            return {**cached, "run_id": run_id, "cached": True}
+
+    # Incremental: build the live plan once; afterwards events keep it current
+    if mode == "incremental":
+        if await run_in_threadpool(_live_planner, db) is None:
+            allocations = await run_in_threadpool(_rebuild_planner, db)
+        else:
+            allocations = planner.retry_waiting()
+        try:
+            await run_in_threadpool(_apply_planner_changes, db, allocations)
+            _planner_synced(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            planner = None
+            decision_trace.end_run(run_id, status="error")
+            raise HTTPException(status_code=500, detail=f"Database persistence failed: {str(e)}")
+        decision_trace.end_run(run_id, status="success", strategy="greedy", assigned=len(allocations))
+        return {
+            "status": "success" if allocations else "idle",
+            "mode": mode,
+            "run_id": run_id,
+            "waiting_orders": len(planner.waiting),
+            "decisions": allocations,
+        }
+
+    # 1. Fetch current state (off the event loop)
+    db_assets, db_engineers, active_orders, bookings, now, taken = await run_in_threadpool(_schedule_inputs, db, batch, priority)
 
     if not active_orders:
         print(f"--- SCHEDULER: No critical needs found ---")
-        return {"status": "idle", "message": "No new critical needs found."}
+        decision_trace.end_run(run_id, status="idle")
+        response = {"status": "idle", "message": "No new critical needs found.", "run_id": run_id}
+        await _remember(db, before, key, response)
+        return response
+
+    # 2. Run the Brain in the solver pool against each engineer's existing bookings
+    # Impact priority: each asset's risk stands in as its downstream exposure (graph kept current by events)
+    stakes = (await run_in_threadpool(_impact, db)).stakes() if priority == "impact" else None
+    job = capture(db_assets, active_orders, db_engineers, bookings, now, strategy, stakes)
+    job["deadline_ms"] = deadline_ms
+    job["trace_level"] = decision_trace.level
+    try:
+        result = await solver_pool.submit(solve_snapshot, job)
+    except PoolSaturated as e:
+        await run_in_threadpool(_give_back, db, taken)
+        decision_trace.end_run(run_id, status="rejected", strategy=strategy)
+        raise HTTPException(status_code=503, detail=f"Scheduler busy: {str(e)}")
 
-    # 2. Run the Brain
-    allocations = run_orchestration(db_assets, active_orders, db_engineers)
+    allocations = result["allocations"]
+    strategy = result["strategy"]
+    decision_trace.extend(result["records"], run_id)
 
     print(f"DEBUG: Brain output for first allocation: {allocations[0] if allocations else 'EMPTY'}")
 
     # 3. Persistence with Error Handling
     try:
-        for alloc in allocations:
-            # --- START TIME CALCULATION ---
-            start_dt = datetime.datetime.fromisoformat(alloc['start_time'])
-            
-            # Use duration from brain or default to 120 mins
-            duration = alloc.get('duration_minutes', 120) 
-            end_dt = start_dt + datetime.timedelta(minutes=duration)
-            
-            print(f"DEBUG: Processing {alloc['order_id']} | Start: {start_dt} | End: {end_dt}") # New tracking print
-
-            # We use the specialized 'insert' to handle existing order_ids
-            stmt = insert(models.MaintenanceModel).values(
-                order_id=alloc['order_id'],
-                asset_id=alloc['asset_id'],
-                assigned_engineer_id=alloc['engineer_id'],
-                status="ASSIGNED",
-                priority=3,
-                scheduled_date=start_dt,
-                end_time=end_dt # <--- SAVING NEW DATA
-            )
-
-            # If the order_id already exists, update the engineer and date instead of crashing
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['order_id'],
-                set_={
-                    "assigned_engineer_id": alloc['engineer_id'],
-                    "scheduled_date": start_dt,
-                    "end_time": end_dt # <--- UPDATING NEW DATA
-                }
-            )
-            db.execute(stmt)
-            
-            # Log the assignment
-            record_event(db, "ASSIGNMENT", {
-                "engineer_id": alloc['engineer_id'],
-                "asset_id": alloc['asset_id'],
-                "severity": "CRITICAL",
-                "message": f"EMERGENCY: Engineer {alloc['engineer_name']} assigned/re-assigned to {alloc['asset_id']}."
-            })
-
-        db.commit()
+        # Whatever nobody could take waits in the backlog for the next run, in its old place
+        placed = {alloc["order_id"] for alloc in allocations}
+        await run_in_threadpool(
+            _commit_schedule, db, db_engineers, allocations, result["fatigue"],
+            [entry for entry in taken if entry.order_id not in placed],
+        )
         print(f"--- SCHEDULER SCAN COMPLETE: {len(allocations)} decisions saved ---\n")
-        return {"status": "success", "decisions": allocations}
+        # Opt-in capture of the exact inputs the solver saw
+        traces = trace_dir()
+        if traces:
+            job["strategy"] = strategy
+            write_trace(job, allocations, result["solve_ms"], traces)
+        decision_trace.end_run(
+            run_id, status="success", strategy=strategy,
+            orders=len(active_orders), assigned=len(allocations), solve_ms=round(result["solve_ms"], 3),
+        )
+        response = {
+            "status": "success",
+            "run_id": run_id,
+            "strategy": strategy,
+            "total_cost": round(result["total_cost"], 2),
+            "decisions": allocations,
+            "backlog": len(backlog),
+        }
+        if result["anytime"] is not None:
+            response["anytime"] = result["anytime"]
+        await _remember(db, before, key, response)
+        return response
         
     except Exception as e:
         db.rollback()
+        await run_in_threadpool(_give_back, db, taken)
         print(f"CRITICAL DATABASE ERROR: {str(e)}") # Kept for tracking
+        decision_trace.end_run(run_id, status="error", strategy=strategy)
         raise HTTPException(status_code=500, detail=f"Database persistence failed: {str(e)}")
+
+@app.post("/schedule/simulate")
+def simulate_schedule(data: dict, db: Session = Depends(get_db)):
+    """What-if runs on a snapshot of the plant; nothing is written to the database."""
+    scenarios = data.get("scenarios") or []
+    strategy = data.get("strategy", "greedy")
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy '{strategy}'. Use one of: {', '.join(STRATEGIES)}")
+    if not isinstance(scenarios, list) or not scenarios:
+        raise HTTPException(status_code=400, detail="Provide at least one scenario")
+    if len(scenarios) > MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SCENARIOS} scenarios per request")
+
+    snapshot = PlantSnapshot.from_db(db, models, OPEN_STATUSES)
+    return simulate(snapshot, scenarios, strategy, data.get("workers"))
+
+@app.get("/schedule/incremental/check")
+async def check_incremental_plan(repair: bool = False, db: Session = Depends(get_db)):
+    """Full rescan as a consistency check of the incremental plan; ``repair`` rebuilds it on drift."""
+    if planner is None:
+        raise HTTPException(status_code=409, detail="Incremental planning is not active. POST /schedule?mode=incremental first.")
+    db_assets = db.query(models.AssetModel).all()
+    report = planner.check(db_assets, _open_orders(db))
+    report["repaired"] = []
+    if repair and not report["consistent"]:
+        report["repaired"] = await run_in_threadpool(_rebuild_planner, db)
+        _apply_planner_changes(db, report["repaired"])
+        _planner_synced(db)
+        db.commit()
+    return report
     
+@app.get("/schedule/runs/{run_id}")
+def get_schedule_run(run_id: str, db: Session = Depends(get_db)):
+    """Decision records of a run while still in the trace buffer; its summary from event_log otherwise."""
+    report = decision_trace.run_report(run_id)
+    if report is not None:
+        return report
+    events = db.query(models.EventLogModel).filter(models.EventLogModel.event_type == TRACE_EVENT).order_by(models.EventLogModel.id.desc())
+    for event in events:
+        payload = event.payload if isinstance(event.payload, dict) else json.loads(event.payload)
+        if payload.get("run_id") == run_id:
+            return {"run_id": run_id, "summary": payload, "records": []}
+    raise HTTPException(status_code=404, detail="Schedule run not found")
+
+@app.get("/backlog")
+def get_backlog(limit: int = 50, db: Session = Depends(get_db)):
+    """Orders waiting for an engineer, highest priority first (read off the priority index)."""
+    row = models.OrderBacklogModel
+    top = db.query(row).order_by(row.priority.desc(), row.created_at).limit(max(limit, 0))
+    return {
+        "total": db.query(row).count(),
+        "orders": [
+            {"order_id": o.order_id, "asset_id": o.asset_id, "task_type": o.task_type,
+             "priority": round(o.priority, 2), "waiting_since": o.created_at.isoformat() if o.created_at else None}
+            for o in top
+        ],
+    }
+
 @app.get("/maintenance/orders")
 async def get_maintenance_orders(db: Session = Depends(get_db)):
     orders = db.query(models.MaintenanceModel).all()
@@ -322,6 +974,11 @@ async def get_alerts(db: Session = Depends(get_db)):
         })
     return alerts
 
+@app.put("/alerts/{alert_id}/resolve")
+async def resolve_open_alert(alert_id: str, db: Session = Depends(get_db)):
+    resolve_alert(db, alert_id, scheduler=escalations)
+    return {"message": "Alert Resolved", "alert_id": alert_id}
+
 @app.get("/analysis/readiness")
 def get_readiness_metrics(db: Session = Depends(get_db)):
     engineers = db.query(models.EngineerModel).all()
@@ -350,13 +1007,236 @@ def get_readiness_metrics(db: Session = Depends(get_db)):
         })
     return readiness_data
 
+@app.get("/analysis/readiness/risk")
+def get_readiness_risk(horizon_hours: float = 168, draws: int = 100_000, seed: int = 0, db: Session = Depends(get_db)):
+    """Monte Carlo chance that a shift's failures per certification outrun the fit engineers holding it."""
+    if not 1 <= draws <= 1_000_000:
+        raise HTTPException(status_code=400, detail="draws must be between 1 and 1000000")
+    if horizon_hours <= 0:
+        raise HTTPException(status_code=400, detail="horizon_hours must be positive")
+    engineers = db.query(models.EngineerModel).all()
+    assets = db.query(models.AssetModel).all()
+    health_history.refresh(db)
+    trend = forecast(health_history)
+    hours = {a: float(h) for a, h in zip(trend["asset_ids"], trend["hours"]) if np.isfinite(h)}
+    return readiness_risk(assets, engineers, hours, horizon_hours=horizon_hours, draws=draws, seed=seed)
+
+@app.get("/analysis/priorities")
+def get_priority_ranking(limit: int = 20, by: str = "impact", db: Session = Depends(get_db)):
+    """Assets ranked by orchestrator priority, scored in one vectorized pass.
+
+    ``by=impact`` ranks by downstream exposure (what /schedule sorts by), ``by=own`` by the asset alone.
+    """
+    if by not in ("impact", "own"):
+        raise HTTPException(status_code=400, detail=f"Unknown ranking '{by}'. Use one of: impact, own")
+    assets = db.query(models.AssetModel).all()
+    health, risk = asset_arrays(assets)
+    graph = _impact(db)
+    exposure = np.fromiter((graph.exposure.get(a.asset_id, r) for a, r in zip(assets, risk)), dtype=float, count=len(assets))
+    scores = priorities(health, risk)
+    impact = priorities(health, exposure)
+    ranked = np.argsort(-(impact if by == "impact" else scores), kind="stable")[:max(limit, 0)]
+    return [
+        {
+            "asset_id": assets[i].asset_id,
+            "health_score": assets[i].health_score,
+            "risk_level": assets[i].risk_level,
+            "priority": round(float(scores[i]), 2),
+            "exposure": round(float(exposure[i]), 3),
+            "impact_priority": round(float(impact[i]), 2),
+            "downstream": len(graph.children.get(assets[i].asset_id, ())),
+        }
+        for i in ranked
+    ]
+
+@app.get("/analysis/forecast")
+def get_health_forecast(hours: float = 168, limit: int = 50, db: Session = Depends(get_db)):
+    """Assets whose health trend reaches the scheduling threshold within ``hours``, soonest first."""
+    health_history.refresh(db)
+    result = forecast(health_history)
+    soon = np.flatnonzero(result["hours"] <= hours)
+    soon = soon[np.argsort(result["hours"][soon], kind="stable")][:max(limit, 0)]
+    now = datetime.datetime.now()
+    return [
+        {
+            "asset_id": result["asset_ids"][i],
+            "health_now": round(float(result["health"][i]), 2),
+            "decay_per_day": round(float(-result["slope"][i] * 24), 3),
+            "hours_to_threshold": round(float(result["hours"][i]), 2),
+            "crosses_at": (now + datetime.timedelta(hours=float(result["hours"][i]))).isoformat(),
+        }
+        for i in soon
+    ]
+
+@app.get("/assets/{asset_id}/health/history")
+def get_health_history(asset_id: str, tier: str = "raw", db: Session = Depends(get_db)):
+    if tier not in health_history.rings:
+        raise HTTPException(status_code=400, detail=f"Unknown tier '{tier}'. Use one of: {', '.join(health_history.rings)}")
+    health_history.refresh(db)
+    return {"asset_id": asset_id, "tier": tier, "readings": health_history.series(asset_id, tier)}
+
+@app.get("/analysis/availability")
+def get_availability(days: int = 7, slot_minutes: int = 60, certs: Optional[str] = None, db: Session = Depends(get_db)):
+    """Legally available engineers per time slot over the planning horizon."""
+    engineers = db.query(models.EngineerModel).all()
+    required = [c.strip() for c in certs.split(",") if c.strip()] if certs else None
+    overrides.refresh(db)
+    matrix = AvailabilityMatrix(engineers, days=max(days, 1), slot_minutes=max(slot_minutes, 1), overrides=overrides.active())
+    counts = matrix.counts(required).tolist()
+    return [
+        {"slot_start": matrix.slot_start(slot).isoformat(), "available": count}
+        for slot, count in enumerate(counts)
+    ]
+
+# --- PREVENTIVE ROUTES ---
+@app.post("/preventive/generate")
+def generate_preventive(horizon_days: int = 14, db: Session = Depends(get_db)):
+    """Nightly run: PLANNED inspection orders for every asset due within the horizon."""
+    if not 1 <= horizon_days <= 366:
+        raise HTTPException(status_code=400, detail="horizon_days must be between 1 and 366")
+    calendar = _preventive(db)
+    today = datetime.date.today()
+    rows = order_rows(calendar.due(today, today + datetime.timedelta(days=horizon_days)), today)
+    try:
+        created = insert_orders(db, models, rows)
+        record_event(db, "PREVENTIVE_GENERATED", {
+            "severity": "INFO",
+            "message": f"Preventive run: {created} inspection orders over the next {horizon_days} days.",
+        })
+        db.commit()
+        schedule_fingerprints.of(db.get_bind()).touch(models.MaintenanceModel)   # inserted on the raw connection
+    except Exception as e:
+        db.rollback()
+        preventive.loaded = False   # the heap already rolled past these dates; reload from the table
+        raise HTTPException(status_code=500, detail=f"Preventive generation failed: {str(e)}")
+    return {
+        "status": "success",
+        "due": len(rows),
+        "created": created,
+        "overdue": sum(1 for row in rows if row["priority"] > 1),
+        "horizon_days": horizon_days,
+    }
+
+@app.get("/preventive/orders")
+def get_preventive_orders(days: int = 14, db: Session = Depends(get_db)):
+    """PLANNED inspection orders due within ``days`` (overdue ones included)."""
+    until = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=days), datetime.time())
+    rows = db.query(models.MaintenanceModel).filter(
+        models.MaintenanceModel.status == PLANNED,
+        models.MaintenanceModel.scheduled_date <= until,
+    ).order_by(models.MaintenanceModel.scheduled_date, models.MaintenanceModel.asset_id)
+    return [
+        {"order_id": o.order_id, "asset_id": o.asset_id, "due": o.scheduled_date.date().isoformat(), "priority": o.priority}
+        for o in rows
+    ]
+
+@app.get("/preventive/rules")
+def get_preventive_rules(db: Session = Depends(get_db)):
+    calendar = _preventive(db)
+    types = {t for (t,) in db.query(models.AssetModel.asset_type).distinct()} | set(calendar.rules)
+    return [
+        {"asset_type": t, "interval_days": calendar.interval_for(t), "default": t not in calendar.rules}
+        for t in sorted(types)
+    ]
+
+@app.put("/preventive/rules/{asset_type}")
+def set_preventive_rule(asset_type: str, data: dict, db: Session = Depends(get_db)):
+    try:
+        interval_days = int(data.get("interval_days"))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="interval_days must be an integer")
+    if interval_days < 1:
+        raise HTTPException(status_code=400, detail="interval_days must be positive")
+    calendar = _preventive(db)
+    db.merge(models.PreventiveRuleModel(asset_type=asset_type, interval_days=interval_days))
+    db.commit()
+    moved = calendar.set_rule(asset_type, interval_days)
+    return {"asset_type": asset_type, "interval_days": interval_days, "assets_rescheduled": moved}
+
+# --- ROSTER ROUTES ---
+@app.post("/roster")
+def generate_roster(data: dict, db: Session = Depends(get_db)):
+    """Roster every engineer for the coming weeks; replaces any roster from ``start`` on."""
+    try:
+        weeks = int(data.get("weeks", 4))
+        max_shifts = int(data.get("max_shifts_per_week", 5))
+        # Shift datetimes are stored on the scheduler's UTC clock
+        start = datetime.date.fromisoformat(data["start"]) if data.get("start") else datetime.datetime.utcnow().date()
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid roster request: {str(e)}")
+    if not 1 <= weeks <= 12 or not 1 <= max_shifts <= 7:
+        raise HTTPException(status_code=400, detail="weeks must be 1-12 and max_shifts_per_week 1-7")
+    demand = data.get("demand")
+    if demand is not None and (
+        not isinstance(demand, dict) or set(demand) - set(SHIFTS)
+        or not all(isinstance(per, dict) and all(isinstance(n, int) for n in per.values()) for per in demand.values())
+    ):
+        raise HTTPException(status_code=400, detail=f"demand maps shift ({', '.join(SHIFTS)}) -> cert -> count")
+
+    engineers = db.query(models.EngineerModel).all()
+    if demand is None:
+        demand = forecast_demand(db.query(models.AssetModel).all(), weeks * 7)
+    begin = datetime.datetime.combine(start, datetime.time())
+    # Yesterday's rostered shifts constrain today's
+    previous = {
+        row.engineer_id: row.shift for row in db.query(models.ShiftRosterModel).filter(
+            models.ShiftRosterModel.start >= begin - datetime.timedelta(days=1),
+            models.ShiftRosterModel.start < begin,
+        )
+    }
+    roster = solve_roster(engineers, start, weeks, demand, max_shifts, previous)
+
+    try:
+        db.query(models.ShiftRosterModel).filter(models.ShiftRosterModel.start >= begin).delete(synchronize_session=False)
+        shifts = roster.shifts()
+        if shifts:
+            db.execute(insert(models.ShiftRosterModel), shifts)
+        db.flush()
+        _apply_roster(db, engineers, datetime.datetime.utcnow())
+        summary = roster.summary()
+        record_event(db, "ROSTER_GENERATED", {
+            "severity": "WARNING" if summary["unmet"] else "INFO",
+            "message": (
+                f"Roster from {summary['start']} over {summary['days']} days: {summary['shifts']} shifts "
+                f"({summary['hours']} h) for {summary['engineers']} engineers; "
+                f"{summary['unmet']} of {summary['demand']} required slots unmet."
+            ),
+        })
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database persistence failed: {str(e)}")
+    return {"status": "success", "summary": summary, "shortfall": roster.shortfall()}
+
+@app.get("/roster")
+def get_roster(days: int = 7, engineer_id: Optional[str] = None, db: Session = Depends(get_db)):
+    """Rostered shifts from today over the next ``days`` days."""
+    begin = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    query = db.query(models.ShiftRosterModel).filter(
+        models.ShiftRosterModel.start >= begin,
+        models.ShiftRosterModel.start < begin + datetime.timedelta(days=max(days, 1)),
+    )
+    if engineer_id:
+        query = query.filter(models.ShiftRosterModel.engineer_id == engineer_id)
+    return [
+        {"engineer_id": row.engineer_id, "shift": row.shift, "start": row.start.isoformat(), "end": row.end.isoformat()}
+        for row in query.order_by(models.ShiftRosterModel.start, models.ShiftRosterModel.engineer_id)
+    ]
+
 # --- FINAL UI ADAPTERS ---
 @app.get("/assignments")
 async def get_assignments_for_ui(db: Session = Depends(get_db)):
-    # 1. Fetch only non-completed tasks
+    # 1. Fetch only non-completed tasks (preventive orders not yet scheduled stay on /preventive)
     orders = db.query(models.MaintenanceModel).filter(
-        models.MaintenanceModel.status != "COMPLETED"
+        models.MaintenanceModel.status.notin_(("COMPLETED", PLANNED))
     ).all()
+    rosters = crew_rosters(db, models, [o.order_id for o in orders])
+    members = {eng_id for crew in rosters.values() for eng_id in crew}
+    crew_names = {
+        eng.engineer_id: eng.name for eng in db.query(models.EngineerModel).filter(
+            models.EngineerModel.engineer_id.in_(members)
+        )
+    } if members else {}
     
     ui_formatted_data = []
     for o in orders:
@@ -390,7 +1270,8 @@ async def get_assignments_for_ui(db: Session = Depends(get_db)):
             "start_date": start_iso,
             "duration_hours": max(duration_h, 0.5), # Ensure bar has a minimum width
             "duration_days": duration_h / 24,
-            "type": "CRITICAL" if o.priority >= 4 else "DECAY_REPAIR"
+            "type": "CRITICAL" if o.priority >= 4 else "DECAY_REPAIR",
+            "crew": [crew_names.get(eng_id, "Unknown Engineer") for eng_id in rosters.get(o.order_id, [])]
         })
     
     return ui_formatted_data
@@ -420,8 +1301,30 @@ async def complete_task(order_id: str, db: Session = Depends(get_db)):
         # 3. Update task status
         task.status = "COMPLETED"
         
+        # 3b. An inspection restarts the asset's preventive interval instead of restoring health
+        if is_preventive(order_id):
+            asset.last_inspection = datetime.datetime.now()
+            if preventive.loaded:
+                preventive.inspected(asset.asset_id, asset.last_inspection)
+            record_event(db, "INSPECTION_COMPLETE", {
+                "asset_id": asset.asset_id,
+                "engineer_id": executing_engineer,
+                "severity": "SUCCESS",
+                "message": f"INSPECTED: Asset {asset.asset_id} inspected by {executing_engineer}.",
+            })
+            db.commit()
+            return {"status": "success", "message": f"Asset {asset.asset_id} inspection recorded."}
+
         # 4. RESTORE ASSET HEALTH TO 100%
         asset.health_score = 100.0
+        log_readings(db, [asset.asset_id], [asset.health_score])
+        _rekey_backlog(db, asset)
+
+        # 4b. Incremental plan: free the slot and pull the engineer's later work forward
+        if planner is not None:
+            _apply_planner_changes(db, planner.on_order_completed(order_id))
+            planner.on_health(asset.asset_id, asset.health_score)
+            _planner_synced(db)
         
         # 5. ENHANCED LOGGING: Pass specific IDs for the Audit Log columns
         record_event(db, "REPAIR_COMPLETE", {
@@ -443,6 +1346,40 @@ async def complete_task(order_id: str, db: Session = Depends(get_db)):
         print(f"[ERROR] Completion protocol failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to persist recovery state.")
 
+@app.get("/overrides")
+def get_active_overrides(db: Session = Depends(get_db)):
+    """Unexpired compliance overrides, folded from the event log."""
+    overrides.refresh(db)
+    return [
+        {
+            "override_id": o.override_id,
+            "constraint": o.constraint,
+            "target_id": o.target_id,
+            "approved_by": o.approved_by,
+            "expires_at": o.expires_at.isoformat()
+        }
+        for o in overrides.active()
+    ]
+
+@app.post("/overrides")
+async def create_override(data: dict, db: Session = Depends(get_db)):
+    try:
+        override_id = approve_override(
+            db,
+            constraint=data.get("constraint", "FATIGUE_LIMIT"),
+            target_id=data.get("target_id"),
+            justification=data.get("justification", ""),
+            approved_by=data.get("approved_by"),
+            role=data.get("role"),
+            expires_at=datetime.datetime.fromisoformat(data.get("expires_at")),
+            registry=overrides
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid override: {str(e)}")
+    return {"message": "Override Approved", "override_id": override_id}
+
 @app.get("/audit")
 async def get_audit_log(db: Session = Depends(get_db)):
     """Returns formatted logs for the Incident/Audit Log panel with full traceability."""
@@ -487,4 +1424,23 @@ def record_event(db, event_type, details):
         })
     )
     db.add(new_event)
-    # Note: db.commit() is usually handled by the calling route
\ No newline at end of file
+    # Note: db.commit() is usually handled by the calling route
+
+def record_events(db, event_type, details_list):
+    """``record_event`` for many entries at once: one INSERT executed over all rows (caller commits)."""
+    now = datetime.datetime.now()
+    rows = [
+        {
+            "created_at": now,
+            "event_type": event_type,
+            "payload": json.dumps({
+                "engineer_id": details.get("engineer_id", "-"),
+                "asset_id": details.get("asset_id", "-"),
+                "severity": details.get("severity", "INFO"),
+                "message": details.get("message", "System automated event")
+            }),
+        }
+        for details in details_list
+    ]
+    if rows:
+        db.execute(insert(models.EventLogModel), rows)
\ No newline at end of file
@@ -0,0 +1 @@
+"""Synthetic plants and performance benchmarks for the orchestrator."""
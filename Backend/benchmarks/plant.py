@@ -0,0 +1,162 @@
+"""Deterministic synthetic plants for benchmarks and load tests.
+
+``generate`` draws a whole plant from one seed with NumPy: certifications
+follow a Zipf-like popularity curve, health scores a Beta distribution
+(so the share of assets under the scheduler's 50% threshold is tunable),
+and skills a clipped normal.  The result is plain row dicts that can be
+bulk-inserted into ``AssetModel``/``EngineerModel``/``MaintenanceModel``
+with ``write_to_db`` or turned into ``run_orchestration`` inputs with
+``in_memory``.
+"""
+import datetime
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+
+from domain.maintenance import MaintenanceOrder
+from Persistence import models
+
+ASSET_TYPES = ["Gas Turbine", "Cobot Arm", "Logic Controller", "Hydraulic Press", "Transformer"]
+TEAMS = ["Power Systems", "Automation Unit", "Nexus Safety", "Field Operations"]
+SHIFTS = ["Day", "Swing", "Night"]
+
+
+@dataclass
+class PlantSpec:
+    n_assets: int
+    n_engineers: int = 0                          # 0 = one engineer per 10 assets
+    n_certs: int = 8
+    certs_per_asset: Tuple[int, int] = (0, 2)     # inclusive range
+    certs_per_engineer: Tuple[int, int] = (1, 3)
+    cert_skew: float = 1.0                        # Zipf exponent; 0 = uniform popularity
+    health_beta: Tuple[float, float] = (2.0, 1.2)  # Beta(a, b) * 100
+    skill_mean: float = 6.0
+    skill_spread: float = 2.0
+    max_fatigue: float = 30.0
+    shift_weights: Tuple[float, float, float] = (0.5, 0.3, 0.2)
+    open_order_fraction: float = 0.1              # critical assets that already have an ASSIGNED order
+    seed: int = 0
+
+
+@dataclass
+class SyntheticPlant:
+    spec: PlantSpec
+    assets: List[Dict] = field(default_factory=list)
+    engineers: List[Dict] = field(default_factory=list)
+    orders: List[Dict] = field(default_factory=list)
+
+
+def _pick_certs(rng, certs: List[str], skew: float, rows: int, bounds: Tuple[int, int]) -> List[List[str]]:
+    """Per row, a weighted sample without replacement (Gumbel top-k over every row at once)."""
+    low, high = bounds
+    high = min(high, len(certs))
+    if rows == 0 or high == 0:
+        return [[] for _ in range(rows)]
+    weights = 1.0 / np.arange(1, len(certs) + 1) ** skew
+    keys = np.log(weights) + rng.gumbel(size=(rows, len(certs)))
+    ranked = np.argsort(-keys, axis=1)[:, :high].tolist()
+    counts = rng.integers(low, high + 1, size=rows).tolist()
+    return [[certs[k] for k in row[:count]] for row, count in zip(ranked, counts)]
+
+
+def generate(spec: PlantSpec) -> SyntheticPlant:
+    rng = np.random.default_rng(spec.seed)
+    n_engineers = spec.n_engineers or max(1, spec.n_assets // 10)
+    certs = [f"CERT-{k:02d}" for k in range(spec.n_certs)]
+    plant = SyntheticPlant(spec)
+
+    # 1. Assets
+    health = np.round(rng.beta(*spec.health_beta, size=spec.n_assets) * 100.0, 1)
+    risk = rng.integers(1, 6, size=spec.n_assets).tolist()
+    asset_types = rng.integers(0, len(ASSET_TYPES), size=spec.n_assets).tolist()
+    teams = rng.integers(0, len(TEAMS), size=spec.n_assets).tolist()
+    health_values = health.tolist()
+    asset_certs = _pick_certs(rng, certs, spec.cert_skew, spec.n_assets, spec.certs_per_asset)
+    plant.assets = [
+        {
+            "asset_id": f"SYN-A{i:07d}",
+            "asset_type": ASSET_TYPES[asset_types[i]],
+            "model_class": "Synthetic",
+            "serial_key": f"SN-{spec.seed}-{i}",
+            "health_score": health_values[i],
+            "risk_level": risk[i],
+            "responsible_teams": [TEAMS[teams[i]]],
+            "required_certifications": asset_certs[i],
+        }
+        for i in range(spec.n_assets)
+    ]
+
+    # 2. Engineers
+    skills = np.clip(np.rint(rng.normal(spec.skill_mean, spec.skill_spread, size=(n_engineers, 2))), 1, 10)
+    skills = skills.astype(int).tolist()
+    fatigue = np.round(rng.uniform(0.0, spec.max_fatigue, size=n_engineers), 1).tolist()
+    weights = np.array(spec.shift_weights, dtype=float)
+    shifts = rng.choice(len(SHIFTS), size=n_engineers, p=weights / weights.sum()).tolist()
+    engineer_certs = _pick_certs(rng, certs, spec.cert_skew, n_engineers, spec.certs_per_engineer)
+    plant.engineers = [
+        {
+            "engineer_id": f"SYN-E{i:06d}",
+            "name": f"Synthetic Engineer {i}",
+            "team": TEAMS[i % len(TEAMS)],
+            "certifications": engineer_certs[i],
+            "skill_matrix": {"repairSpeed": skills[i][0], "diagnostics": skills[i][1]},
+            "availability": SHIFTS[shifts[i]],
+            "hours_worked_yesterday": 0.0,
+            "fatigue": fatigue[i],
+        }
+        for i in range(n_engineers)
+    ]
+
+    # 3. Some critical assets are already being worked on
+    critical = np.flatnonzero(health < 50.0)
+    taken = critical[rng.random(critical.size) < spec.open_order_fraction]
+    owners = rng.integers(0, n_engineers, size=taken.size)
+    base = datetime.datetime(2026, 1, 5, 6, 0)
+    plant.orders = [
+        {
+            "order_id": f"SYN-O{i:07d}",
+            "asset_id": plant.assets[i]["asset_id"],
+            "assigned_engineer_id": plant.engineers[owner]["engineer_id"],
+            "status": "ASSIGNED",
+            "priority": 3,
+            "scheduled_date": base + datetime.timedelta(hours=int(k % 8)),
+            "end_time": base + datetime.timedelta(hours=int(k % 8) + 2),
+        }
+        for k, (i, owner) in enumerate(zip(taken.tolist(), owners.tolist()))
+    ]
+    return plant
+
+
+def in_memory(plant: SyntheticPlant):
+    """(assets, orders, engineers) for ``run_orchestration``: one order per uncovered critical asset."""
+    assets = [SimpleNamespace(**row) for row in plant.assets]
+    engineers = [SimpleNamespace(**row) for row in plant.engineers]
+    covered = {row["asset_id"] for row in plant.orders}
+    orders = [
+        MaintenanceOrder(
+            order_id=f"SYN-N{i:07d}",
+            asset_id=a.asset_id,
+            required_certifications=set(a.required_certifications),
+            task_type="Emergency Repair",
+            base_time_minutes=120,
+            task_difficulty=1.5
+        )
+        for i, a in enumerate(assets)
+        if a.health_score < 50.0 and a.asset_id not in covered
+    ]
+    return assets, orders, engineers
+
+
+def write_to_db(plant: SyntheticPlant, db, batch_size: int = 10000) -> None:
+    """Bulk-insert the plant (executemany batches, one commit)."""
+    for model, rows in (
+        (models.AssetModel, plant.assets),
+        (models.EngineerModel, plant.engineers),
+        (models.MaintenanceModel, plant.orders),
+    ):
+        for start in range(0, len(rows), batch_size):
+            db.execute(insert(model), rows[start:start + batch_size])
+    db.commit()
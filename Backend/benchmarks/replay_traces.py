@@ -0,0 +1,122 @@
+"""Replay captured /schedule traces against any strategy.
+
+Run from Backend/:
+
+    python -m benchmarks.replay_traces traces/
+    python -m benchmarks.replay_traces traces/ --strategy min_cost --repeat 3
+
+Each trace (see ``Services.schedule_trace``) is rebuilt fresh per run and
+handed to the strategy.  The report gives latency percentiles, throughput
+in orders per second and, per trace, the decisions that differ from the
+ones recorded in production: orders assigned to a different engineer or
+start time, and orders placed on only one side.  Exits non-zero with
+``--fail-on-diff`` when any decision changed.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from Services.anytime import run_anytime
+from Services.assignment_solver import solve_min_cost
+from Services.orchestrator import run_orchestration
+from Services.partitioning import run_partitioned
+from Services.schedule_trace import read_trace, replay_inputs
+
+STRATEGIES: Dict[str, Callable] = {
+    "greedy": lambda a, o, e, c: run_orchestration(a, o, e, c),
+    "partitioned": lambda a, o, e, c: run_partitioned(a, o, e, c),
+    "min_cost": lambda a, o, e, c: solve_min_cost(a, o, e, c)[0],
+    "anytime": lambda a, o, e, c: run_anytime(a, o, e, c)[0],
+}
+
+
+def decision_diff(recorded: List[Dict], replayed: List[Dict]) -> List[Dict]:
+    """Orders whose engineer or start time changed, or that only one run placed."""
+    before = {a["order_id"]: a for a in recorded}
+    after = {a["order_id"]: a for a in replayed}
+    diffs = []
+    for order_id in sorted(before.keys() | after.keys()):
+        old, new = before.get(order_id), after.get(order_id)
+        if old is None or new is None:
+            diffs.append({"order_id": order_id, "recorded": old and old["engineer_id"], "replayed": new and new["engineer_id"]})
+        elif (old["engineer_id"], old["start_time"]) != (new["engineer_id"], new["start_time"]):
+            diffs.append({
+                "order_id": order_id,
+                "recorded": f"{old['engineer_id']} @ {old['start_time']}",
+                "replayed": f"{new['engineer_id']} @ {new['start_time']}",
+            })
+    return diffs
+
+
+def replay(paths: List[str], strategy: str = "greedy", repeat: int = 1) -> Dict:
+    solve = STRATEGIES[strategy]
+    latencies: List[float] = []
+    orders_done = 0
+    per_trace = []
+    for path in paths:
+        trace = read_trace(path)
+        replayed: List[Dict] = []
+        for _ in range(repeat):
+            assets, orders, engineers, calendar = replay_inputs(trace)
+            with contextlib.redirect_stdout(io.StringIO()):
+                began = time.perf_counter()
+                replayed = solve(assets, orders, engineers, calendar)
+                latencies.append(time.perf_counter() - began)
+            orders_done += len(orders)
+        per_trace.append({
+            "trace": os.path.basename(path),
+            "orders": len(trace["orders"]),
+            "recorded_ms": trace.get("elapsed_ms"),
+            "diffs": decision_diff(trace.get("allocations", []), replayed),
+        })
+
+    seconds = np.array(latencies) if latencies else np.zeros(1)
+    p50, p90, p99 = np.percentile(seconds * 1000.0, [50, 90, 99]).tolist()
+    return {
+        "strategy": strategy,
+        "runs": len(latencies),
+        "p50_ms": round(p50, 3),
+        "p90_ms": round(p90, 3),
+        "p99_ms": round(p99, 3),
+        "orders_per_second": round(orders_done / seconds.sum(), 1) if seconds.sum() > 0 else 0.0,
+        "traces": per_trace,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="directory of schedule-*.json.gz traces")
+    parser.add_argument("--strategy", default="greedy", choices=sorted(STRATEGIES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per trace")
+    parser.add_argument("--show", type=int, default=5, help="differences listed per trace")
+    parser.add_argument("--fail-on-diff", action="store_true")
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.directory, "*.json.gz")))
+    if not paths:
+        print(f"No traces found in {args.directory}")
+        return 1
+
+    report = replay(paths, args.strategy, max(args.repeat, 1))
+    print(f"{report['strategy']}: {report['runs']} runs over {len(paths)} traces")
+    print(f"  latency p50 {report['p50_ms']:.2f}ms  p90 {report['p90_ms']:.2f}ms  p99 {report['p99_ms']:.2f}ms")
+    print(f"  throughput {report['orders_per_second']:.1f} orders/s")
+    changed = 0
+    for entry in report["traces"]:
+        recorded = f"{entry['recorded_ms']:.2f}ms" if entry["recorded_ms"] is not None else "-"
+        print(f"  {entry['trace']:<48} {entry['orders']:>7} orders  recorded {recorded:>10}  {len(entry['diffs'])} diffs")
+        for diff in entry["diffs"][:args.show]:
+            print(f"      {diff['order_id']}: {diff['recorded']} -> {diff['replayed']}")
+        changed += bool(entry["diffs"])
+    return 1 if args.fail_on_diff and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Orchestrator benchmark suite with stored baselines.
+
+Run from Backend/:
+
+    python -m benchmarks.run_benchmarks --sizes 1k,10k
+    python -m benchmarks.run_benchmarks --sizes 1k,10k,100k,1M --update
+
+Each case is timed on a synthetic plant (best of ``--repeat`` runs) and
+compared with ``baselines.json``.  Anything slower than its baseline by
+more than the tolerance is a regression and the run exits non-zero.
+Baselines are machine specific: refresh them with ``--update`` on the
+machine that runs the suite.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.plant import PlantSpec, generate, in_memory, write_to_db
+from Persistence.database import Base
+from Services.orchestrator import run_orchestration
+from Services.override_registry import OverrideRegistry
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_TOLERANCE = 0.5   # fail when more than 50% slower than the baseline
+CASES = ("orchestrator", "schedule", "readiness")
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def _best_of(repeat: int, setup: Callable, run: Callable) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            began = time.perf_counter()
+            run(state)
+            best = min(best, time.perf_counter() - began)
+    return best
+
+
+class _Database:
+    """A throwaway SQLite file holding one synthetic plant, served to the app via get_db."""
+
+    def __init__(self, plant):
+        self.dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{self.dir.name}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        db = self.Session()
+        try:
+            write_to_db(plant, db)
+        finally:
+            db.close()
+
+    def client(self):
+        from fastapi.testclient import TestClient
+        import app as api
+
+        def get_db():
+            db = self.Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        api.app.dependency_overrides[api.get_db] = get_db
+        # The app's in-memory mirrors belong to whichever database loaded them first
+        api.planner = None
+        api.overrides = OverrideRegistry()
+        for mirror in (api.backlog, api.impact_graph, api.preventive):
+            mirror.loaded = False
+        api.schedule_cache.clear()
+        return TestClient(api.app)
+
+    def close(self) -> None:
+        self.engine.dispose()
+        self.dir.cleanup()
+
+
+def bench_orchestrator(plant, repeat: int) -> float:
+    return _best_of(repeat, lambda: in_memory(plant), lambda inputs: run_orchestration(*inputs))
+
+
+def bench_schedule(plant, repeat: int) -> float:
+    """POST /schedule end to end: scan, orchestration and persistence, on a fresh database each run."""
+    databases: List[_Database] = []
+
+    def setup():
+        databases.append(_Database(plant))
+        return databases[-1].client()
+
+    def run(client):
+        response = client.post("/schedule", params={"refresh": "true"})   # time a real run, never a cache hit
+        assert response.status_code == 200, response.text
+
+    try:
+        return _best_of(repeat, setup, run)
+    finally:
+        for database in databases:
+            database.close()
+
+
+def bench_readiness(plant, repeat: int) -> float:
+    database = _Database(plant)
+    try:
+        client = database.client()
+
+        def run(_):
+            response = client.get("/analysis/readiness")
+            assert response.status_code == 200, response.text
+
+        return _best_of(repeat, lambda: None, run)
+    finally:
+        database.close()
+
+
+BENCHMARKS = {
+    "orchestrator": bench_orchestrator,
+    "schedule": bench_schedule,
+    "readiness": bench_readiness,
+}
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict:
+    if not os.path.exists(path):
+        return {"tolerance": DEFAULT_TOLERANCE, "results": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, float], baselines: Dict) -> List[str]:
+    """Names of the cases that regressed past the tolerance."""
+    tolerance = baselines.get("tolerance", DEFAULT_TOLERANCE)
+    known = baselines.get("results", {})
+    return [
+        key for key, seconds in results.items()
+        if key in known and seconds > known[key] * (1.0 + tolerance)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k", help="asset counts, e.g. 1k,10k,100k,1M")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"subset of {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--update", action="store_true", help="store these timings as the new baselines")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines(args.baselines)
+    results: Dict[str, float] = {}
+    for size in [parse_size(s) for s in args.sizes.split(",")]:
+        plant = generate(PlantSpec(n_assets=size, seed=args.seed))
+        # Big plants are slow enough that one run is stable
+        repeat = args.repeat if size < 100_000 else 1
+        for case in args.cases.split(","):
+            key = f"{case}@{size}"
+            results[key] = BENCHMARKS[case](plant, repeat)
+            baseline = baselines.get("results", {}).get(key)
+            ratio = f"{results[key] / baseline:6.2f}x" if baseline else "   new"
+            print(f"{key:<24} {results[key]:10.4f}s  {ratio}")
+
+    if args.update:
+        baselines.setdefault("results", {}).update({k: round(v, 4) for k, v in results.items()})
+        baselines.setdefault("tolerance", DEFAULT_TOLERANCE)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baselines updated: {args.baselines}")
+        return 0
+
+    regressions = compare(results, baselines)
+    for key in regressions:
+        print(f"REGRESSION: {key} took {results[key]:.4f}s (baseline {baselines['results'][key]:.4f}s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 # empty
-from pydantic import BaseSettings
+from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
 	# Operational constraints and defaults
@@ -8,4 +8,16 @@ class Settings(BaseSettings):
 	scheduling_buffer_minutes: int = 15
 	escalation_threshold_seconds: int = 300
 
+	# Solver process pool for POST /schedule (SCHEDULE_POOL_SIZE, SCHEDULE_QUEUE_DEPTH)
+	schedule_pool_size: int = 2       # 0 = solve in a thread of the web worker instead
+	schedule_queue_depth: int = 8     # runs allowed to wait for a free process
+	schedule_batch_size: int = 1000   # backlog orders a full POST /schedule run takes (SCHEDULE_BATCH_SIZE)
+	schedule_cache_size: int = 32     # memoized full runs kept, least recently used dropped; 0 = off
+	schedule_cache_ttl_seconds: int = 300   # bookings end and shifts turn without a write
+
+	# Health history ring buffers (HEALTH_HISTORY_PATH) and predictive booking in POST /schedule
+	health_history_path: str = "health_history.npz"
+	health_history_save_seconds: int = 300   # checkpoint interval; readings themselves are in health_readings
+	forecast_horizon_hours: int = 48  # book assets forecast to reach 50% health this soon; 0 = off
+
 settings = Settings()
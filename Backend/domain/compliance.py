@@ -1,12 +1,32 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
 MAX_SHIFT_HOURS = 8
 MANDATORY_REST_HOURS = 11
 FATIGUE_LIMIT_HOURS = 7
 
+# Shift windows in minutes since midnight; overnight shifts end past 1440
+SHIFT_WINDOWS = {
+    "Day": (6 * 60, 6 * 60 + MAX_SHIFT_HOURS * 60),
+    "Swing": (14 * 60, 14 * 60 + MAX_SHIFT_HOURS * 60),
+    "Night": (22 * 60, 22 * 60 + MAX_SHIFT_HOURS * 60),
+}
+
 
 def within_shift_window(engineer, task_start_minute) -> bool:
     return engineer.shift_start <= task_start_minute < engineer.shift_end
 
 
+def shift_window(engineer) -> tuple:
+    """(start, end) of the engineer's shift, from explicit minutes or their availability label."""
+    start = getattr(engineer, "shift_start", None)
+    end = getattr(engineer, "shift_end", None)
+    if start is not None and end is not None:
+        return (start, end if end > start else end + 24 * 60)
+    label = getattr(engineer, "availability", None) or "Day"
+    return SHIFT_WINDOWS.get(label, SHIFT_WINDOWS["Day"])
+
+
 def exceeds_max_shift(engineer) -> bool:
     return engineer.hours_worked_today >= MAX_SHIFT_HOURS
 
@@ -23,24 +43,20 @@ def fatigue_compliant(engineer) -> bool:
     return engineer.hours_worked_today < FATIGUE_LIMIT_HOURS
 
 
-def legally_available(engineer, task_start_minute) -> bool:
-    return all([
-        within_shift_window(engineer, task_start_minute),
-        has_mandatory_rest(engineer),
-        not exceeds_max_shift(engineer),
-        fatigue_compliant(engineer),
-    ])
-
-
-from datetime import datetime
-
-
 def legally_available(
     engineer,
     task_start_minute,
-    active_overrides: list,
-    now: datetime
+    active_overrides: Iterable = (),
+    now: Optional[datetime] = None
 ) -> bool:
+    now = now or datetime.utcnow()
+
+    # An OverrideRegistry answers with one hash probe instead of a scan
+    lookup = getattr(active_overrides, "lookup", None)
+    if lookup is not None:
+        if lookup("FATIGUE_LIMIT", engineer.engineer_id, now) is not None:
+            return True  # explicitly allowed
+        active_overrides = ()
 
     for override in active_overrides:
         if (
@@ -0,0 +1,34 @@
+import copy
+
+from Services.anytime import run_anytime
+from Services.assignment_solver import plan_cost
+from Services.orchestrator import run_orchestration
+from test_matching import Asset, Eng, Order, build_plant
+
+
+def test_anytime_never_loses_to_greedy_and_reports_its_gains():
+    for seed in range(3):
+        assets, orders, engineers = build_plant(seed, n_assets=80, n_engineers=12)
+        initial = {e.engineer_id: e.fatigue for e in engineers}
+        greedy_engineers = copy.deepcopy(engineers)
+        greedy = run_orchestration(assets, orders, greedy_engineers)
+        greedy_cost = plan_cost(assets, orders, engineers, greedy, initial)
+
+        allocations, cost, report = run_anytime(assets, orders, engineers, deadline_ms=500)
+        assert abs(report["baseline_cost"] - round(greedy_cost, 2)) < 1e-6
+        assert cost <= greedy_cost + 1e-9
+        assert abs(plan_cost(assets, orders, copy.deepcopy(engineers), allocations, initial) - cost) < 1e-6
+        assert abs(greedy_cost - sum(i["gain"] for i in report["improvements"]) - cost) < 0.05
+        assert report["winner"] == (report["improvements"][-1]["strategy"] if report["improvements"] else "greedy")
+
+
+def test_local_search_frees_the_only_specialist():
+    assets = [Asset("A1", ["ELECT"], health_score=10, risk_level=5),
+              Asset("A2", ["HYDRA"], health_score=40, risk_level=2)]
+    orders = [Order("O1", "A1"), Order("O2", "A2")]
+    engineers = [Eng("E1", "Generalist", ["ELECT", "HYDRA"], 0.0), Eng("E2", "Sparky", ["ELECT"], 5.0)]
+
+    allocations, _, report = run_anytime(assets, orders, engineers, deadline_ms=1000)
+    assert {a["order_id"]: a["engineer_id"] for a in allocations} == {"O1": "E2", "O2": "E1"}
+    assert report["winner"] != "greedy"
+    assert engineers[1].fatigue > 5.0
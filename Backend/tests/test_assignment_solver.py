@@ -0,0 +1,55 @@
+import copy
+import itertools
+import random
+
+from Services.assignment_solver import assignment_cost, plan_cost, solve_min_cost
+from Services.orchestrator import calculate_actual_duration, run_orchestration
+from test_matching import Asset, Eng, Order, build_plant
+
+
+def brute_force_cost(assets, orders, engineers):
+    asset_map = {a.asset_id: a for a in assets}
+    best = float("inf")
+    for perm in itertools.permutations(range(len(engineers)), len(orders)):
+        cost = 0.0
+        for order, pos in zip(orders, perm):
+            eng = engineers[pos]
+            required = asset_map[order.asset_id].required_certifications or []
+            qualified = all(c in (eng.certifications or []) for c in required)
+            duration = calculate_actual_duration(eng, order.task_type, 120, 1.5)
+            cost += assignment_cost(eng.fatigue, duration, qualified)
+        best = min(best, cost)
+    return best
+
+
+def test_single_wave_is_optimal():
+    for seed in range(40):
+        rng = random.Random(seed)
+        assets, orders, engineers = build_plant(seed, n_assets=rng.randint(1, 4), n_engineers=5)
+        for e in engineers:
+            e.fatigue = rng.choice([0.0, 5.0, 30.0, 60.0])
+        expected = brute_force_cost(assets, orders, engineers)
+
+        initial = {e.engineer_id: e.fatigue for e in engineers}
+        allocations, total = solve_min_cost(assets, orders, copy.deepcopy(engineers))
+        assert abs(total - expected) < 1e-6
+        assert abs(plan_cost(assets, orders, engineers, allocations, initial) - total) < 1e-6
+
+
+def test_min_cost_keeps_the_only_specialist_for_the_later_order():
+    assets = [Asset("A1", ["ELECT"], health_score=10, risk_level=5),
+              Asset("A2", ["HYDRA"], health_score=40, risk_level=2)]
+    orders = [Order("O1", "A1"), Order("O2", "A2")]
+
+    def crew():
+        return [Eng("E1", "Generalist", ["ELECT", "HYDRA"], 0.0),
+                Eng("E2", "Sparky", ["ELECT"], 5.0)]
+
+    initial = {"E1": 0.0, "E2": 5.0}
+    greedy_engineers = crew()
+    greedy = run_orchestration(assets, orders, greedy_engineers)
+    greedy_cost = plan_cost(assets, orders, greedy_engineers, greedy, initial)
+
+    allocations, total = solve_min_cost(assets, orders, crew())
+    assert {a["order_id"]: a["engineer_id"] for a in allocations} == {"O1": "E2", "O2": "E1"}
+    assert total < greedy_cost
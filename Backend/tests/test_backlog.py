@@ -0,0 +1,68 @@
+import datetime
+import random
+from types import SimpleNamespace
+
+from Services.backlog import OrderBacklog, to_order
+from Services.orchestrator import calculate_priority, run_orchestration
+from Services.timeline import ScheduleCalendar
+from test_matching import Asset, Eng
+
+
+def row(order_id, asset_id, priority):
+    return SimpleNamespace(order_id=order_id, asset_id=asset_id, task_type="Emergency Repair", priority=priority)
+
+
+def test_pops_follow_a_full_sort_through_rekeys():
+    rng = random.Random(21)
+    priority = {f"A{i}": rng.uniform(0, 50) for i in range(40)}
+    backlog = OrderBacklog().load(row(f"O{i}", f"A{i % 40}", priority[f"A{i % 40}"]) for i in range(200))
+    arrival = {f"O{i}": i for i in range(200)}
+
+    for _ in range(100):
+        asset_id = rng.choice(sorted(priority))
+        priority[asset_id] = rng.uniform(0, 50)
+        backlog.rekey(asset_id, priority[asset_id])
+    assert len(backlog._heap) <= 2 * len(backlog) + 64   # stale keys get compacted
+
+    taken = backlog.pop(50)
+    expected = sorted(arrival, key=lambda o: (-priority[f"A{int(o[1:]) % 40}"], arrival[o]))
+    assert [e.order_id for e in taken] == expected[:50]
+
+    # Unplaced orders go back to their old place in line
+    backlog.restore(taken[10:])
+    assert [e.order_id for e in backlog.pop(190)] == expected[10:]
+    assert len(backlog) == 0 and backlog.pop(5) == []
+
+
+def test_rekey_touches_only_that_asset():
+    backlog = OrderBacklog().load([row("O1", "A1", 5.0), row("O2", "A2", 3.0), row("O3", "A1", 5.0)])
+    assert sorted(backlog.rekey("A1", 1.0)) == ["O1", "O3"]
+    assert backlog.rekey("A1", 1.0) == [] and backlog.rekey("NONE", 9.0) == []
+    assert [e.order_id for e in backlog.pop(3)] == ["O2", "O1", "O3"]
+
+
+def test_unplaced_orders_survive_the_run():
+    assets = {"A1": Asset("A1", ["ELECT"], health_score=20), "A2": Asset("A2", ["ELECT"], health_score=40)}
+    backlog = OrderBacklog().load([])
+    for n, asset in enumerate(assets.values()):
+        backlog.push(f"O{n}", asset.asset_id, "Emergency Repair", calculate_priority(asset))
+
+    taken = backlog.pop(10)
+    orders = [to_order(entry, assets[entry.asset_id]) for entry in taken]
+    engineers = [Eng("E1", "Tired", ["ELECT"], fatigue=100.0)]
+    calendar = ScheduleCalendar(datetime.datetime(2026, 1, 5, 7, 0))
+    allocations = run_orchestration(list(assets.values()), orders, engineers, calendar)
+
+    placed = {a["order_id"] for a in allocations}
+    backlog.restore(e for e in taken if e.order_id not in placed)
+    assert not placed and [e.order_id for e in backlog.pop(10)] == ["O0", "O1"]
+
+
+def test_a_score_reorders_the_pop_without_rekeying():
+    backlog = OrderBacklog().load([row("O1", "A1", 9.0), row("O2", "A2", 5.0), row("O3", "A3", 5.0), row("O4", "A4", 1.0)])
+    exposure = {"A1": 1.0, "A2": 3.0, "A3": 30.0, "A4": 3.0}
+    taken = backlog.pop(3, lambda e: exposure[e.asset_id])
+    assert [e.order_id for e in taken] == ["O3", "O2", "O4"]
+
+    backlog.restore(taken[1:])
+    assert [e.order_id for e in backlog.pop(5)] == ["O1", "O2", "O4"]
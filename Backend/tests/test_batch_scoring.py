@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from Services.batch_scoring import (
+    asset_arrays, duration_matrix, order_priorities, priorities, risk_scores, skill_matrix,
+)
+from Services.orchestrator import calculate_actual_duration, calculate_priority
+from domain.asset import RiskLevel
+from domain.risk import risk_score
+from test_matching import Asset, Eng, Order
+
+
+def test_vectorized_scores_match_scalar_helpers():
+    rng = random.Random(7)
+    assets = [Asset(f"A{i}", health_score=rng.choice([0, 0.5, 1, 17.3, 49.9, 100, rng.uniform(0, 100)]),
+                    risk_level=rng.choice([1, 2.5, 3, 5])) for i in range(500)]
+    health, risk = asset_arrays(assets)
+    assert priorities(health, risk).tolist() == [calculate_priority(a) for a in assets]
+
+    orders = [Order(f"O{i}", rng.choice(["A1", "A2", "missing"])) for i in range(20)]
+    asset_map = {a.asset_id: a for a in assets}
+    expected = [calculate_priority(asset_map.get(o.asset_id)) for o in orders]
+    assert order_priorities(orders, asset_map).tolist() == expected
+
+    levels = [rng.choice(list(RiskLevel)) for _ in range(200)]
+    fractions = [rng.random() for _ in range(200)]
+    assert risk_scores(levels, np.array(fractions)).tolist() == [
+        risk_score(level, h) for level, h in zip(levels, fractions)
+    ]
+
+
+def test_duration_matrix_matches_calculate_actual_duration():
+    rng = random.Random(3)
+    engineers = [Eng(f"E{i}", "n", skill_matrix=rng.choice([
+        None, {}, {"repairSpeed": rng.randint(0, 10)}, {"diagnostics": rng.uniform(0, 12), "repairSpeed": "7"},
+    ])) for i in range(60)]
+    orders = [Order(f"O{i}", "A", rng.choice(["Repair", "Emergency Repair", "Inspection"])) for i in range(40)]
+
+    matrix = duration_matrix(skill_matrix(engineers), orders)
+    assert matrix.shape == (60, 40)
+    for i, e in enumerate(engineers):
+        for j, o in enumerate(orders):
+            assert matrix[i, j] == calculate_actual_duration(e, o.task_type, 120, 1.5)
@@ -0,0 +1,72 @@
+import datetime
+import random
+
+from Services.compliance_engine import AvailabilityMatrix
+from domain.compliance import legally_available
+from domain.override import Override
+
+START = datetime.datetime(2026, 3, 2, 0, 0)
+
+
+class Eng:
+    def __init__(self, engineer_id, shift_start, shift_end, worked, last_end, certs):
+        self.engineer_id = engineer_id
+        self.shift_start = shift_start
+        self.shift_end = shift_end
+        self.hours_worked_today = worked
+        self.last_shift_end = last_end
+        self.certifications = certs
+
+
+def roster(rng, count):
+    engineers = []
+    for i in range(count):
+        start = rng.choice([0, 6 * 60, 9 * 60, 14 * 60])
+        engineers.append(Eng(
+            f"E{i}", start, start + rng.choice([4, 8, 10]) * 60,
+            rng.choice([0, 3, 6.5, 7, 9]),
+            rng.choice([None, start - 12 * 60, start - 8 * 60]),
+            rng.sample(["ELEC", "HYD", "HV"], rng.randint(0, 2)),
+        ))
+    return engineers
+
+
+def test_first_day_matches_scalar_rules():
+    rng = random.Random(9)
+    for seed in range(10):
+        engineers = roster(rng, 40)
+        overrides = [
+            Override("OV-1", "FATIGUE_LIMIT", engineers[0].engineer_id, "storm", "ops", START + datetime.timedelta(hours=30)),
+            Override("OV-2", "FATIGUE_LIMIT", engineers[1].engineer_id, "storm", "ops", START - datetime.timedelta(hours=1)),
+        ]
+        matrix = AvailabilityMatrix(engineers, START, days=2, slot_minutes=15, overrides=overrides, now=START)
+        for slot in range(24 * 4):
+            minute = slot * 15
+            expected = {
+                e.engineer_id for e in engineers
+                if legally_available(e, minute, overrides, now=START)
+            }
+            assert set(matrix.engineers(matrix.available(slot))) == expected
+            assert matrix.count(slot) == len(expected)
+
+
+def test_later_days_and_overrides():
+    tired = Eng("E0", 6 * 60, 14 * 60, 9, None, ["ELEC"])
+    fresh = Eng("E1", 6 * 60, 14 * 60, 0, None, ["ELEC", "HV"])
+    expiry = START + datetime.timedelta(hours=20)
+    override = Override("OV-1", "FATIGUE_LIMIT", "E1", "storm", "ops", expiry)
+    matrix = AvailabilityMatrix([tired, fresh], START, days=3, slot_minutes=60, overrides=[override], now=START)
+
+    assert matrix.engineers(matrix.available(3)) == ["E1"]            # override outside the shift
+    assert matrix.engineers(matrix.available(22)) == []               # override expired
+    assert matrix.engineers(matrix.available(24 + 7)) == ["E0", "E1"]  # tomorrow's shift starts fresh
+    assert matrix.engineers(matrix.available(24 + 7, ["HV"])) == ["E1"]
+    assert matrix.free_through(24 + 6, 24 + 14) == 0b11
+    assert matrix.free_through(24 + 6, 24 + 15) == 0
+    assert matrix.counts(["ELEC"]).tolist()[24 + 6:24 + 15] == [2] * 8 + [0]
+
+
+def test_overnight_shift_wraps_midnight():
+    night = Eng("N", 22 * 60, 6 * 60, 0, None, [])
+    matrix = AvailabilityMatrix([night], START, days=1, slot_minutes=60)
+    assert [matrix.count(slot) for slot in range(24)] == [1] * 6 + [0] * 16 + [1] * 2
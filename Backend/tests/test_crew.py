@@ -0,0 +1,109 @@
+import datetime
+import itertools
+import math
+import random
+import time
+
+from Services.assignment_solver import FALLBACK_PENALTY, plan_cost
+from Services.crew import cover
+from Services.incremental_planner import IncrementalPlanner
+from Services.matching import EngineerIndex
+from Services.orchestrator import run_orchestration
+from Services.timeline import ScheduleCalendar
+from test_matching import Asset, Eng, Order
+
+NOW = datetime.datetime(2026, 1, 5, 7, 0)
+
+
+def brute_force(required, options, max_size=4):
+    for size in range(1, max_size + 1):
+        crews = [
+            crew for crew in itertools.combinations(options, size)
+            if required & ~sum_masks(crew) == 0
+        ]
+        if crews:
+            return min(math.fsum(o[1] for o in crew) for crew in crews), size
+    return None
+
+
+def sum_masks(crew):
+    held = 0
+    for mask, _, _ in crew:
+        held |= mask
+    return held
+
+
+def test_cover_is_minimal_size_then_minimal_fatigue():
+    rng = random.Random(16)
+    for _ in range(200):
+        n_certs = rng.randint(5, 12)
+        required = sum(1 << b for b in rng.sample(range(n_certs), rng.randint(2, 5)))
+        options = [
+            (sum(1 << b for b in rng.sample(range(n_certs), rng.randint(0, 3))), rng.choice([0.0, 5.0, 12.5, 40.0]), pos)
+            for pos in range(rng.randint(3, 14))
+        ]
+        found = cover(required, options)
+        expected = brute_force(required, options)
+        if expected is None:
+            assert found is None
+            continue
+        crew = [options[pos] for pos in found]
+        assert required & ~sum_masks(crew) == 0
+        assert (math.fsum(o[1] for o in crew), len(crew)) == expected
+
+
+def test_index_crew_scales_to_large_rosters():
+    rng = random.Random(3)
+    certs = [f"C{i}" for i in range(300)]
+    engineers = [
+        Eng(f"E{i}", f"Eng {i}", rng.sample(certs, rng.randint(1, 6)), fatigue=rng.uniform(0, 120))
+        for i in range(5000)
+    ]
+    index = EngineerIndex(engineers)
+    required = rng.sample(certs, 5)
+
+    began = time.perf_counter()
+    crew = index.crew(required)
+    assert time.perf_counter() - began < 1.0
+    assert crew and set(required) <= {c for e in crew for c in e.certifications}
+    assert all(e.fatigue < 100.0 for e in crew)
+    assert index.crew(["NOBODY", required[0]]) is None
+
+
+def test_crew_replaces_fallback_and_shares_one_slot():
+    assets = [Asset("A1", ["ELECT", "HYDRA"])]
+    orders = [Order("O1", "A1")]
+    engineers = [
+        Eng("E1", "Volt", ["ELECT"], fatigue=10.0),
+        Eng("E2", "Pipe", ["HYDRA"], fatigue=5.0),
+        Eng("E3", "Idle", [], fatigue=0.0),
+    ]
+    calendar = ScheduleCalendar(NOW)
+    allocations = run_orchestration(assets, orders, engineers, calendar)
+
+    [alloc] = allocations
+    assert alloc["crew"] == ["E2", "E1"] and alloc["engineer_id"] == "E2"
+    assert calendar.bookings("E1") == calendar.bookings("E2") and len(calendar.bookings("E1")) == 1
+    assert engineers[2].fatigue == 0.0
+    assert plan_cost(assets, orders, engineers, allocations, {"E1": 10.0, "E2": 5.0}) < FALLBACK_PENALTY
+
+
+def test_crew_needs_overlapping_shifts():
+    assets = [Asset("A1", ["ELECT", "HYDRA"])]
+    engineers = [Eng("E1", "Volt", ["ELECT"]), Eng("E2", "Pipe", ["HYDRA"]), Eng("E3", "Idle", [])]
+    engineers[0].availability = "Day"
+    engineers[1].availability = "Night"
+    [alloc] = run_orchestration(assets, [Order("O1", "A1")], engineers, ScheduleCalendar(NOW))
+    assert "crew" not in alloc   # no common slot: the old fallback applies
+
+
+def test_planner_completing_a_crew_order_frees_every_member():
+    assets = [Asset("A1", ["ELECT", "HYDRA"], health_score=10)]
+    engineers = [Eng("E1", "Volt", ["ELECT"]), Eng("E2", "Pipe", ["HYDRA"])]
+    planner = IncrementalPlanner()
+    [alloc] = planner.bootstrap(assets, engineers, [])
+    assert sorted(alloc["crew"]) == ["E1", "E2"] and not planner.fallback
+
+    planner.on_order_completed(alloc["order_id"])
+    assert planner.calendar.bookings("E1") == planner.calendar.bookings("E2") == []
+    assert not any(planner.by_engineer.values())
@@ -0,0 +1,50 @@
+import copy
+
+from Services import decision_trace, partitioning
+from Services.decision_trace import DecisionTrace, OFF
+from Services.orchestrator import run_orchestration
+from Services.timeline import ScheduleCalendar
+from test_partitioning import multi_site_plant
+
+
+def test_ring_buffer_keeps_runs_apart_and_wraps():
+    trace = DecisionTrace(capacity=8)
+    first = trace.begin_run()
+    for i in range(3):
+        trace.record(f"O{i}", f"A{i}", 1.0, 2, "E1", i == 2, 60, 5.0)
+    summary = trace.end_run(first, strategy="greedy")
+    assert summary["orders"] == 3 and summary["fallbacks"] == 1 and summary["booked_minutes"] == 180
+    assert summary["strategy"] == "greedy"
+
+    second = trace.begin_run()
+    for i in range(10):
+        trace.record(f"P{i}", "A", 1.0, 0, None, False, 0, 1.0)
+    summary = trace.end_run(second)
+    assert summary["unassigned"] == summary["records_kept"] == 8 and summary["records_dropped"] == 2
+    assert trace.records(first) == []    # overwritten
+    assert [r["order_id"] for r in trace.run_report(second)["records"]][:2] == ["P2", "P3"]
+
+    trace.set_level(OFF)
+    assert trace.begin_run() is None and trace.end_run(None) is None
+
+
+def test_orchestrator_records_one_decision_per_order(monkeypatch):
+    monkeypatch.setattr(partitioning, "MIN_CHUNK_ORDERS", 50)
+    trace = decision_trace.trace
+    trace.set_level("decisions")
+    for seed, crew, tired, unqualified in ((0, 200, 0.0, 0.0), (2, 200, 100.0, 0.01)):
+        assets, orders, engineers = multi_site_plant(seed, 400, crew, tired, unqualified)
+        now = ScheduleCalendar().now
+
+        run_id = trace.begin_run()
+        allocations = run_orchestration(assets, orders, copy.deepcopy(engineers), ScheduleCalendar(now))
+        summary = trace.end_run(run_id)
+        records = trace.records(run_id)
+        assert summary["orders"] == len(orders) and summary["assigned"] == len(allocations)
+        assert [r[5] for r in records if r[5]] == [a["engineer_id"] for a in allocations]
+
+        # Worker records are adopted in rank order, so the partitioned run traces identically
+        run_id = trace.begin_run()
+        partitioning.run_partitioned(assets, orders, engineers, ScheduleCalendar(now), max_workers=2)
+        assert [r[1:8] for r in trace.records(run_id)] == [r[1:8] for r in records]
+        trace.end_run(run_id)
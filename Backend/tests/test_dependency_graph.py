@@ -0,0 +1,123 @@
+import datetime
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from Services.dependency_graph import DAMPING, ImpactGraph
+from Services.orchestrator import calculate_priority, run_orchestration
+from Services.schedule_trace import capture, replay_inputs
+from Services.timeline import ScheduleCalendar
+from test_matching import Asset, Eng, Order
+
+NOW = datetime.datetime(2026, 1, 5, 7, 0)
+
+
+def plant(n, n_edges, seed):
+    rng = random.Random(seed)
+    assets = [SimpleNamespace(asset_id=f"A{i}", risk_level=rng.randint(1, 5), health_score=rng.uniform(5, 100))
+              for i in range(n)]
+    edges = {}
+    while len(edges) < n_edges:
+        down, up = sorted(rng.sample(range(n), 2))    # upstream has the higher index: no cycles
+        edges[(f"A{up}", f"A{down}")] = rng.choice([0.25, 0.5, 1.0])
+    return rng, assets, edges
+
+
+def fixed_point(assets, edges):
+    """exposure = risk + D * W @ exposure, solved directly."""
+    ids = [a.asset_id for a in assets]
+    pos = {a: i for i, a in enumerate(ids)}
+    w = np.zeros((len(ids), len(ids)))
+    for (up, down), weight in edges.items():
+        w[pos[up], pos[down]] = weight
+    x = np.linalg.solve(np.eye(len(ids)) - DAMPING * w, [a.risk_level for a in assets])
+    return dict(zip(ids, x))
+
+
+def test_no_dependencies_keeps_the_old_priority():
+    _, assets, _ = plant(50, 0, seed=1)
+    graph = ImpactGraph().load(assets, [])
+    assert graph.stakes() == {}
+    assert all(graph.priority(a) == calculate_priority(a) for a in assets)
+
+
+def test_incremental_updates_match_a_rebuild():
+    # Sparse and random, so there are chains and fan-in; edges closing a cycle are refused
+    rng, assets, edges = plant(60, 90, seed=7)
+    graph = ImpactGraph().load(assets, [(u, d, w) for (u, d), w in edges.items()])
+    for step in range(300):
+        move = rng.random()
+        if move < 0.4:
+            asset = rng.choice(assets)
+            asset.risk_level = rng.randint(1, 5)
+            graph.set_risk(asset.asset_id, asset.risk_level)
+        elif move < 0.7 and edges:
+            up, down = rng.choice(sorted(edges))
+            del edges[(up, down)]
+            graph.remove_edge(up, down)
+        else:
+            up, down = rng.sample([a.asset_id for a in assets], 2)
+            if (up, down) in edges or sum(1 for u, _ in edges if u == up) >= 3:
+                continue
+            if graph.closes_cycle(up, down):
+                with pytest.raises(ValueError):
+                    graph.add_edge(up, down)
+                continue
+            edges[(up, down)] = rng.choice([0.25, 0.5, 1.0])
+            graph.add_edge(up, down, edges[(up, down)])
+
+    expected = fixed_point(assets, edges)
+    rebuilt = ImpactGraph().load(assets, [(u, d, w) for (u, d), w in edges.items()])
+    for asset_id, value in expected.items():
+        assert abs(graph.exposure[asset_id] - value) < 1e-6
+        assert abs(rebuilt.exposure[asset_id] - value) < 1e-6
+
+
+def test_a_risk_change_only_reaches_ancestors():
+    assets = [SimpleNamespace(asset_id=a, risk_level=1, health_score=50) for a in ("FEED", "LINE", "PRESS", "OTHER")]
+    graph = ImpactGraph().load(assets, [("FEED", "LINE", 1.0), ("LINE", "PRESS", 1.0)])
+    assert graph.exposure["FEED"] == 1 + DAMPING * (1 + DAMPING)
+    assert graph.downstream("FEED") == ["LINE", "PRESS"]
+
+    pushes = graph.set_risk("PRESS", 5)
+    assert pushes == 3 and graph.exposure["OTHER"] == 1
+    assert abs(graph.exposure["FEED"] - (1 + DAMPING * (1 + 5 * DAMPING))) < 1e-12
+
+
+def test_schedule_serves_the_bottleneck_first():
+    # FEED looks healthier than PRESS on its own, but four lines idle behind it
+    assets = [Asset("FEED", ["ELECT"], health_score=40, risk_level=2), Asset("PRESS", ["ELECT"], health_score=30, risk_level=2)]
+    assets += [Asset(f"L{i}", ["ELECT"], health_score=90, risk_level=3) for i in range(4)]
+    graph = ImpactGraph().load(assets, [("FEED", f"L{i}", 1.0) for i in range(4)])
+    orders = [Order("O-PRESS", "PRESS"), Order("O-FEED", "FEED")]
+
+    engineers = [Eng("E1", "Solo", ["ELECT"])]
+    own = run_orchestration(assets, orders, engineers, ScheduleCalendar(NOW))
+    assert [a["order_id"] for a in own] == ["O-PRESS", "O-FEED"]
+
+    engineers = [Eng("E1", "Solo", ["ELECT"])]
+    weighted = run_orchestration(assets, orders, engineers, ScheduleCalendar(NOW), stakes=graph.stakes())
+    assert [a["order_id"] for a in weighted] == ["O-FEED", "O-PRESS"]
+
+    # The captured /schedule job carries the stakes, so every strategy sees them
+    trace = capture(assets, orders, engineers, [], NOW, stakes=graph.stakes())
+    replayed = {a.asset_id: a.risk_level for a in replay_inputs(trace)[0]}
+    assert replayed["FEED"] == graph.exposure["FEED"] and replayed["PRESS"] == 2
+
+
+def test_a_branching_cycle_is_refused():
+    assets = [SimpleNamespace(asset_id=a, risk_level=1, health_score=50) for a in ("A", "B", "C")]
+    graph = ImpactGraph().load(assets, [])
+    graph.add_edge("A", "B")
+    graph.add_edge("A", "C")
+    for up in ("B", "C"):
+        with pytest.raises(ValueError):
+            graph.add_edge(up, "A")
+    assert graph.exposure["A"] == 1 + 2 * DAMPING
+
+    # A stored cycle (written before the check existed) loads without its closing edges
+    loaded = ImpactGraph().load(assets, [("A", "B", 1.0), ("A", "C", 1.0), ("B", "A", 1.0), ("C", "A", 1.0)])
+    assert loaded.exposure == graph.exposure
+    assert loaded.set_risk("B", 3) == 2 and loaded.exposure["A"] == 1 + 4 * DAMPING
@@ -0,0 +1,105 @@
+import datetime
+import json
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from Persistence.database import Base
+from Persistence.models import EventLogModel
+from Services.alert_services import create_alert, resolve_alert
+from Services.escalation_scheduler import EscalationScheduler
+from domain.alert import AlertSeverity
+from domain.escalation import ESCALATION_RULES, requires_escalation
+
+T0 = datetime.datetime(2026, 3, 2, 9, 0)
+
+
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def escalated(db):
+    rows = db.query(EventLogModel).filter(EventLogModel.event_type == "ALERT_ESCALATED").all()
+    return [(row.payload if isinstance(row.payload, dict) else json.loads(row.payload))["alert_id"] for row in rows]
+
+
+def test_fires_exactly_at_deadline_and_matches_rule():
+    rng = random.Random(11)
+    scheduler = EscalationScheduler()
+    alerts = {}
+    for i in range(2000):
+        severity = rng.choice(list(AlertSeverity))
+        created = T0 + datetime.timedelta(seconds=rng.randrange(3600))
+        alerts[f"AL-{i}"] = (severity, created)
+        scheduler.schedule(f"AL-{i}", severity, created)
+    resolved = set(rng.sample(sorted(alerts), 500))
+    for alert_id in resolved:
+        scheduler.cancel(alert_id)
+
+    fired_at = {}
+    clock = T0
+    while clock < T0 + datetime.timedelta(hours=2):
+        clock += datetime.timedelta(seconds=30)
+        for alert_id, _, deadline in scheduler.due(clock):
+            assert deadline <= clock < deadline + datetime.timedelta(seconds=30)
+            fired_at[alert_id] = deadline
+
+    expected = {
+        alert_id for alert_id, (severity, created) in alerts.items()
+        if alert_id not in resolved and requires_escalation(severity, datetime.timedelta(hours=3))
+    }
+    assert set(fired_at) == expected
+    for alert_id, deadline in fired_at.items():
+        severity, created = alerts[alert_id]
+        assert deadline == created + ESCALATION_RULES[severity]
+    assert len(scheduler) == 0 and scheduler.next_deadline() is None
+
+
+def test_rebuild_from_event_log_after_restart():
+    db = session()
+    live = EscalationScheduler()
+    critical = create_alert(db, AlertSeverity.CRITICAL, "Turbine offline", scheduler=live)
+    high = create_alert(db, AlertSeverity.HIGH, "Press overheating", scheduler=live)
+    low = create_alert(db, AlertSeverity.LOW, "Filter dusty", scheduler=live)
+    fixed = create_alert(db, AlertSeverity.CRITICAL, "Breaker tripped", scheduler=live)
+    resolve_alert(db, fixed.alert_id, scheduler=live)
+    assert len(live) == 2
+
+    created = db.query(EventLogModel).filter(EventLogModel.event_type == "ALERT_CREATED").first().created_at
+    assert live.fire(db, created + datetime.timedelta(minutes=20)) == [critical.alert_id]
+
+    # A fresh process sees the escalation on record and only the HIGH alert left open
+    restarted = EscalationScheduler.rebuild(db)
+    assert len(restarted) == 1
+    assert restarted.fire(db, created + datetime.timedelta(minutes=29)) == []
+    assert restarted.fire(db, created + datetime.timedelta(minutes=31)) == [high.alert_id]
+    assert sorted(escalated(db)) == sorted([critical.alert_id, high.alert_id])
+    assert low.alert_id not in escalated(db)
+
+    # The live instance catches up on its own escalation without firing twice
+    assert live.refresh(db) > 0
+    assert live.fire(db, created + datetime.timedelta(hours=5)) == []
+
+
+def test_workers_sharing_the_log_escalate_once(tmp_path):
+    url = f"sqlite:///{tmp_path / 'log.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    db = sessionmaker(bind=create_engine(url))()
+    alert = create_alert(db, AlertSeverity.CRITICAL, "Turbine offline")
+    # One scheduler and connection per web worker process, all past the deadline
+    workers = [EscalationScheduler.rebuild(sessionmaker(bind=create_engine(url))()) for _ in range(4)]
+    late = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    recorded = [worker.fire(sessionmaker(bind=create_engine(url))(), late) for worker in workers]
+    assert recorded == [[alert.alert_id], [], [], []]
+    assert escalated(db) == [alert.alert_id]
+    # The database refuses a second one even from a scheduler that never read the log
+    blind = EscalationScheduler()
+    blind.schedule(alert.alert_id, AlertSeverity.CRITICAL, datetime.datetime.utcnow())
+    assert blind.fire(sessionmaker(bind=create_engine(url))(), late) == []
+    assert escalated(db) == [alert.alert_id]
+    row = db.query(EventLogModel).filter(EventLogModel.event_type == "ALERT_ESCALATED").one()
+    assert row.created_at is not None and row.payload["severity"] == AlertSeverity.CRITICAL.value
@@ -0,0 +1,62 @@
+import asyncio
+import contextlib
+import datetime
+import io
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.plant import PlantSpec, generate, in_memory
+from Services.execution import PoolSaturated, SolverPool, solve, solve_snapshot
+from Services.schedule_trace import capture, replay_inputs
+from Services.timeline import ScheduleCalendar
+
+NOW = datetime.datetime(2026, 1, 5, 7, 0)
+
+
+def snapshot_job(strategy="greedy"):
+    plant = generate(PlantSpec(n_assets=600, seed=15))
+    assets, orders, engineers = in_memory(plant)
+    bookings = [SimpleNamespace(**row) for row in plant.orders]
+    return capture(assets, orders, engineers, bookings, NOW, strategy)
+
+
+def test_pool_result_matches_in_process_solve():
+    for strategy in ("greedy", "min_cost"):
+        job = snapshot_job(strategy)
+        assets, orders, engineers, calendar = replay_inputs(job)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected, cost, _, _ = solve(assets, orders, engineers, calendar, strategy)
+
+        pool = SolverPool(max_workers=1, queue_depth=0)
+        try:
+            result = asyncio.run(pool.submit(solve_snapshot, job))
+        finally:
+            pool.shutdown()
+        assert result["allocations"] == expected
+        assert result["total_cost"] == pytest.approx(cost)
+        # Only engineers that picked up work report a new fatigue
+        final = {e.engineer_id: e.fatigue for e in engineers}
+        assert set(result["fatigue"]) == {a["engineer_id"] for a in expected}
+        assert all(result["fatigue"][k] == pytest.approx(final[k]) for k in result["fatigue"])
+
+
+def _slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_pool_sheds_load_past_queue_depth():
+    pool = SolverPool(max_workers=0, queue_depth=1)   # one solver thread plus one waiting run
+
+    async def burst():
+        return await asyncio.gather(*(pool.submit(_slow, 0.2) for _ in range(3)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(burst())
+    finally:
+        pool.shutdown()
+    assert results[:2] == [0.2, 0.2]
+    assert isinstance(results[2], PoolSaturated)
+    assert pool.in_flight == 0
@@ -0,0 +1,113 @@
+import datetime
+import time
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from Persistence.database import Base
+from Services.health_history import TIERS, HealthHistory, due_within, forecast, log_readings
+
+T0 = datetime.datetime(2026, 3, 2, 0, 0)
+
+
+def hours(h):
+    return T0 + datetime.timedelta(hours=h)
+
+
+def test_rings_stay_bounded_and_downsample():
+    history = HealthHistory()
+    for h in range(24 * 70):    # 70 days, one reading an hour
+        history.record("PUMP", 100 - h / 24, hours(h))
+
+    slots = {name: n for name, _, n in TIERS}
+    raw, hourly, daily = (history.series("PUMP", tier) for tier in ("raw", "hourly", "daily"))
+    assert len(raw) == slots["raw"] and raw[-1]["at"] == hours(24 * 70 - 1).isoformat()
+    assert len(hourly) == slots["hourly"] and len(daily) == slots["daily"]
+    # Day 68 (the last closed one) averages its 24 readings
+    assert daily[-1]["at"] == (T0 + datetime.timedelta(days=68, hours=12)).isoformat()
+    assert abs(daily[-1]["health"] - (100 - 68 - 11.5 / 24)) < 0.01
+    assert history.series("NOPE") == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    history = HealthHistory()
+    history.record_many(["A", "B"], [90.0, 80.0], hours(0))
+    history.record_many(["B", "C"], [75.0, 60.0], hours(2))
+    path = str(tmp_path / "history.npz")
+    history.save(path)
+
+    loaded = HealthHistory.load(path)
+    for asset_id in ("A", "B", "C"):
+        for tier, _, _ in TIERS:
+            assert loaded.series(asset_id, tier) == history.series(asset_id, tier)
+    loaded.record("D", 50.0, hours(3))
+    assert len(loaded) == 4
+    assert len(HealthHistory.load(str(tmp_path / "missing.npz"))) == 0
+
+
+def test_forecast_matches_a_per_asset_fit():
+    rng = np.random.default_rng(20)
+    history = HealthHistory()
+    ids = [f"A{i}" for i in range(200)]
+    start = rng.uniform(60, 100, len(ids))
+    decay = rng.uniform(-0.5, 0.3, len(ids))    # health per hour; some assets improve
+    for h in range(12):
+        history.record_many(ids, start + decay * h + rng.normal(0, 0.5, len(ids)), hours(h))
+    history.record("NEW", 70.0, hours(11))      # one reading: no trend yet
+
+    now = hours(12)
+    result = forecast(history, now)
+    for i, asset_id in enumerate(ids):
+        times, values = history.rings["raw"].ordered(history.rows[asset_id])
+        slope, level = np.polyfit((times - history._seconds(now)) / 3600.0, values.astype(float), 1)
+        assert abs(result["slope"][i] - slope) < 1e-6 and abs(result["health"][i] - level) < 1e-4
+        expected = 0.0 if level <= 50 else ((50 - level) / slope if slope < 0 else np.inf)
+        assert np.isclose(result["hours"][i], expected, rtol=1e-6)
+    assert np.isinf(result["hours"][-1])
+
+    soon = due_within(history, 24, now)
+    assert soon and all(result["hours"][history.rows[a]] <= 24 for a in soon)
+
+
+def test_forecasting_a_hundred_thousand_assets():
+    rng = np.random.default_rng(1)
+    history = HealthHistory()
+    ids = [f"A{i}" for i in range(100_000)]
+    for h in range(32):
+        history.record_many(ids, rng.uniform(40, 100, len(ids)), hours(h))
+
+    began = time.perf_counter()
+    result = forecast(history, hours(32))
+    assert time.perf_counter() - began < 1.0
+    assert len(result["hours"]) == 100_000
+
+
+def test_workers_share_readings_through_the_log(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plant.db'}")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    first, second = HealthHistory(), HealthHistory()    # one per web worker
+
+    with sessions() as db:
+        log_readings(db, ["A", "B"], [90.0, 80.0], hours(0))
+        db.commit()
+    with sessions() as db:
+        log_readings(db, ["A"], [85.0], hours(1))
+        log_readings(db, ["A"], [84.0], hours(1))        # same stamp, same asset: two readings
+        db.commit()
+    with sessions() as db:
+        assert first.refresh(db) == 4 and first.refresh(db) == 0
+        assert second.refresh(db) == 4
+    assert [r["health"] for r in first.series("A")] == [90.0, 85.0, 84.0]
+    assert first.series("B") == second.series("B") and first.series("A") == second.series("A")
+
+    # The checkpoint covers what it folded in; a restart replays only what came after
+    path = str(tmp_path / "history.npz")
+    with sessions() as db:
+        first.checkpoint(path, db)
+        log_readings(db, ["B"], [70.0], hours(2))
+        db.commit()
+        restarted = HealthHistory.load(path)
+        assert restarted.refresh(db) == 1
+    assert [r["health"] for r in restarted.series("B")] == [80.0, 70.0]
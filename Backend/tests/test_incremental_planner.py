@@ -0,0 +1,77 @@
+import copy
+import datetime
+
+from Services.incremental_planner import IncrementalPlanner
+from Services.orchestrator import build_emergency_order, run_orchestration
+from test_matching import Asset, Eng, build_plant
+
+
+class Row:
+    """Stand-in for a MaintenanceModel row."""
+
+    def __init__(self, alloc):
+        self.order_id = alloc["order_id"]
+        self.asset_id = alloc["asset_id"]
+        self.assigned_engineer_id = alloc["engineer_id"]
+        self.scheduled_date = datetime.datetime.fromisoformat(alloc["start_time"])
+        self.end_time = datetime.datetime.fromisoformat(alloc["end_time"])
+
+
+def persist(db, allocations):
+    for alloc in allocations:
+        db[alloc["order_id"]] = Row(alloc)
+
+
+def test_bootstrap_matches_the_full_greedy_run():
+    for seed in range(10):
+        assets, _, engineers = build_plant(seed, n_assets=40, n_engineers=10)
+        orders = [build_emergency_order(a) for a in assets if a.health_score < 50]
+        expected = run_orchestration(assets, orders, copy.deepcopy(engineers))
+
+        planner = IncrementalPlanner()
+        allocations = planner.bootstrap(assets, engineers, [])
+        assert [(a["asset_id"], a["engineer_id"], a["start_time"]) for a in allocations] == \
+            [(a["asset_id"], a["engineer_id"], a["start_time"]) for a in expected]
+
+
+def test_events_replan_only_what_they_touch():
+    assets = [Asset("A1", ["ELECT"], health_score=90), Asset("A2", ["ELECT"], health_score=90),
+              Asset("A3", ["HYDRA"], health_score=90)]
+    engineers = [Eng("E1", "Sparky", ["ELECT"])]
+    db = {}
+    planner = IncrementalPlanner()
+    assert planner.bootstrap(assets, engineers, []) == []
+
+    # Threshold crossings open exactly one order per asset
+    first = planner.on_health("A1", 20)
+    second = planner.on_health("A2", 30)
+    assert [a["engineer_id"] for a in first + second] == ["E1", "E1"]
+    assert planner.on_health("A1", 10) == []
+    persist(db, first + second)
+
+    # Completing the first job pulls the second one into its slot
+    moved = planner.on_order_completed(first[0]["order_id"])
+    planner.on_health("A1", 100.0)
+    del db[first[0]["order_id"]]
+    assert [a["order_id"] for a in moved] == [second[0]["order_id"]]
+    assert moved[0]["start_time"] < second[0]["end_time"]
+    persist(db, moved)
+
+    # Nobody left to take a job: it waits until someone joins
+    planner.index.set_fatigue(planner.engineers["E1"], 100.0)
+    assert planner.on_health("A3", 5) == []
+    assert len(planner.waiting) == 1
+    joined = planner.on_engineer_added(Eng("E2", "Plumber", ["HYDRA"]))
+    assert [(a["asset_id"], a["engineer_id"]) for a in joined] == [("A3", "E2")]
+    persist(db, joined)
+
+    # Losing an engineer re-plans only their orders
+    planner.index.set_fatigue(planner.engineers["E1"], 0.0)
+    reassigned = planner.on_engineer_removed("E2")
+    assert [(a["asset_id"], a["engineer_id"]) for a in reassigned] == [("A3", "E1")]
+    persist(db, reassigned)
+
+    for asset_id, health in (("A1", 100.0), ("A2", 30), ("A3", 5)):
+        next(a for a in assets if a.asset_id == asset_id).health_score = health
+    report = planner.check(assets, db.values())
+    assert report["consistent"], report
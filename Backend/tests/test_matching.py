@@ -0,0 +1,112 @@
+import itertools
+import math
+import random
+
+from Services.matching import EngineerIndex
+from Services.orchestrator import run_orchestration, calculate_priority
+
+CERTS = ["ELECT", "HYDRA", "ROBOT", "CYBER", "HV-L3"]
+
+
+class Asset:
+    def __init__(self, asset_id, required_certifications=None, health_score=10, risk_level=5):
+        self.asset_id = asset_id
+        self.required_certifications = required_certifications
+        self.health_score = health_score
+        self.risk_level = risk_level
+
+
+class Order:
+    def __init__(self, order_id, asset_id, task_type='Repair'):
+        self.order_id = order_id
+        self.asset_id = asset_id
+        self.task_type = task_type
+
+
+class Eng:
+    def __init__(self, engineer_id, name, certifications=None, fatigue=0.0, skill_matrix=None):
+        self.engineer_id = engineer_id
+        self.name = name
+        self.certifications = certifications
+        self.fatigue = fatigue
+        self.skill_matrix = skill_matrix
+
+
+def build_plant(seed, n_assets=60, n_engineers=12):
+    rng = random.Random(seed)
+    assets = [
+        Asset(f"A{i}", rng.sample(CERTS, rng.randint(0, 2)),
+              health_score=rng.choice([5, 10, 20, 20, 35, 49]), risk_level=rng.randint(1, 5))
+        for i in range(n_assets)
+    ]
+    orders = [Order(f"O{i}", a.asset_id, rng.choice(["Repair", "Emergency Repair"])) for i, a in enumerate(assets)]
+    engineers = [
+        Eng(f"E{i}", f"Eng {i}", rng.sample(CERTS, rng.randint(0, 3)),
+            fatigue=rng.choice([0.0, 0.0, 12.5, 60.0, 99.0, 100.0]),
+            skill_matrix={"repairSpeed": rng.randint(1, 10), "diagnostics": rng.randint(1, 10)})
+        for i in range(n_engineers)
+    ]
+    return assets, orders, engineers
+
+
+def reference_crew(required, engineers, max_size=4):
+    """Brute-force crew: fewest members, then least total fatigue, then lowest positions."""
+    rested = [(pos, e) for pos, e in enumerate(engineers) if e.fatigue < 100.0]
+    for size in range(2, max_size + 1):
+        crews = [
+            crew for crew in itertools.combinations(rested, size)
+            if set(required) <= {c for _, e in crew for c in (e.certifications or [])}
+        ]
+        if crews:
+            best = min(crews, key=lambda crew: (math.fsum(e.fatigue for _, e in crew), [pos for pos, _ in crew]))
+            held = lambda e: sum(c in (e.certifications or []) for c in set(required))
+            return [e for _, e in sorted(best, key=lambda p: (-held(p[1]), p[1].fatigue, p[0]))]
+    return None
+
+
+def reference_selections(assets, orders, engineers):
+    """The original linear-scan greedy, kept as the oracle for the index."""
+    from Services.orchestrator import calculate_actual_duration
+    asset_map = {a.asset_id: a for a in assets}
+    prioritized = sorted(((calculate_priority(asset_map.get(o.asset_id)), o) for o in orders),
+                         key=lambda x: x[0], reverse=True)
+    picks = []
+    for _, order in prioritized:
+        required = asset_map[order.asset_id].required_certifications or []
+        eligible = [e for e in engineers
+                    if all(c in (e.certifications or []) for c in required) and e.fatigue < 100.0]
+        crew = reference_crew(required, engineers) if required and not eligible else None
+        if crew:
+            duration = max(calculate_actual_duration(e, order.task_type, 120, 1.5) for e in crew)
+            for e in crew:
+                e.fatigue += duration / 60.0
+            picks.append((order.order_id, crew[0].engineer_id))
+            continue
+        if not eligible:
+            eligible = [e for e in engineers if e.fatigue < 100.0]
+            if not eligible:
+                continue
+        best = min(eligible, key=lambda e: e.fatigue)
+        best.fatigue += calculate_actual_duration(best, order.task_type, 120, 1.5) / 60.0
+        picks.append((order.order_id, best.engineer_id))
+    return picks
+
+
+def test_indexed_greedy_matches_linear_scan():
+    for seed in range(25):
+        expected = reference_selections(*build_plant(seed))
+        allocations = run_orchestration(*build_plant(seed))
+        assert [(a["order_id"], a["engineer_id"]) for a in allocations] == expected
+
+
+def test_fatigue_gate_and_tie_break():
+    engineers = [Eng("E1", "A", ["ELECT"], 5.0), Eng("E2", "B", ["ELECT"], 5.0), Eng("E3", "C", [], 1.0)]
+    index = EngineerIndex(engineers)
+    assert index.best(["ELECT"]) is engineers[0]
+    index.set_fatigue(engineers[0], 100.0)
+    assert index.best(["ELECT"]) is engineers[1]
+    assert index.best([]) is engineers[2]
+    assert index.rested_count == 2
+    index.set_fatigue(engineers[1], 120.0)
+    assert index.best(["ELECT"]) is None
+    assert index.best(["UNKNOWN"]) is None
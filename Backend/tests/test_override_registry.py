@@ -0,0 +1,70 @@
+import datetime
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from Persistence.database import Base
+from Services.override_registry import OverrideRegistry
+from Services.override_service import approve_override
+from domain.compliance import legally_available
+from domain.override import Override
+
+NOW = datetime.datetime(2026, 3, 2, 9, 30)
+REASON = "Storm response needs the on-call crew"
+
+
+class Eng:
+    def __init__(self, engineer_id):
+        self.engineer_id = engineer_id
+        self.shift_start = 0
+        self.shift_end = 60
+        self.hours_worked_today = 9   # over every limit unless overridden
+        self.last_shift_end = None
+
+
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_lookups_match_linear_scan():
+    rng = random.Random(10)
+    registry = OverrideRegistry()
+    overrides = []
+    for i in range(300):
+        override = Override(
+            f"OV-{i}", rng.choice(["FATIGUE_LIMIT", "MAX_SHIFT"]), f"E{rng.randrange(40)}",
+            REASON, "ops", NOW + datetime.timedelta(minutes=rng.randint(-30, 600)),
+        )
+        overrides.append(override)
+        registry.add(override, NOW)
+
+    for step in range(0, 700, 35):
+        now = NOW + datetime.timedelta(minutes=step)
+        registry.expire(now)
+        for i in range(40):
+            engineer = Eng(f"E{i}")
+            assert legally_available(engineer, 30, registry, now) == legally_available(engineer, 30, overrides, now)
+        expected = {(o.constraint, o.target_id) for o in overrides if o.is_active(now)}
+        assert {(o.constraint, o.target_id) for o in registry.active(now)} == expected
+
+
+def test_refresh_folds_new_events_only():
+    db = session()
+    approve_override(db, "FATIGUE_LIMIT", "E1", REASON, "Ada", "SAFETY_OFFICER", NOW + datetime.timedelta(hours=2))
+    registry = OverrideRegistry.load(db, NOW)
+    assert registry.lookup("FATIGUE_LIMIT", "E1", NOW).approved_by == "Ada"
+    assert registry.refresh(db, NOW) == 0
+
+    # Approvals reach a live registry directly and through the log
+    approve_override(db, "FATIGUE_LIMIT", "E2", REASON, "Ada", "SAFETY_OFFICER",
+                     NOW + datetime.timedelta(hours=1), registry=registry)
+    approve_override(db, "FATIGUE_LIMIT", "E3", REASON, "Ada", "PLANT_MANAGER", NOW + datetime.timedelta(hours=3))
+    assert registry.refresh(db, NOW) == 2
+    assert len(registry) == 3
+
+    later = NOW + datetime.timedelta(minutes=90)
+    assert sorted(o.target_id for o in registry.active(later)) == ["E1", "E3"]
+    assert registry.lookup("FATIGUE_LIMIT", "E2", later) is None
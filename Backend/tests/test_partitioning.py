@@ -0,0 +1,56 @@
+import copy
+import random
+
+from Services import partitioning
+from Services.orchestrator import run_orchestration
+from Services.timeline import ScheduleCalendar
+from test_matching import Asset, Eng, Order
+
+CERTS = ["ELECT", "HYDRA", "ROBOT", "CYBER", "HV-L3", "PNEUM", "SAFETY", "WELD"]
+
+
+def multi_site_plant(seed, n_assets, n_engineers, tired=0.0, unqualified=0.0):
+    """Two sites with disjoint cert families, optionally with assets nobody is certified for."""
+    rng = random.Random(seed)
+    sites = [CERTS[:4], CERTS[4:]]
+    assets = []
+    for i in range(n_assets):
+        site = sites[i % 2]
+        certs = rng.sample(site, rng.randint(1, 2)) if rng.random() >= unqualified else ["UNKNOWN"]
+        assets.append(Asset(f"A{i}", certs, health_score=rng.choice([5, 20, 35, 49]),
+                            risk_level=rng.randint(1, 5)))
+    orders = [Order(f"O{i}", a.asset_id, rng.choice(["Repair", "Emergency Repair"]))
+              for i, a in enumerate(assets)]
+    engineers = [
+        Eng(f"E{i}", f"Eng {i}", rng.sample(sites[i % 2], rng.randint(1, 4)),
+            fatigue=rng.choice([0.0, 20.0, tired]),
+            skill_matrix={"repairSpeed": rng.randint(1, 10), "diagnostics": rng.randint(1, 10)})
+        for i in range(n_engineers)
+    ]
+    return assets, orders, engineers
+
+
+def summary(allocations):
+    return [(a["order_id"], a["engineer_id"], a["start_time"]) for a in allocations]
+
+
+def test_partitioned_run_is_identical_to_serial(monkeypatch):
+    monkeypatch.setattr(partitioning, "MIN_CHUNK_ORDERS", 50)
+    # Clean split, staff running out mid-run, and orders that must fall back
+    for seed, crew, tired, unqualified in ((0, 200, 0.0, 0.0), (1, 12, 99.5, 0.0), (2, 200, 100.0, 0.01)):
+        assets, orders, engineers = multi_site_plant(seed, 400, crew, tired, unqualified)
+        now = ScheduleCalendar().now
+
+        serial_engineers = copy.deepcopy(engineers)
+        expected = run_orchestration(assets, orders, serial_engineers, ScheduleCalendar(now))
+        allocations = partitioning.run_partitioned(assets, orders, engineers, ScheduleCalendar(now), max_workers=2)
+
+        assert summary(allocations) == summary(expected)
+        assert [e.fatigue for e in engineers] == [e.fatigue for e in serial_engineers]
+
+
+def test_partition_splits_disjoint_cert_families():
+    # E0 covers ELECT only, E1 covers HYDRA only; an unmet requirement is an orphan
+    components, orphans = partitioning.partition([0b01, 0b10, 0b01, 0b100], [0b01, 0b10], [0, 1])
+    assert components == [([0, 2], [0]), ([1], [1])]
+    assert orphans == [3]
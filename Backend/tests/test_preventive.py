@@ -0,0 +1,110 @@
+import datetime
+import random
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from Persistence import models
+from Persistence.database import Base
+from Services.preventive import PLANNED, PreventiveCalendar, insert_orders, order_id, order_rows
+
+TODAY = datetime.date(2026, 3, 2)
+
+
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def days_ago(n):
+    return datetime.datetime.combine(TODAY - datetime.timedelta(days=n), datetime.time(10))
+
+
+def test_only_due_assets_come_out_and_roll_forward():
+    calendar = PreventiveCalendar().load(
+        [("PUMP", "Pump", days_ago(25)), ("PLC", "PLC", days_ago(5)), ("OLD", "Pump", days_ago(200))],
+        {"Pump": 30, "PLC": 365},
+        TODAY,
+    )
+    assert calendar.due(TODAY, TODAY + datetime.timedelta(days=7)) == [
+        ("OLD", TODAY - datetime.timedelta(days=170)),    # overdue: once, at its real due date
+        ("PUMP", TODAY + datetime.timedelta(days=5)),
+    ]
+    # Nothing new until the rolled dates come round; OLD restarts from today
+    assert calendar.due(TODAY, TODAY + datetime.timedelta(days=20)) == []
+    assert calendar.next_due["OLD"] == (TODAY + datetime.timedelta(days=30)).toordinal()
+
+    # An inspection supersedes the queued date (PUMP was next due at +35)
+    calendar.inspected("PUMP", days_ago(0))
+    month = TODAY + datetime.timedelta(days=30)
+    assert calendar.due(TODAY, TODAY + datetime.timedelta(days=40)) == [("OLD", month), ("PUMP", month)]
+
+    # A shorter rule pulls the PLC in from day +360 to its last inspection + 30
+    assert calendar.set_rule("PLC", 30) == 1
+    assert calendar.due(TODAY, TODAY + datetime.timedelta(days=40)) == [("PLC", TODAY + datetime.timedelta(days=25))]
+
+
+def test_matches_a_scan_over_every_asset():
+    rng = random.Random(19)
+    rules = {"Pump": 30, "Conveyor": 60, "PLC": 180}
+    assets = [
+        (f"A{i}", rng.choice(list(rules) + ["Unruled"]), days_ago(rng.randint(0, 400)) if rng.random() < 0.8 else None)
+        for i in range(3000)
+    ]
+    calendar = PreventiveCalendar().load(assets, rules, TODAY)
+    until = TODAY + datetime.timedelta(days=14)
+    found = calendar.due(TODAY, until)
+
+    expected = []
+    for asset_id, kind, last in assets:
+        interval = rules.get(kind, 90)
+        if last is not None:
+            due = last.date() + datetime.timedelta(days=interval)
+            if due <= until:
+                expected.append((asset_id, due))
+    assert set(expected) <= set(found)
+    assert len(found) == len({a for a, _ in found})   # one order per asset in a 14-day window
+
+
+def test_half_a_million_assets_in_seconds():
+    rng = random.Random(5)
+    types = [f"T{i}" for i in range(200)]
+    rules = {t: rng.choice([30, 90, 180, 365]) for t in types}
+    assets = [(f"A{i}", rng.choice(types), days_ago(rng.randint(0, 365))) for i in range(500_000)]
+
+    began = time.perf_counter()
+    calendar = PreventiveCalendar().load(assets, rules, TODAY)
+    rows = order_rows(calendar.due(TODAY, TODAY + datetime.timedelta(days=1)), TODAY)
+    assert time.perf_counter() - began < 5
+    assert rows and all(row["status"] == PLANNED for row in rows)
+
+
+def test_bulk_insert_skips_orders_already_generated():
+    db = session()
+    calendar = PreventiveCalendar().load([(f"A{i}", "Pump", None) for i in range(9000)], {"Pump": 30}, TODAY)
+    rows = order_rows(calendar.due(TODAY, TODAY + datetime.timedelta(days=29)), TODAY)
+    assert len(rows) == 9000
+    assert insert_orders(db, models, rows) == 9000
+
+    # A restarted service regenerates the same window: same ids, nothing added
+    again = PreventiveCalendar().load([(f"A{i}", "Pump", None) for i in range(9000)], {"Pump": 30}, TODAY)
+    assert insert_orders(db, models, order_rows(again.due(TODAY, TODAY + datetime.timedelta(days=29)), TODAY)) == 0
+    db.commit()
+    assert db.query(models.MaintenanceModel).count() == 9000
+    assert db.get(models.MaintenanceModel, rows[0]["order_id"]).status == PLANNED
+    assert rows[0]["order_id"] == order_id(rows[0]["asset_id"], rows[0]["scheduled_date"].date())
+
+
+def test_a_restart_regenerates_the_same_first_orders():
+    assets = [(f"NEW-{i}", "Pump", None) for i in range(33)]
+    first = PreventiveCalendar().load(assets, {"Pump": 30}, TODAY)
+    orders = {order_id(a, day) for a, day in first.due(TODAY, TODAY + datetime.timedelta(days=14))}
+
+    # Loaded again three days later (e.g. a deploy), the same nightly window repeats nothing new
+    later = TODAY + datetime.timedelta(days=3)
+    again = PreventiveCalendar().load(assets, {"Pump": 30}, later)
+    repeat = {order_id(a, day) for a, day in again.due(later, TODAY + datetime.timedelta(days=14))}
+    assert orders and repeat <= orders
+    assert all(first.next_due[a] == again.next_due[a] for a, _, _ in assets)
@@ -0,0 +1,66 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from Services.readiness import JOBS_PER_SHIFT, failure_probabilities, readiness_risk
+from test_matching import Asset, Eng
+
+
+def shift_engineer(engineer_id, certs, shift, fatigue=0.0):
+    eng = Eng(engineer_id, engineer_id, certs, fatigue=fatigue)
+    eng.availability = shift
+    return eng
+
+
+def test_draws_match_the_closed_form():
+    # 21 assets due now over a week of 21 shifts: one failure per shift on average
+    assets = [Asset(f"A{i}", ["ELECT"], health_score=40) for i in range(21)]
+    [report] = readiness_risk(assets, [], horizon_hours=168, draws=200_000, seed=3)
+    assert report["expected_failures"] == 21 and report["failures_per_shift"] == 1.0
+    for shift in report["shifts"].values():
+        assert shift["engineers"] == 0
+        assert abs(shift["p_short"] - (1 - math.exp(-1))) < 0.005
+    assert report["p_short_horizon"] > 0.999
+
+
+def test_fit_engineers_cover_their_own_shift_only():
+    assets = [Asset(f"A{i}", ["Elect "], health_score=45) for i in range(42)]
+    engineers = [
+        shift_engineer("D1", ["elect"], "Day"),
+        shift_engineer("D2", ["ELECT"], "Day"),
+        shift_engineer("S1", ["ELECT"], "Swing", fatigue=100.0),   # never fit
+        shift_engineer("N1", ["MECH"], "Night"),
+    ]
+    [report] = readiness_risk(assets, engineers, draws=50_000)
+    shifts = report["shifts"]
+    assert report["skill"] == "Elect"
+    assert shifts["Day"]["engineers"] == 2 and shifts["Swing"]["expected_fit"] == 0.0
+    assert shifts["Night"]["engineers"] == 0
+    assert shifts["Day"]["p_short"] < shifts["Swing"]["p_short"] / 4
+    assert report["worst_shift"] in ("Swing", "Night")
+    assert shifts["Swing"]["shortfall"]["p99"] >= shifts["Day"]["shortfall"]["p99"] >= 0
+    assert JOBS_PER_SHIFT >= 1
+
+
+def test_forecast_trend_drives_the_failure_chance():
+    health = np.array([40.0, 90.0, 90.0, 90.0])
+    hours = np.array([np.inf, 24.0, 2400.0, np.inf])
+    p = failure_probabilities(health, hours, 168)
+    assert p[0] == 1.0 and p[1] > 0.99 and p[2] < 0.1
+    assert 0 < p[3] < p[1]
+
+
+def test_a_large_plant_stays_fast():
+    rng = random.Random(0)
+    certs = [f"C{i}" for i in range(200)]
+    assets = [Asset(f"A{i}", rng.sample(certs, 2), health_score=rng.uniform(30, 100)) for i in range(5000)]
+    engineers = [shift_engineer(f"E{i}", rng.sample(certs, 4), rng.choice(["Day", "Swing", "Night"]),
+                                rng.uniform(0, 80)) for i in range(400)]
+    began = time.perf_counter()
+    report = readiness_risk(assets, engineers, draws=100_000)
+    assert time.perf_counter() - began < 5
+    assert len(report) == 200
+    risks = [r["p_short_horizon"] for r in report]
+    assert risks == sorted(risks, reverse=True)
@@ -0,0 +1,76 @@
+import datetime
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from Services.rostering import REST_ALLOWED, SHIFTS, forecast_demand, shift_state, solve_roster
+
+START = datetime.date(2026, 1, 5)
+
+
+def crew(n, n_certs, seed):
+    rng = random.Random(seed)
+    certs = [f"C{i}" for i in range(n_certs)]
+    return certs, [
+        SimpleNamespace(engineer_id=f"E{i}", certifications=rng.sample(certs, rng.randint(1, 3)),
+                        availability=rng.choice(SHIFTS))
+        for i in range(n)
+    ]
+
+
+def assert_legal(roster, engineers, max_shifts=5):
+    grid = roster.grid
+    for d in range(1, roster.days):
+        worked = grid[:, d] >= 0
+        assert REST_ALLOWED[grid[worked, d - 1].astype(int) + 1, grid[worked, d]].all()
+    for week in range(roster.days // 7):
+        assert ((grid[:, 7 * week:7 * week + 7] >= 0).sum(axis=1) <= max_shifts).all()
+    held = np.array([[c in e.certifications for c in roster.certs] for e in engineers], dtype=int)
+    for d in range(roster.days):
+        for s in range(len(SHIFTS)):
+            assert (roster.coverage[d, s] == held[grid[:, d] == s].sum(axis=0)).all()
+
+
+def test_rest_rules_follow_the_shift_windows():
+    # Forward rotation only: Swing -> Day and Night -> Day/Swing leave under 11 hours
+    assert REST_ALLOWED[2, 0] == False and REST_ALLOWED[3, 0] == False and REST_ALLOWED[3, 1] == False
+    assert REST_ALLOWED[0].all() and REST_ALLOWED[1].all() and REST_ALLOWED[3, 2]
+
+
+def test_tight_roster_meets_demand_within_the_rules():
+    certs, engineers = crew(120, 10, seed=2)
+    demand = {label: {cert: 3 for cert in certs} for label in SHIFTS}
+    roster = solve_roster(engineers, START, 4, demand)
+    assert_legal(roster, engineers)
+    assert roster.summary()["unmet"] == 0 and roster.shortfall() == []
+
+    # Yesterday's night shift rules out today's day and swing shifts
+    roster = solve_roster(engineers, START, 1, demand, previous={"E0": "Night"})
+    assert roster.grid[0, 0] in (-1, SHIFTS.index("Night"))
+
+
+def test_two_thousand_engineers_for_four_weeks():
+    certs, engineers = crew(2000, 40, seed=1)
+    rng = random.Random(1)
+    assets = [SimpleNamespace(required_certifications=rng.sample(certs, 2), health_score=rng.uniform(0, 100))
+              for _ in range(20000)]
+    began = time.perf_counter()
+    roster = solve_roster(engineers, START, 4, forecast_demand(assets, 28))
+    assert time.perf_counter() - began < 60
+    assert_legal(roster, engineers)
+    assert roster.summary()["unmet"] == 0
+
+
+def test_shift_state_reads_real_shifts():
+    rows = [
+        {"engineer_id": "E1", "shift": "Night", "start": datetime.datetime(2026, 1, 4, 22), "end": datetime.datetime(2026, 1, 5, 6)},
+        {"engineer_id": "E1", "shift": "Night", "start": datetime.datetime(2026, 1, 5, 22), "end": datetime.datetime(2026, 1, 6, 6)},
+        {"engineer_id": "E1", "shift": "Night", "start": datetime.datetime(2026, 1, 6, 22), "end": datetime.datetime(2026, 1, 7, 6)},
+    ]
+    state = shift_state(rows, datetime.datetime(2026, 1, 6, 2))["E1"]
+    assert state["last_shift_start"] == datetime.datetime(2026, 1, 5, 22)
+    assert state["last_shift_end"] == datetime.datetime(2026, 1, 5, 6)
+    assert state["hours_worked_yesterday"] == 8.0   # 6h of the 4th's night plus 2h of the 5th's
+    assert state["availability"] == "Night"
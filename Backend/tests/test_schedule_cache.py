@@ -0,0 +1,133 @@
+import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from Persistence import models
+from Persistence.database import Base
+from Services.schedule_cache import Fingerprints, ScheduleCache, StateFingerprint
+
+TRACKED = [models.AssetModel, models.EngineerModel, models.MaintenanceModel, models.OrderBacklogModel]
+
+
+def plant(watch=True):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    sessions = sessionmaker(bind=engine)
+    fingerprint = StateFingerprint(TRACKED) if watch else None
+    if watch:
+        fingerprint.watch(sessions)
+    db = sessions()
+    db.add_all([
+        models.AssetModel(asset_id=f"A{i}", asset_type="Pump", health_score=80.0, risk_level=3,
+                          required_certifications=["ELECT"])
+        for i in range(5)
+    ])
+    db.add(models.EngineerModel(engineer_id="E1", name="Ada", certifications=["ELECT"], fatigue=10.0))
+    db.commit()
+    return sessions, fingerprint
+
+
+def rescanned(fingerprint, db):
+    for table in fingerprint.tables.values():
+        table.stale = True
+    return fingerprint.value(db)
+
+
+def test_commits_move_the_fingerprint_and_rollbacks_do_not():
+    sessions, fingerprint = plant()
+    db = sessions()
+    before = fingerprint.value(db)
+    assert not any(t.stale for t in fingerprint.tables.values())
+
+    db.get(models.AssetModel, "A1").health_score = 40.0
+    db.flush()
+    assert fingerprint.value(db) == before        # flushed, not committed
+    db.rollback()
+    assert fingerprint.value(db) == before
+
+    db.get(models.AssetModel, "A1").health_score = 40.0
+    db.commit()
+    changed = fingerprint.value(db)
+    assert changed != before
+    assert not fingerprint.tables["assets"].stale   # folded in, no rescan
+    assert changed == rescanned(fingerprint, db)
+
+    # Back to the old values: back to the old fingerprint
+    db.get(models.AssetModel, "A1").health_score = 80.0
+    db.commit()
+    assert fingerprint.value(db) == before
+
+    db.delete(db.get(models.EngineerModel, "E1"))
+    db.commit()
+    assert fingerprint.value(db) != before and fingerprint.value(db) == rescanned(fingerprint, db)
+
+
+def test_bulk_statements_mark_their_table_for_a_rescan():
+    sessions, fingerprint = plant()
+    db = sessions()
+    before = fingerprint.value(db)
+    db.query(models.EngineerModel).update({models.EngineerModel.fatigue: 50.0})
+    db.execute(insert(models.OrderBacklogModel), [
+        {"order_id": "O1", "asset_id": "A1", "task_type": "Emergency Repair", "priority": 6.0,
+         "created_at": datetime.datetime(2026, 1, 5)},
+    ])
+    db.commit()
+    assert fingerprint.tables["engineers"].stale and fingerprint.tables["order_backlog"].stale
+    assert not fingerprint.tables["assets"].stale
+    after = fingerprint.value(db)
+    assert after != before and after == rescanned(fingerprint, db)
+
+    # Writes outside a watched session need a touch
+    db.connection().execute(models.AssetModel.__table__.update().values(risk_level=9))
+    db.commit()
+    assert fingerprint.value(db) == after
+    fingerprint.touch(models.AssetModel)
+    assert fingerprint.value(db) != after
+
+
+def test_each_database_feeds_its_own_fingerprint():
+    fingerprints = Fingerprints(TRACKED)
+    fingerprints.watch(Session)
+    first, second = plant(watch=False), plant(watch=False)
+    a, b = first[0](), second[0]()
+    fa, fb = fingerprints.of(a.get_bind()), fingerprints.of(b.get_bind())
+    assert fa is not fb and fa.token != fb.token
+    assert fa.value(a) == fb.value(b)                 # same contents, told apart by the token
+
+    b.get(models.AssetModel, "A1").health_score = 10.0
+    b.commit()
+    assert fa.value(a) != fb.value(b) and fb.value(b) == rescanned(fb, b)
+    assert not fa.tables["assets"].stale and fa.value(a) == rescanned(fa, a)
+
+
+def test_lru_evicts_and_entries_expire():
+    cache = ScheduleCache(size=2, ttl_seconds=60)
+    cache.put("a", {"n": 1}, now=0)
+    cache.put("b", {"n": 2}, now=0)
+    assert cache.get("a", now=1) == {"n": 1}      # a is now the most recent
+    cache.put("c", {"n": 3}, now=1)
+    assert cache.get("b", now=2) is None and len(cache) == 2
+    assert cache.get("c", now=61) == {"n": 3}
+    assert cache.get("a", now=61) is None         # put at 0, older than the ttl
+    assert (cache.hits, cache.misses) == (2, 2)
+    ScheduleCache(size=0).put("x", {})
+
+
+def test_writes_from_another_process_move_the_version(tmp_path):
+    url = f"sqlite:///{tmp_path / 'plant.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    fingerprints = Fingerprints(TRACKED)
+    ours, theirs = create_engine(url), create_engine(url)   # two web workers
+    fingerprint = fingerprints.of(ours)
+    with Session(bind=ours) as db:
+        before = (fingerprint.version(db), fingerprint.value(db))
+
+    # Another worker's write reaches no session event of ours
+    with Session(bind=theirs) as other:
+        other.add(models.EngineerModel(engineer_id="E9", name="Grace", certifications=["MECH"], fatigue=0.0))
+        other.commit()
+    with Session(bind=ours) as db:
+        assert fingerprint.value(db) == before[1]
+        assert fingerprint.version(db) > before[0]
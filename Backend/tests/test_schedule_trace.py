@@ -0,0 +1,47 @@
+import contextlib
+import datetime
+import io
+from types import SimpleNamespace
+
+from benchmarks.plant import PlantSpec, generate, in_memory
+from benchmarks.replay_traces import decision_diff, replay
+from Services.orchestrator import run_orchestration
+from Services.schedule_trace import capture, read_trace, replay_inputs, write_trace
+from Services.timeline import ScheduleCalendar
+
+NOW = datetime.datetime(2026, 1, 5, 7, 0)
+
+
+def test_trace_round_trip_reproduces_decisions(tmp_path):
+    plant = generate(PlantSpec(n_assets=400, seed=13))
+    assets, orders, engineers = in_memory(plant)
+    for n, engineer in enumerate(engineers):    # as _apply_roster leaves them
+        engineer.last_shift_end = NOW - datetime.timedelta(hours=6 + n % 12)
+        engineer.last_shift_start = engineer.last_shift_end - datetime.timedelta(hours=8)
+    bookings = [SimpleNamespace(**row) for row in plant.orders]
+    calendar = ScheduleCalendar(NOW)
+    calendar.seed(bookings)
+
+    trace = capture(assets, orders, engineers, bookings, NOW)
+    with contextlib.redirect_stdout(io.StringIO()):
+        allocations = run_orchestration(assets, orders, engineers, calendar)
+    path = write_trace(trace, allocations, 12.5, str(tmp_path))
+
+    loaded = read_trace(path)
+    assert len(loaded["orders"]) == len(orders) and loaded["elapsed_ms"] == 12.5
+    assets2, orders2, engineers2, calendar2 = replay_inputs(loaded)
+    # Fatigue is the pre-run value, not what the run left behind
+    assert [e.fatigue for e in engineers2] == [row["fatigue"] for row in plant.engineers]
+    # The roster window round-trips as datetimes
+    assert [e.last_shift_end for e in engineers2] == [NOW - datetime.timedelta(hours=6 + n % 12) for n in range(len(engineers))]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        again = run_orchestration(assets2, orders2, engineers2, calendar2)
+    assert decision_diff(allocations, again) == []
+
+    report = replay([path], "greedy", repeat=2)
+    assert report["runs"] == 2 and report["traces"][0]["diffs"] == []
+    assert report["p50_ms"] <= report["p99_ms"]
+
+    moved = dict(allocations[0], engineer_id="SOMEONE-ELSE")
+    assert [d["order_id"] for d in decision_diff(allocations, [moved] + allocations[1:])] == [moved["order_id"]]
@@ -0,0 +1,62 @@
+import datetime
+from types import SimpleNamespace
+
+from Services.simulation import PlantSnapshot, simulate
+
+NOW = datetime.datetime(2026, 3, 2, 7, 0)
+
+
+def asset(asset_id, health, certs, asset_type="Gas Turbine"):
+    return SimpleNamespace(asset_id=asset_id, asset_type=asset_type, health_score=health,
+                           risk_level=3, required_certifications=certs)
+
+
+def engineer(engineer_id, certs, fatigue=0.0):
+    return SimpleNamespace(engineer_id=engineer_id, name=engineer_id, certifications=certs,
+                           skill_matrix={"repairSpeed": 5}, availability="Day", fatigue=fatigue)
+
+
+def plant():
+    assets = [
+        asset("A1", 20.0, ["HV"]),
+        asset("A2", 40.0, []),
+        asset("A3", 70.0, [], "Cobot Arm"),
+        asset("A4", 65.0, [], "Cobot Arm"),
+    ]
+    engineers = [engineer("E1", ["HV"]), engineer("E2", [], fatigue=5.0), engineer("E3", ["HV"], fatigue=3.0)]
+    booking = SimpleNamespace(order_id="ORD-OLD", asset_id="A9", assigned_engineer_id="E1",
+                              scheduled_date=NOW + datetime.timedelta(hours=1), end_time=NOW + datetime.timedelta(hours=3))
+    return PlantSnapshot(assets, engineers, [booking], now=NOW)
+
+
+def test_scenarios_diff_against_baseline_without_touching_snapshot():
+    snapshot = plant()
+    scenarios = [
+        {"name": "E1 off", "engineers_off": ["E1"]},
+        {"name": "cobots degrade", "degrade": {"asset_type": "Cobot Arm", "by": 30}},
+        {"name": "nothing changes"},
+    ]
+    serial = simulate(snapshot, scenarios, max_workers=1)
+    parallel = simulate(snapshot, scenarios, max_workers=4)
+
+    strip = lambda r: [(a["asset_id"], a["engineer_id"], a["start_time"]) for a in r["allocations"]]
+    assert [strip(r) for r in serial["scenarios"]] == [strip(r) for r in parallel["scenarios"]]
+
+    baseline = serial["baseline"]
+    off, degraded, same = serial["scenarios"]
+    assert {a["asset_id"] for a in baseline["allocations"]} == {"A1", "A2"}
+
+    assert off["displaced"] == ["ORD-OLD"]
+    assert "E1" not in {a["engineer_id"] for a in off["allocations"]}
+    assert off["diff"]["reassigned"] or off["diff"]["rescheduled"]
+
+    assert degraded["orders"] == 4
+    assert degraded["diff"]["newly_assigned"] == ["A3", "A4"]
+    assert degraded["diff"]["cost_delta"] > 0
+
+    assert same["diff"] == {"newly_assigned": [], "no_longer_assigned": [], "reassigned": [],
+                            "rescheduled": [], "cost_delta": 0.0}
+
+    # The shared snapshot never sees scenario writes (fatigue, health)
+    assert [e.fatigue for e in snapshot.engineers] == [0.0, 5.0, 3.0]
+    assert [a.health_score for a in snapshot.assets] == [20.0, 40.0, 70.0, 65.0]
@@ -0,0 +1,45 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.plant import PlantSpec, generate, in_memory, write_to_db
+from benchmarks.run_benchmarks import compare
+from Persistence import models
+from Persistence.database import Base
+
+
+def test_generator_is_deterministic_and_tunable():
+    a = generate(PlantSpec(n_assets=500, seed=7))
+    b = generate(PlantSpec(n_assets=500, seed=7))
+    assert (a.assets, a.engineers, a.orders) == (b.assets, b.engineers, b.orders)
+    assert a.assets != generate(PlantSpec(n_assets=500, seed=8)).assets
+
+    def critical_share(spec):
+        assets = generate(spec).assets
+        return sum(row["health_score"] < 50 for row in assets) / len(assets)
+
+    assert critical_share(PlantSpec(n_assets=2000, health_beta=(1.0, 4.0))) > 0.8
+    assert critical_share(PlantSpec(n_assets=2000, health_beta=(4.0, 1.0))) < 0.1
+
+    assets, orders, engineers = in_memory(a)
+    covered = {row["asset_id"] for row in a.orders}
+    assert len(engineers) == 50
+    assert all(o.asset_id not in covered for o in orders)
+
+
+def test_plant_bulk_loads_into_the_models():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    plant = generate(PlantSpec(n_assets=300, seed=1))
+    write_to_db(plant, db, batch_size=64)
+
+    assert db.query(models.AssetModel).count() == 300
+    assert db.query(models.EngineerModel).count() == 30
+    assert db.query(models.MaintenanceModel).count() == len(plant.orders)
+    db.close()
+
+
+def test_compare_flags_only_cases_past_the_tolerance():
+    baselines = {"tolerance": 0.5, "results": {"orchestrator@1000": 1.0, "readiness@1000": 1.0}}
+    results = {"orchestrator@1000": 1.6, "readiness@1000": 1.4, "schedule@1000": 9.0}
+    assert compare(results, baselines) == ["orchestrator@1000"]
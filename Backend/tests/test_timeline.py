@@ -0,0 +1,79 @@
+import datetime
+import random
+
+from Services.timeline import EngineerCalendar, ScheduleCalendar, to_minutes
+from domain.compliance import SHIFT_WINDOWS
+from domain.scheduling import INDUSTRIAL_BUFFER_MINUTES as BUFFER
+
+NOW = datetime.datetime(2026, 3, 2, 9, 30)
+
+
+class Eng:
+    def __init__(self, engineer_id, availability="Day"):
+        self.engineer_id = engineer_id
+        self.availability = availability
+
+
+class Booking:
+    def __init__(self, engineer_id, start, end):
+        self.assigned_engineer_id = engineer_id
+        self.scheduled_date = start
+        self.end_time = end
+
+
+def in_window(start, duration, window):
+    offset = (start - window[0]) % (24 * 60)
+    return offset + duration <= window[1] - window[0]
+
+
+def brute_force(window, booked, duration, earliest):
+    t = int(earliest)
+    while True:
+        if in_window(t, duration, window) and all(
+            s >= t + duration + BUFFER or e + BUFFER <= t for s, e in booked
+        ):
+            return t
+        t += 1
+
+
+def test_packing_matches_minute_scan():
+    for seed in range(30):
+        rng = random.Random(seed)
+        label = rng.choice(list(SHIFT_WINDOWS))
+        window = SHIFT_WINDOWS[label]
+        now = to_minutes(NOW) + rng.randint(0, 3000)
+        calendar = EngineerCalendar(window, now)
+        booked = []
+        for _ in range(25):
+            duration = rng.choice([40, 95, 200, 380])
+            expected = brute_force(window, booked, duration, now)
+            start = calendar.place(duration, now)
+            assert start == expected
+            booked.append((start, start + duration))
+
+
+def test_seeded_bookings_block_the_calendar():
+    busy_until = datetime.datetime(2026, 3, 2, 12, 0)
+    calendar = ScheduleCalendar(NOW)
+    calendar.seed([Booking("E1", datetime.datetime(2026, 3, 2, 9, 0), busy_until)])
+
+    start, end = calendar.book(Eng("E1"), 30)
+    assert start == busy_until + datetime.timedelta(minutes=BUFFER)
+    second, _ = calendar.book(Eng("E1"), 30)
+    assert second == end + datetime.timedelta(minutes=BUFFER)
+    spill, _ = calendar.book(Eng("E1"), 60)
+    assert spill == datetime.datetime(2026, 3, 3, 6, 0)
+
+    night_start, _ = calendar.book(Eng("E2", "Night"), 60)
+    assert night_start == datetime.datetime(2026, 3, 2, 22, 0)
+
+
+def test_jobs_longer_than_a_shift_take_a_free_window():
+    calendar = ScheduleCalendar(NOW)
+    engineer = Eng("E1")
+    first, first_end = calendar.book(engineer, 600)
+    assert first == datetime.datetime(2026, 3, 3, 6, 0)
+    second, _ = calendar.book(engineer, 60)
+    assert second == datetime.datetime(2026, 3, 2, 9, 30)
+    third, _ = calendar.book(engineer, 600)
+    assert third == datetime.datetime(2026, 3, 4, 6, 0)